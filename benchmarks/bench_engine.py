@@ -0,0 +1,312 @@
+"""
+benchmarks of the engine and environment hot paths.
+
+Each benchmark times one operation over a fixed, seeded workload and
+reports the time per call (median and best of the repeats) and the
+throughput. The results are written as JSON so that two runs can be
+compared : --compare flags every benchmark slower than the baseline by
+more than --threshold.
+
+Usage:
+    $ python benchmarks/bench_engine.py --output results.json
+    $ python benchmarks/bench_engine.py --compare results.json --threshold 0.10
+    $ python benchmarks/bench_engine.py --only possible_moves --backend bitboard
+"""
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+
+import numpy as np
+
+from gym_abalone.envs.abalone_env import AbaloneEnv
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.state import GameState
+from gym_abalone.game.engine.playout import push_first_move
+
+# =========================================================================
+#                               WORKLOADS
+# =========================================================================
+
+def midgame_corpus(n_positions=200, seed=0, min_turns=10, max_turns=60):
+    """
+    positions reached by random play from random variants
+
+    Returns:
+        list of (board, current_player, players_damages)
+    """
+    rng = random.Random(seed)
+    game = AbaloneGame()
+    names = AbaloneGame._get_variant_store().names
+    corpus = []
+    while len(corpus) < n_positions:
+        game.reset(variant_name=rng.choice(names), random_player=False)
+        for _ in range(rng.randint(min_turns, max_turns)):
+            move = push_first_move(game, rng)
+            if move is None:
+                break
+            game.action_handler(*move)
+            if game.game_over:
+                break
+        if not game.game_over:
+            corpus.append((game.board.copy(), game.current_player, list(game.players_damages)))
+    return corpus
+
+
+def load_position(game, position):
+    board, current_player, players_damages = position
+    game.board = board.copy()
+    game.current_player = current_player
+    game.players_damages = list(players_damages)
+    game.game_over = False
+    game.undo_stack = []
+    game.refresh_state()
+
+
+def corpus_games(backend, n_positions, seed):
+    """ one game of the backend set to each position of a midgame corpus """
+    games = []
+    for position in midgame_corpus(n_positions=n_positions, seed=seed):
+        game = AbaloneEnv.BACKENDS[backend]()
+        game.reset()
+        load_position(game, position)
+        games.append(game)
+    return games
+
+
+# =========================================================================
+#                               BENCHMARKS
+# =========================================================================
+
+def bench_reset(backend, scale):
+    """ reset into each of the 60 variants """
+    game = AbaloneEnv.BACKENDS[backend]()
+    names = AbaloneGame._get_variant_store().names
+
+    def run():
+        for name in names:
+            game.reset(variant_name=name, random_player=False)
+    return run, len(names)
+
+
+def bench_possible_moves(backend, scale):
+    """ generate the legal moves of a midgame position from scratch """
+    games = corpus_games(backend, 50 * scale, seed=0)
+
+    def run():
+        for game in games:
+            # forget the cached moves, see AbaloneGame.legal_moves
+            game._invalidate_moves()
+            game.get_possible_moves(game.current_player)
+    return run, len(games)
+
+
+def bench_validate_move(backend, scale):
+    """ validate_move on (pos0, pos1) pairs of midgame positions, half of them legal """
+    rng = random.Random(1)
+    cases = []
+    for game in corpus_games(backend, 10 * scale, seed=1):
+        legal = game.get_possible_moves(game.current_player)
+        pairs = [rng.choice(legal) if rng.random() < 0.5 else (rng.randrange(61), rng.randrange(61))
+                 for _ in range(20)]
+        cases.append((game, pairs))
+
+    def run():
+        for game, pairs in cases:
+            player = game.current_player
+            for pos0, pos1 in pairs:
+                game.validate_move(pos0, pos1, player, return_modif=True)
+    return run, sum(len(pairs) for _, pairs in cases)
+
+
+def bench_action_mask(backend, scale):
+    """ AbaloneEnv.get_action_mask of midgame positions, the moves being cached """
+    env = AbaloneEnv(render_mode='terminal', backend=backend)
+    games = corpus_games(backend, 50 * scale, seed=2)
+
+    def run():
+        for game in games:
+            env.game = game
+            env.get_action_mask()
+    return run, len(games)
+
+
+def bench_legal_actions(backend, scale):
+    """ AbaloneEnv.get_legal_actions of midgame positions into a buffer, the moves being cached """
+    env = AbaloneEnv(render_mode='terminal', backend=backend)
+    games = corpus_games(backend, 50 * scale, seed=2)
+    buffer = np.zeros(61**2, dtype=np.int16)
+
+    def run():
+        for game in games:
+            env.game = game
+            env.get_legal_actions(out=buffer)
+    return run, len(games)
+
+
+def bench_clone(backend, scale):
+    """ AbaloneGame.clone of midgame positions, their legal moves being cached """
+    games = corpus_games(backend, 50 * scale, seed=4)
+    for game in games:
+        game.legal_moves(game.current_player)
+
+    def run():
+        for game in games:
+            game.clone()
+    return run, len(games)
+
+
+def bench_deepcopy(backend, scale):
+    """ copy.deepcopy of the same games as clone, for reference """
+    games = corpus_games(backend, 5 * scale, seed=4)
+    for game in games:
+        game.legal_moves(game.current_player)
+
+    def run():
+        for game in games:
+            copy.deepcopy(game)
+    return run, len(games)
+
+
+def bench_state_bytes(backend, scale):
+    """ get_state, to_bytes, from_bytes and set_state of midgame positions """
+    games = corpus_games(backend, 50 * scale, seed=4)
+    target = AbaloneEnv.BACKENDS[backend]()
+    target.reset()
+
+    def run():
+        for game in games:
+            target.set_state(GameState.from_bytes(game.get_state().to_bytes()))
+    return run, len(games)
+
+
+def bench_env_step(backend, scale):
+    """ random play through env.step, resets included """
+    env = AbaloneEnv(render_mode='terminal', backend=backend)
+    rng = random.Random(3)
+    n_steps = 500 * scale
+
+    def run():
+        env.reset(random_player=False)
+        for _ in range(n_steps):
+            moves = env.game.get_possible_moves(env.game.current_player)
+            _, _, done, _ = env.step(rng.choice(moves))
+            if done:
+                env.reset(random_player=False)
+    return run, n_steps
+
+
+BENCHMARKS = {
+    'reset'          : bench_reset,
+    'possible_moves' : bench_possible_moves,
+    'validate_move'  : bench_validate_move,
+    'action_mask'    : bench_action_mask,
+    'legal_actions'  : bench_legal_actions,
+    'env_step'       : bench_env_step,
+    'clone'          : bench_clone,
+    'deepcopy'       : bench_deepcopy,
+    'state_bytes'    : bench_state_bytes,
+}
+
+# =========================================================================
+#                               HARNESS
+# =========================================================================
+
+def measure(run, n_calls, repeat):
+    """
+    time repeat runs (after a warm up one)
+
+    Returns:
+        dict of the per call times in microseconds and the calls per second
+    """
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / n_calls)
+    median = statistics.median(timings)
+    return {
+        'calls'           : n_calls,
+        'repeat'          : repeat,
+        'median_us'       : median * 1e6,
+        'best_us'         : min(timings) * 1e6,
+        'calls_per_second': 1 / median,
+    }
+
+
+def environment():
+    """ what the results depend on, saved next to them """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit'   : commit,
+        'python'   : platform.python_version(),
+        'numpy'    : np.__version__,
+        'platform' : platform.platform(),
+        'time'     : time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns:
+        list: the names of the benchmarks slower than the baseline by more
+              than threshold (relative, on the median)
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['median_us'] / baseline[name]['median_us']
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:24} {baseline[name]['median_us']:10.2f} -> {result['median_us']:10.2f} us  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', default='numpy', choices=sorted(AbaloneEnv.BACKENDS))
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help='benchmarks to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=1, help='multiply the workloads')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown flagged as a regression')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        run, n_calls = BENCHMARKS[name](args.backend, args.scale)
+        results[name] = measure(run, n_calls, args.repeat)
+        print(f"{name:24} {results[name]['median_us']:10.2f} us/call "
+              f"(best {results[name]['best_us']:.2f})  {results[name]['calls_per_second']:12.0f} calls/s")
+
+    report = {'environment': environment(), 'backend': args.backend, 'scale': args.scale, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared to {args.compare} ({baseline['environment']['commit']})")
+        if (baseline['backend'], baseline['scale']) != (args.backend, args.scale):
+            print(f"warning : the baseline ran with backend={baseline['backend']} scale={baseline['scale']}")
+        if compare(results, baseline['results'], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+import time of the headless entry points, each measured in a fresh
+interpreter : a rollout worker pays it once per process.
+
+It also checks that no graphics module (pyglet, the GUI) has been loaded,
+and fails when an import is slower than --max-seconds.
+
+Usage:
+    $ python benchmarks/bench_import.py --repeat 5 --max-seconds 1.5
+"""
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+MODULES = [
+    'gym_abalone.game.engine.gamelogic',
+    'gym_abalone.envs',
+]
+
+# modules which must not be loaded without a human render
+GRAPHICS_MODULES = ['pyglet', 'gym_abalone.game.graphics.abalonegui']
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'graphics': [m for m in {graphics!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat=5):
+    """
+    Returns:
+        dict with the median, min and max import time of module in seconds
+        and the graphics modules it loaded
+    """
+    timings, graphics = [], set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, graphics=GRAPHICS_MODULES)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        graphics.update(result['graphics'])
+    return {
+        'module'   : module,
+        'median'   : statistics.median(timings),
+        'min'      : min(timings),
+        'max'      : max(timings),
+        'graphics' : sorted(graphics),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per module')
+    parser.add_argument('--max-seconds', type=float, default=None, help='fail above this median import time')
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        result = measure(module, repeat=args.repeat)
+        print(f"{result['module']:40} median {result['median']*1000:7.1f} ms "
+              f"(min {result['min']*1000:.1f}, max {result['max']*1000:.1f})")
+        if result['graphics']:
+            print(f"    loads graphics modules : {', '.join(result['graphics'])}")
+            failed = True
+        if args.max_seconds is not None and result['median'] > args.max_seconds:
+            print(f"    slower than {args.max_seconds} s")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
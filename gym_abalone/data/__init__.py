@@ -0,0 +1,3 @@
+from gym_abalone.data.shards import ShardWriter, read_shard, load_shards
+from gym_abalone.data.selfplay import SelfPlay, random_policy
+from gym_abalone.data.records import GameRecord, GameReplay, GameRecords, write_records, load_records
@@ -0,0 +1,202 @@
+import struct
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+
+# file header : magic, version
+FILE_HEADER = struct.Struct('<4sH')
+MAGIC = b'ABGR'
+VERSION = 1
+
+# game header : variant index, starting player, number of moves
+GAME_HEADER = struct.Struct('<BBH')
+
+
+class GameRecord:
+    """
+    a game as its variant, its starting player and its moves : each move
+    (pos0, pos1) takes two bytes, so a game of 100 moves takes 204 bytes
+    instead of 100 boards.
+    """
+
+    def __init__(self, variant=0, player=0, moves=None):
+        """
+        Args:
+            variant (int or str)    : the variant, by index (see VariantStore) or name
+            player  (int)           : the starting player
+            moves   (numpy.ndarray) : (n, 2) uint8 moves
+        """
+        if isinstance(variant, str):
+            variant = AbaloneGame._get_variant_store().index[variant]
+        self.variant = variant
+        self.player = player
+        self.moves = [] if moves is None else [(int(pos0), int(pos1)) for pos0, pos1 in moves]
+
+    def __len__(self):
+        return len(self.moves)
+
+    @property
+    def variant_name(self):
+        return AbaloneGame._get_variant_store().names[self.variant]
+
+    def append(self, pos0, pos1):
+        self.moves.append((int(pos0), int(pos1)))
+
+    def to_bytes(self):
+        return GAME_HEADER.pack(self.variant, self.player, len(self.moves)) + \
+               np.array(self.moves, dtype=np.uint8).reshape(-1, 2).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Returns:
+            tuple (record, end) : the record and the offset following it
+        """
+        variant, player, n_moves = GAME_HEADER.unpack_from(data, offset)
+        start = offset + GAME_HEADER.size
+        moves = np.frombuffer(data, dtype=np.uint8, count=2*n_moves, offset=start).reshape(-1, 2)
+        return cls(variant, player, moves), start + 2*n_moves
+
+    def new_game(self, backend=AbaloneGame):
+        """ a game reset to the record's start """
+        game = backend()
+        game.reset(player=self.player, random_player=False, variant_name=self.variant_name)
+        return game
+
+
+class GameReplay:
+    """
+    random access to the positions of a record : the game is replayed
+    once, a checkpoint (board, damages, victories, player, turn) being
+    kept every checkpoint_every moves, then the position after any move is
+    rebuilt from the checkpoint before it with at most checkpoint_every - 1
+    moves.
+    """
+
+    def __init__(self, record, checkpoint_every=16, backend=AbaloneGame):
+        self.record = record
+        self.checkpoint_every = checkpoint_every
+        self.game = record.new_game(backend)
+        self.checkpoints = [self._checkpoint()]
+        for i, (pos0, pos1) in enumerate(record.moves):
+            self._play(pos0, pos1)
+            if (i + 1) % checkpoint_every == 0:
+                self.checkpoints.append(self._checkpoint())
+
+    def __len__(self):
+        """ the number of positions, from the start to the end """
+        return len(self.record) + 1
+
+    def _checkpoint(self):
+        game = self.game
+        return (game.board.copy(), list(game.players_damages), list(game.players_victories),
+                game.current_player, game.turns_count, game.game_over)
+
+    def _play(self, pos0, pos1):
+        if not self.game.action_handler(pos0, pos1):
+            raise ValueError(f'illegal move {pos0}-{pos1} in the record')
+
+    def seek(self, t):
+        """
+        set the game to the position after t moves
+
+        Returns:
+            AbaloneGame: the game, shared by the calls of seek
+        """
+        if not 0 <= t < len(self):
+            raise IndexError(f'position {t} out of range')
+        k = t // self.checkpoint_every
+        board, players_damages, players_victories, current_player, turns_count, game_over = self.checkpoints[k]
+        game = self.game
+        game.board = board.copy()
+        game.players_damages = list(players_damages)
+        # replaying the winning move again counts the victory once
+        game.players_victories = list(players_victories)
+        game.current_player = current_player
+        game.turns_count = turns_count
+        game.game_over = game_over
+        game.undo_stack = []
+        game.refresh_state()
+        for pos0, pos1 in self.record.moves[k * self.checkpoint_every:t]:
+            self._play(pos0, pos1)
+        return game
+
+    def board(self, t):
+        """ a copy of the board after t moves """
+        return self.seek(t).board.copy()
+
+
+class GameRecords:
+    """
+    many records loaded at once, as flat arrays : the moves of the game i
+    are moves[offsets[i]:offsets[i+1]].
+    """
+
+    def __init__(self, variants, players, offsets, moves):
+        self.variants = variants
+        self.players = players
+        self.offsets = offsets
+        self.moves = moves
+
+    def __len__(self):
+        return len(self.variants)
+
+    def __getitem__(self, i):
+        return GameRecord(int(self.variants[i]), int(self.players[i]), self.moves[self.offsets[i]:self.offsets[i+1]])
+
+
+# =========================================================================
+#                               FILES
+# =========================================================================
+
+def write_records(path, records, append=False):
+    """
+    write records one after the other : the file is a header followed by
+    each record's bytes, so it can be appended to.
+    """
+    with open(path, 'ab' if append else 'wb') as f:
+        if f.tell() == 0:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION))
+        for record in records:
+            f.write(record.to_bytes())
+
+
+def load_records(path):
+    """
+    load every record of a file in a single read
+
+    Returns:
+        GameRecords: the records as flat arrays
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a game records file (version {VERSION})')
+
+    # walk the headers, only the number of moves is needed to find the next one
+    starts = []
+    offset, end = FILE_HEADER.size, len(data)
+    header_size = GAME_HEADER.size
+    while offset + header_size <= end:
+        starts.append(offset)
+        offset += header_size + 2 * (data[offset + 2] | data[offset + 3] << 8)
+    if offset != end:
+        raise ValueError(f'{path} ends with a truncated record')
+
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    starts = np.array(starts, dtype=np.int64)
+    variants = buffer[starts]
+    players = buffer[starts + 1]
+    lengths = buffer[starts + 2].astype(np.int64) | buffer[starts + 3].astype(np.int64) << 8
+
+    offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    # the bytes of the moves, without the game headers
+    keep = np.ones(len(buffer), dtype=bool)
+    keep[:FILE_HEADER.size] = False
+    for i in range(header_size):
+        keep[starts + i] = False
+    moves = buffer[keep].reshape(-1, 2)
+    return GameRecords(variants, players, offsets, moves)
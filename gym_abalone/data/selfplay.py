@@ -0,0 +1,126 @@
+import os
+import time
+import random
+import multiprocessing as mp
+
+import numpy as np
+
+from gym_abalone.envs.abalone_env import AbaloneEnv
+from .shards import ShardWriter
+
+
+def random_policy(observation, mask, player, rng):
+    """
+    a uniformly random legal action
+
+    Args:
+        observation (numpy.ndarray) : the (11, 11) board
+        mask        (numpy.ndarray) : (3721,) legal actions pos0 * 61 + pos1
+        player      (int)           : the player to move
+        rng         (random.Random) : the worker's random generator
+
+    Returns:
+        tuple (pos0, pos1): the action
+    """
+    legal = np.flatnonzero(mask)
+    return divmod(int(legal[rng.randrange(len(legal))]), 61)
+
+
+class SelfPlay:
+    """
+    self-play data generation : N worker processes each play AbaloneEnv
+    games with the same policy and stream every step (observation, action,
+    reward, done, player, mask) into their own shards, see ShardWriter.
+
+    The policy is any picklable callable policy(observation, mask, player, rng)
+    -> (pos0, pos1), e.g. random_policy.
+
+    Running again on the same directory resumes : each worker appends
+    after its last complete chunk until it holds steps_per_worker steps.
+    An episode interrupted by a crash is left without its last steps.
+    """
+
+    def __init__(self, directory, policy=random_policy, n_workers=None, steps_per_worker=100_000,
+                 variant_names='classical', random_pick=False, max_turns=200, backend='numpy',
+                 chunk_size=4096, shard_chunks=64, seed=None, start_method=None):
+        """
+        Args:
+            directory        (str)      : where the shards are written
+            policy           (callable) : see the class description
+            n_workers        (int)      : the number of processes (default: cpu count)
+            steps_per_worker (int)      : steps written by each worker
+            variant_names    (list)     : the variants picked from at each reset
+            chunk_size       (int)      : steps per compressed chunk, bounds the memory of a worker
+            shard_chunks     (int)      : chunks per shard file
+            seed             (int)      : seed of the first worker, the others follow
+        """
+        self.directory = directory
+        self.policy = policy
+        self.n_workers = n_workers or mp.cpu_count()
+        self.steps_per_worker = steps_per_worker
+        self.variant_names = [variant_names] if isinstance(variant_names, str) else list(variant_names)
+        self.random_pick = random_pick
+        self.max_turns = max_turns
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.shard_chunks = shard_chunks
+        self.seed = seed
+        self.start_method = start_method
+        # statistics of the last run
+        self.infos = {}
+
+    def prefix(self, worker):
+        return os.path.join(self.directory, f'worker-{worker:03d}')
+
+    def run(self):
+        """
+        Returns:
+            dict: the number of steps written and the steps per second
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        tasks = [(self.prefix(i), None if self.seed is None else self.seed + i) for i in range(self.n_workers)]
+
+        start = time.perf_counter()
+        if self.n_workers == 1:
+            results = [self._play(*tasks[0])]
+        else:
+            with mp.get_context(self.start_method).Pool(self.n_workers) as pool:
+                results = pool.starmap(self._play, tasks)
+        elapsed = time.perf_counter() - start
+
+        steps = sum(results)
+        self.infos = {
+            'steps'            : steps,
+            'time'             : elapsed,
+            'steps_per_second' : steps / elapsed if elapsed > 0 else 0.0,
+        }
+        return self.infos
+
+    def _play(self, prefix, seed):
+        """
+        play and write the steps of a worker
+
+        Returns:
+            int: the number of steps written by this call
+        """
+        writer = ShardWriter(prefix, chunk_size=self.chunk_size, shard_chunks=self.shard_chunks)
+        # a resumed worker must not replay the same games
+        rng = random.Random(None if seed is None else f'{seed}-{writer.rows}')
+        np.random.seed(rng.getrandbits(32))
+        random.seed(rng.getrandbits(32))
+
+        env = AbaloneEnv(render_mode='terminal', max_turns=self.max_turns, backend=self.backend)
+        written = 0
+        with writer:
+            done = True
+            while writer.rows + writer.size < self.steps_per_worker:
+                if done:
+                    observation = env.reset(variant_name=rng.choice(self.variant_names), random_pick=self.random_pick)
+                player = env.current_player
+                mask = env.get_action_mask()
+                action = self.policy(observation, mask, player, rng)
+                next_observation, reward, done, _ = env.step(action)
+                writer.write(observation, action, reward, done, player, mask)
+                observation = next_observation
+                written += 1
+        return written
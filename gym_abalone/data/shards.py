@@ -0,0 +1,194 @@
+import os
+import zlib
+import struct
+
+import numpy as np
+
+# name -> (shape of one step, dtype), in the order of the columns of a chunk
+SCHEMA = {
+    'observation' : ((11, 11),    np.int8),
+    'action'      : ((2,),        np.uint8),
+    'reward'      : ((),          np.float32),
+    'done'        : ((),          np.bool_),
+    'player'      : ((),          np.int8),
+    # the 61*61 legal actions, packed 8 per byte (see numpy.packbits)
+    'mask'        : ((466,),      np.uint8),
+}
+
+# magic, version, rows, raw size, compressed size, crc32 of the compressed bytes
+CHUNK_HEADER = struct.Struct('<4sHIIII')
+MAGIC = b'ABSH'
+VERSION = 1
+
+
+class ShardWriter:
+    """
+    append-only writer of trajectory shards.
+
+    The steps are buffered in preallocated arrays of chunk_size rows, so
+    the memory of a writer is bounded. A full buffer is written as one
+    chunk : a header followed by the zlib compressed columns of SCHEMA.
+    After shard_chunks chunks the writer moves on to the next shard file
+    of its prefix : {prefix}-{index:05d}.shard
+
+    A chunk is only counted once it has been entirely written : opening
+    the writer again on the same prefix drops a chunk cut by a crash and
+    resumes after the last complete one.
+    """
+
+    def __init__(self, prefix, chunk_size=4096, shard_chunks=64, level=6):
+        """
+        Args:
+            prefix       (str) : path prefix of the shard files
+            chunk_size   (int) : steps per chunk
+            shard_chunks (int) : chunks per shard file
+            level        (int) : zlib compression level
+        """
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.shard_chunks = shard_chunks
+        self.level = level
+
+        self.buffers = {name: np.zeros((chunk_size,) + shape, dtype=dtype) for name, (shape, dtype) in SCHEMA.items()}
+        self.size = 0
+
+        # resume after the complete chunks of the existing shards
+        self.rows = 0
+        self.index, self.chunks = 0, 0
+        for index, path in enumerate(shard_paths(prefix)):
+            chunks, rows, end = scan_shard(path)
+            if end != os.path.getsize(path):
+                with open(path, 'r+b') as f:
+                    f.truncate(end)
+            self.rows += rows
+            self.index, self.chunks = index, chunks
+        if self.chunks >= self.shard_chunks:
+            self.index, self.chunks = self.index + 1, 0
+        self.file = None
+
+    @property
+    def path(self):
+        return f'{self.prefix}-{self.index:05d}.shard'
+
+    def write(self, observation, action, reward, done, player, mask):
+        """
+        buffer one step
+
+        Args:
+            mask (numpy.ndarray) : (3721,) legal actions, packed here
+        """
+        i = self.size
+        buffers = self.buffers
+        buffers['observation'][i] = observation
+        buffers['action'][i] = action
+        buffers['reward'][i] = reward
+        buffers['done'][i] = done
+        buffers['player'][i] = player
+        buffers['mask'][i] = np.packbits(np.asarray(mask, dtype=bool))
+        self.size += 1
+        if self.size == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """ write the buffered steps as one chunk """
+        if not self.size:
+            return
+        raw = b''.join(self.buffers[name][:self.size].tobytes() for name in SCHEMA)
+        data = zlib.compress(raw, self.level)
+        if self.file is None:
+            self.file = open(self.path, 'ab')
+        self.file.write(CHUNK_HEADER.pack(MAGIC, VERSION, self.size, len(raw), len(data), zlib.crc32(data)))
+        self.file.write(data)
+        self.file.flush()
+
+        self.rows += self.size
+        self.size = 0
+        self.chunks += 1
+        if self.chunks == self.shard_chunks:
+            self.file.close()
+            self.file = None
+            self.index, self.chunks = self.index + 1, 0
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def shard_paths(prefix):
+    """ the existing shard files of a prefix, in order """
+    paths = []
+    while os.path.exists(f'{prefix}-{len(paths):05d}.shard'):
+        paths.append(f'{prefix}-{len(paths):05d}.shard')
+    return paths
+
+
+def scan_shard(path):
+    """
+    Returns:
+        tuple (chunks, rows, end) of the complete chunks of a shard file,
+        end being the offset right after the last one
+    """
+    chunks = rows = end = 0
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                break
+            magic, version, n_rows, _, size, crc = CHUNK_HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                break
+            data = f.read(size)
+            if len(data) < size or zlib.crc32(data) != crc:
+                break
+            chunks, rows, end = chunks + 1, rows + n_rows, f.tell()
+    return chunks, rows, end
+
+
+def read_shard(path, unpack_masks=True):
+    """
+    yield the chunks of a shard file
+
+    Args:
+        unpack_masks (bool) : unpack the masks to (rows, 3721) booleans
+
+    Yields:
+        dict: name -> (rows,) + shape array of each column of SCHEMA
+    """
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                return
+            magic, version, n_rows, raw_size, size, crc = CHUNK_HEADER.unpack(header)
+            data = f.read(size)
+            # a chunk cut by a crash ends the shard
+            if magic != MAGIC or version != VERSION or len(data) < size or zlib.crc32(data) != crc:
+                return
+            raw = zlib.decompress(data)
+            chunk, offset = {}, 0
+            for name, (shape, dtype) in SCHEMA.items():
+                count = n_rows * int(np.prod(shape))
+                chunk[name] = np.frombuffer(raw, dtype=dtype, count=count, offset=offset).reshape((n_rows,) + shape)
+                offset += count * np.dtype(dtype).itemsize
+            if unpack_masks:
+                chunk['mask'] = np.unpackbits(chunk['mask'], axis=1, count=61*61).astype(bool)
+            yield chunk
+
+
+def load_shards(prefix, unpack_masks=True):
+    """
+    Returns:
+        dict: name -> the concatenated columns of every shard of a prefix
+    """
+    chunks = [chunk for path in shard_paths(prefix) for chunk in read_shard(path, unpack_masks)]
+    if not chunks:
+        return {}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
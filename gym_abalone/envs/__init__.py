@@ -1,2 +1,3 @@
 from gym_abalone.envs.abalone_env import AbaloneEnv
-from gym_abalone.envs.abalone_extrahard_env import AbaloneExtraHardEnv
\ No newline at end of file
+from gym_abalone.envs.abalone_extrahard_env import AbaloneExtraHardEnv
+from gym_abalone.envs.abalone_vec_env import AbaloneVecEnv
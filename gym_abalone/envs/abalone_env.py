@@ -3,8 +3,12 @@ from gym import error, spaces, utils, logger
 from gym.utils import seeding
 import numpy as np
 
-from gym_abalone.game.graphics.abalonegui import AbaloneGui
+from gym_abalone.game.common import geometry
+from gym_abalone.game.graphics.rasterizer import AbaloneRasterizer
 from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+from gym_abalone.game.engine import actionspace
+from gym_abalone.game.engine.encoder import ObservationEncoder
 
 
 class Reward:
@@ -30,10 +34,14 @@ class AbaloneEnv(gym.Env):
         Abalone game environment
 
     Observation: 
-        Type: Box(61, 61)
+        Type: Box(11, 11) int8 the board
+        or Box(7, 11, 11) / Box(7, 61) float32 planes if observation_mode is
+        'planes' / 'cells', see ObservationEncoder
 
     Actions:
-        Type: Box(2)
+        Type: Box(2) the (pos0, pos1) of the move
+        or Discrete(1620) a slot of the compact action space if
+        compact_actions, see actionspace
     
     Reward:
         see the Reward class' methods
@@ -44,26 +52,62 @@ class AbaloneEnv(gym.Env):
     """
 
     metadata = {
-        'render.modes': ['human', 'terminal'],
+        'render.modes': ['human', 'rgb_array', 'terminal'],
         'video.frames_per_second' : 10,
         }
 
 
-    def __init__(self, render_mode='human', max_turns=200):
-        
+    # game state representations
+    BACKENDS = {
+        'numpy'    : AbaloneGame,
+        'bitboard' : AbaloneBitboardGame,
+    }
+
+    def __init__(self, render_mode='human', max_turns=200, backend='numpy', profiler=None, compact_actions=False,
+                 observation_mode='board', copy_observation=True):
+        """
+        Args:
+            profiler         (Profiler) : times the phases of step, reset and render
+                                          and counts the moves (None to disable)
+            compact_actions  (bool)     : the actions and the masks are the slots of
+                                          the compact action space, see actionspace
+            observation_mode (str)      : 'board' the 11x11 board, or the planes of
+                                          ObservationEncoder with the layout
+                                          'planes' or 'cells'
+            copy_observation (bool)     : return copies of the planes instead of the
+                                          env's buffer, that the next step overwrites
+        """
+
         super(AbaloneEnv, self).__init__()
 
         # Every environment comes with an action_space and an observation_space. 
         # These attributes are of type Space
-        self.action_space = gym.spaces.Box(0, 60, shape=(2,), dtype=np.uint8)
-        self.observation_space = gym.spaces.Box(np.int8(0), np.int8(-1), shape=(11, 11), dtype=np.int8)
+        self.compact_actions = compact_actions
+        if compact_actions:
+            self.action_space = gym.spaces.Discrete(actionspace.n_slots())
+        else:
+            self.action_space = gym.spaces.Box(0, geometry.N_POSITIONS - 1, shape=(2,), dtype=np.uint8)
+        self.n_actions = actionspace.n_slots() if compact_actions else geometry.N_POSITIONS**2
+        self.observation_mode = observation_mode
+        self.copy_observation = copy_observation
+        if observation_mode == 'board':
+            self.encoder = None
+            self.observation_space = gym.spaces.Box(np.int8(0), np.int8(-1), shape=(11, 11), dtype=np.int8)
+        else:
+            self.encoder = ObservationEncoder(layout=observation_mode)
+            self.observation_space = gym.spaces.Box(0, 1, shape=self.encoder.shape, dtype=np.float32)
         
         self.render_mode = render_mode
         self.max_turns = max_turns
 
-        self.game = AbaloneGame()
+        self.game = AbaloneEnv.BACKENDS[backend]()
+        self.profiler = profiler
         self.gui = None
+        self.rasterizer = None
         self._modifications = None
+        # (legal moves dict, its actions), see _legal_actions
+        self._legal_cache = (None, None)
+        self._mask_buffer = np.zeros(self.n_actions, dtype=bool)
 
         #self.reward_method = 'default'
 
@@ -81,6 +125,7 @@ class AbaloneEnv(gym.Env):
             info (dict)
         """
         #assert self.action_space.contains(action), f"{action} ({type(action)})"
+        profiler = self.profiler
 
         reward = 0
         info = {
@@ -95,32 +140,99 @@ class AbaloneEnv(gym.Env):
                         "You should always call 'reset()' once you receive 'done = True'"
                         "-- any further steps are undefined behavior.")   
         else:
-            pos0, pos1 = action
-            move_check = self.game.action_handler(pos0, pos1, return_modif=True)
+            move = self._get_move(action)
+            if profiler is not None:
+                start = profiler.clock()
+            # the legal set of this turn, known if a mask has been asked for
+            legal_moves = self.game.cached_legal_moves(self.game.current_player)
+            if move is None:
+                move_check = None
+            elif legal_moves is None:
+                move_check = self.game.validate_move(*move, self.game.current_player, return_modif=True)
+            else:
+                move_type = legal_moves.get(move)
+                move_check = move_type and (move_type, self.game.get_modifications(*move, move_type))
+            if profiler is not None:
+                profiler.add_time('validation', start)
 
             if move_check: # if the move is a valid move
                 move_type, self._modifications = move_check
+                if profiler is not None:
+                    start = profiler.clock()
+                self.game.apply_modifications(self._modifications)
+                if profiler is not None:
+                    profiler.add_time('modifications', start)
+                    start = profiler.clock()
                 reward = Reward.method_1(self.game.board, move_type)
+                if profiler is not None:
+                    profiler.add_time('reward', start)
+                    profiler.count('moves.' + move_type)
                 # for debug
                 info['move_type'] = move_type
+            elif profiler is not None:
+                profiler.count('illegal_actions')
+
+        if profiler is None:
+            return self.observation, reward, self.done, info
 
-        return self.observation, reward, self.done, info
+        profiler.count('steps')
+        start = profiler.clock()
+        observation = self.observation
+        profiler.add_time('observation', start)
+        profiler.tick()
+        return observation, reward, self.done, info
+
+    def _get_move(self, action):
+        """
+        Returns:
+            tuple (pos0, pos1) of the action, None if it is out of range :
+            such an action is illegal whether the legal set is known or not
+        """
+        if self.compact_actions:
+            if not 0 <= action < self.n_actions:
+                return None
+            return actionspace.get_pair(action)
+        pos0, pos1 = action
+        n = geometry.N_POSITIONS
+        if not (0 <= pos0 < n and 0 <= pos1 < n):
+            return None
+        return pos0, pos1
 
     def reset(self, player=0, random_player=True, variant_name='classical', random_pick=False):
+        if self.profiler is not None:
+            start = self.profiler.clock()
         self.game.reset(
             player=player, random_player=random_player, 
             variant_name=variant_name, random_pick=random_pick
         )
         if self.render_mode == 'human' and self.gui:
             self.gui.reset()
+        if self.profiler is not None:
+            self.profiler.add_time('reset', start)
+            self.profiler.count('resets')
         return self.observation
 
     def render(self, fps=None):
+        if self.profiler is None:
+            return self._render(fps=fps)
+        start = self.profiler.clock()
+        frame = self._render(fps=fps)
+        self.profiler.add_time('render', start)
+        return frame
+
+    def _render(self, fps=None):
         if self.render_mode == 'human':
             if self.gui is None:
+                # pyglet is only imported once a window is needed
+                from gym_abalone.game.graphics.abalonegui import AbaloneGui
                 self.gui = AbaloneGui(self.game)
                 self.gui.reset()
             self.gui.update(self._modifications, fps=fps)
+        elif self.render_mode == 'rgb_array':
+            # offscreen : the frame is drawn with NumPy, see AbaloneRasterizer
+            if self.rasterizer is None:
+                self.rasterizer = AbaloneRasterizer()
+            return self.rasterizer.render(self.game).copy()
         elif self.render_mode == 'terminal':
             pass
  
@@ -128,13 +240,40 @@ class AbaloneEnv(gym.Env):
         if self.render_mode == 'human' and self.gui:
             self.gui.close()
 
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler):
+        # the game times its move generation on the same profiler
+        self._profiler = self.game.profiler = profiler
+
     @property
     def turns(self):
         return self.game.turns_count
 
     @property
     def observation(self):
-        return np.copy(self.game.board)
+        if self.encoder is None:
+            return np.copy(self.game.board)
+        observation = self.encoder.encode_game(self.game)
+        return observation.copy() if self.copy_observation else observation
+
+    def get_observation(self, out=None):
+        """
+        the observation written into a buffer of the caller
+
+        Args:
+            out (numpy.ndarray) : buffer of the shape of observation_space
+                                  (default: a new array)
+        """
+        if out is None:
+            return self.observation
+        if self.encoder is None:
+            out[:] = self.game.board
+            return out
+        return self.encoder.encode_game(self.game, out=out)
 
     @property
     def done(self):
@@ -146,14 +285,72 @@ class AbaloneEnv(gym.Env):
     def current_player(self):
         return self.game.current_player
     
-    def get_action_mask(self):
+    def _legal_actions(self):
+        """
+        Returns:
+            numpy.ndarray: int16 legal actions pos0 * 61 + pos1 (or slots if
+            compact_actions) of the current player, sorted. Computed once
+            per position.
+        """
+        moves = self.game.legal_moves(self.game.current_player)
+        # the game builds a new dict after each modification
+        if self._legal_cache[0] is not moves:
+            n = geometry.N_POSITIONS
+            actions = np.array([pos0*n + pos1 for pos0, pos1 in moves], dtype=np.int16)
+            if self.compact_actions:
+                actions = actionspace._get_tables()['slots'][actions]
+            self._legal_cache = (moves, actions)
+        return self._legal_cache[1]
+
+    def get_legal_actions(self, out=None):
+        """
+        the legal actions as indices pos0 * 61 + pos1 (or slots if compact_actions)
+
+        Args:
+            out (numpy.ndarray) : int16 buffer of at least n_actions entries to
+                                  write them into (default: a new array)
+
+        Returns:
+            numpy.ndarray: the int16 indices, a view of out if given
+        """
+        actions = self._legal_actions()
+        if out is None:
+            return actions.copy()
+        out[:len(actions)] = actions
+        return out[:len(actions)]
+
+    def get_packed_action_mask(self, out=None):
+        """
+        the action mask packed 8 actions per byte, see numpy.packbits
+
+        Args:
+            out (numpy.ndarray) : uint8 buffer of (n_actions + 7) // 8 bytes
+                                  (default: a new array)
+
+        Returns:
+            numpy.ndarray: the packed mask, 466 bytes (203 if compact_actions)
+        """
+        mask = self._mask_buffer
+        mask[:] = False
+        mask[self._legal_actions()] = True
+        if out is None:
+            return np.packbits(mask)
+        out[:] = np.packbits(mask)
+        return out
+
+    def get_action_mask(self, out=None):
         """
             return a action mask which as a 61*61 = 3721 numpy vector
             with 0 and 1. 0 if the action is illegal and 1 otherwise.
+            If compact_actions, the vector has a value per slot.
+
+        Args:
+            out (numpy.ndarray) : buffer of n_actions entries of any dtype to
+                                  write the mask into (default: a new float64 array)
         """
-        player = self.game.current_player
-        possible_moves = self.game.get_possible_moves(player, group_by_type=False)
-        possible_index = np.array([p0*61+p1 for p0,p1 in possible_moves])
-        action_mask = np.zeros(61**2)
-        action_mask[possible_index] = np.ones(possible_index.shape)
-        return action_mask
+        if out is None:
+            out = np.zeros(self.n_actions)
+        else:
+            out[:] = 0
+        out[self._legal_actions()] = 1
+        return out
@@ -1,19 +1,96 @@
-import gym
+from gym_abalone.envs.abalone_env import AbaloneEnv, Reward
+from gym_abalone.game.engine.search import AlphaBetaSearch
 
-class AbaloneExtraHardEnv(gym.Env):
-    metadata = {'render.modes': ['human']}
 
-    def __init__(self):
-        super(AbaloneExtraHardEnv, self).__init__()
+class AbaloneExtraHardEnv(AbaloneEnv):
+    """
+    Description:
+        Single agent Abalone environment : the agent plays against a built-in
+        iterative deepening alpha-beta search (see AlphaBetaSearch), which
+        answers each valid move of the agent.
+
+    Observation:
+        see AbaloneEnv
+
+    Actions:
+        the (pos0, pos1) or the slot of the agent's move, see AbaloneEnv
+
+    Reward:
+        the reward of the agent's move minus the reward of the opponent's
+        answer, see the Reward class' methods
+
+    Episode Termination:
+        see AbaloneEnv
+    """
+
+    def __init__(self, render_mode='human', max_turns=200, backend='numpy', agent_player=0,
+                 max_depth=4, time_limit=1.0, max_nodes=None, compact_actions=False, observation_mode='board',
+                 profiler=None, copy_observation=True):
+        """
+        Args:
+            agent_player (int)   : the marbles played by the agent (0 white, 1 black)
+            max_depth    (int)   : the deepest iteration of the opponent's search
+            time_limit   (float) : the opponent's time budget per move in seconds
+            max_nodes    (int)   : the opponent's node budget per move
+
+            the other arguments are the ones of AbaloneEnv
+        """
+        super(AbaloneExtraHardEnv, self).__init__(render_mode=render_mode, max_turns=max_turns, backend=backend,
+                                                  profiler=profiler, compact_actions=compact_actions,
+                                                  observation_mode=observation_mode,
+                                                  copy_observation=copy_observation)
+        self.agent_player = agent_player
+        self.opponent = AlphaBetaSearch(max_depth=max_depth, time_limit=time_limit, max_nodes=max_nodes)
+
+    def _opponent_play(self):
+        """
+        Returns:
+            tuple (move, move_type, modifications) of the opponent's move,
+            (None, None, None) if it has no legal move and passes its turn
+        """
+        move = self.opponent.search(self.game)
+        if move is None:
+            # the agent plays again, the board being unchanged
+            self.game.next_turn()
+            return None, None, None
+        move_type, modifications = self.game.action_handler(*move, return_modif=True)
+        return move, move_type, modifications
 
     def step(self, action):
-        pass
+        """
+        play the agent's move then, if it is valid and the game goes on,
+        the opponent's answer (it passes if it has no legal move).
+
+        Returns:
+            observation, reward, done, info (see AbaloneEnv) with in info
+            the 'opponent_move' and 'opponent_move_type'
+        """
+        observation, reward, done, info = super(AbaloneExtraHardEnv, self).step(action)
+        info['opponent_move'] = info['opponent_move_type'] = None
+
+        # an illegal move : nothing moves, nothing to render
+        if not info['move_type']:
+            self._modifications = None
+            return observation, reward, done, info
+
+        if not done:
+            move, move_type, modifications = self._opponent_play()
+            if move is not None:
+                reward -= Reward.method_1(self.game.board, move_type)
+                self._modifications = self._modifications + modifications
+                info['opponent_move'] = move
+                info['opponent_move_type'] = move_type
+            observation, done = self.observation, self.done
 
-    def reset(self):
-        pass
+        return observation, reward, done, info
 
-    def render(self, mode='human'):
-        pass
-    
-    def close(self):
-        pass
+    def reset(self, player=0, random_player=True, variant_name='classical', random_pick=False):
+        super(AbaloneExtraHardEnv, self).reset(
+            player=player, random_player=random_player,
+            variant_name=variant_name, random_pick=random_pick
+        )
+        self._modifications = None
+        # the opponent starts
+        if self.game.current_player != self.agent_player:
+            _, _, self._modifications = self._opponent_play()
+        return self.observation
@@ -0,0 +1,245 @@
+import ctypes
+import random
+import multiprocessing as mp
+
+import numpy as np
+
+from gym_abalone.envs.abalone_env import AbaloneEnv
+from gym_abalone.game.engine.actionmask import get_action_masks
+
+
+class AbaloneVecEnv:
+    """
+    Description:
+        K Abalone games stepped together by worker processes.
+
+        The workers write the observations, rewards, dones and action masks
+        of their games into shared memory arrays, so a step only sends a
+        short command to each worker : nothing else is serialized.
+        A finished game is reset right away (autoreset) with its own
+        variant, its last board being kept in infos['terminal_observation'].
+
+    Observation:
+        Type: (K, 11, 11) int8, see AbaloneEnv
+
+    Actions:
+        Type: (K, 2) the (pos0, pos1) of each game
+
+    Infos:
+        dict of (K,) arrays : 'turn', 'player', 'move_type' (index in
+        MOVE_TYPES, -1 for an illegal move) and the (K, 11, 11)
+        'terminal_observation' (only meaningful where done is True)
+    """
+
+    MOVE_TYPES = ['winner', 'ejected', 'inline_push', 'sidestep_move', 'inline_move']
+
+    # name -> (shape of one game, dtype)
+    SHARED_ARRAYS = {
+        'actions'              : ((2,),       np.int64),
+        'observations'         : ((11, 11),   np.int8),
+        'terminal_observation' : ((11, 11),   np.int8),
+        'rewards'              : ((),         np.float32),
+        'dones'                : ((),         np.bool_),
+        'masks'                : ((61**2,),   np.bool_),
+        'current_player'       : ((),         np.int8),
+        'turn'                 : ((),         np.int32),
+        'player'               : ((),         np.int8),
+        'move_type'            : ((),         np.int8),
+    }
+
+    def __init__(self, n_envs, n_workers=None, variant_names='classical', random_pick=False,
+                 random_player=True, max_turns=200, backend='numpy', copy=True, seed=None,
+                 start_method=None):
+        """
+        Args:
+            n_envs        (int)         : the number K of games
+            n_workers     (int)         : the number of processes (default: cpu count, at most K)
+            variant_names (str or list) : the variant of each game (one for all or K)
+            random_pick   (bool or list): pick a random variant at each reset (one for all or K)
+            random_player (bool)        : random starting player
+            copy          (bool)        : return copies of the shared arrays instead of views,
+                                          that the next step overwrites
+            seed          (int)         : seed of the first worker, the others follow
+        """
+        self.num_envs = n_envs
+        self.copy = copy
+        self.random_player = random_player
+        self.variant_names = self._per_env(variant_names)
+        self.random_pick = self._per_env(random_pick)
+
+        single_env = AbaloneEnv(render_mode='terminal', max_turns=max_turns, backend=backend)
+        self.observation_space = single_env.observation_space
+        self.action_space = single_env.action_space
+
+        ctx = mp.get_context(start_method)
+        self._buffers = {name: ctx.RawArray(ctypes.c_byte, n_envs * int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                         for name, (shape, dtype) in AbaloneVecEnv.SHARED_ARRAYS.items()}
+        self._arrays = AbaloneVecEnv._as_arrays(self._buffers, n_envs)
+
+        n_workers = min(n_workers or mp.cpu_count(), n_envs)
+        self.remotes, self.processes = [], []
+        for i, indices in enumerate(np.array_split(np.arange(n_envs), n_workers)):
+            remote, worker_remote = ctx.Pipe()
+            worker_seed = None if seed is None else seed + i
+            process = ctx.Process(
+                target=_worker,
+                args=(worker_remote, remote, indices, self._buffers, n_envs, max_turns, backend, worker_seed),
+                daemon=True
+            )
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        self.waiting = False
+        self.closed = False
+
+    def _per_env(self, value):
+        if isinstance(value, (list, tuple)):
+            assert len(value) == self.num_envs, f"expected {self.num_envs} values, got {len(value)}"
+            return list(value)
+        return [value] * self.num_envs
+
+    @staticmethod
+    def _as_arrays(buffers, n_envs):
+        return {name: np.frombuffer(buffers[name], dtype=dtype).reshape((n_envs,) + shape)
+                for name, (shape, dtype) in AbaloneVecEnv.SHARED_ARRAYS.items()}
+
+    def _get(self, name):
+        array = self._arrays[name]
+        return array.copy() if self.copy else array
+
+    def _send(self, command, data=None):
+        for remote in self.remotes:
+            remote.send((command, data))
+
+    def _wait(self):
+        for remote in self.remotes:
+            remote.recv()
+
+    # =========================================================================
+    #                              GYM INTEGRATION
+    # =========================================================================
+
+    def reset(self, variant_names=None, random_pick=None):
+        """
+        reset every game, optionally with new variants (one for all or K)
+
+        Returns:
+            observations (numpy.ndarray): (K, 11, 11)
+        """
+        if variant_names is not None:
+            self.variant_names = self._per_env(variant_names)
+        if random_pick is not None:
+            self.random_pick = self._per_env(random_pick)
+        self._send('reset', (self.variant_names, self.random_pick, self.random_player))
+        self._wait()
+        return self._get('observations')
+
+    def step_async(self, actions):
+        self._arrays['actions'][:] = actions
+        self._send('step')
+        self.waiting = True
+
+    def step_wait(self):
+        self._wait()
+        self.waiting = False
+        infos = {name: self._get(name) for name in ['turn', 'player', 'move_type', 'terminal_observation']}
+        return self._get('observations'), self._get('rewards'), self._get('dones'), infos
+
+    def step(self, actions):
+        """
+        Args:
+            actions (numpy.ndarray) : (K, 2) the (pos0, pos1) of each game
+
+        Returns:
+            observations (numpy.ndarray): (K, 11, 11)
+            rewards      (numpy.ndarray): (K,)
+            dones        (numpy.ndarray): (K,)
+            infos        (dict)         : see the class description
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def get_action_masks(self):
+        """
+        Returns:
+            numpy.ndarray: (K, 3721) boolean masks of the legal actions
+        """
+        return self._get('masks')
+
+    @property
+    def current_player(self):
+        return self._get('current_player')
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            self._wait()
+        self._send('close')
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+
+def _worker(remote, parent_remote, indices, buffers, n_envs, max_turns, backend, seed):
+    """
+    run the games of the given indices, the results are written in the
+    shared arrays and an empty message acknowledges each command.
+    """
+    parent_remote.close()
+    # forked workers would otherwise share the same random state
+    np.random.seed(seed)
+    random.seed(seed)
+
+    arrays = AbaloneVecEnv._as_arrays(buffers, n_envs)
+    envs = [AbaloneEnv(render_mode='terminal', max_turns=max_turns, backend=backend) for _ in indices]
+    variants = [None] * len(indices)
+    move_type_index = {move_type: i for i, move_type in enumerate(AbaloneVecEnv.MOVE_TYPES)}
+
+    def reset(j, i):
+        variant_name, random_pick, random_player = variants[j]
+        arrays['observations'][i] = envs[j].reset(
+            random_player=random_player, variant_name=variant_name, random_pick=random_pick
+        )
+        arrays['current_player'][i] = envs[j].current_player
+
+    def write_masks():
+        arrays['masks'][indices] = get_action_masks(
+            arrays['observations'][indices], arrays['current_player'][indices]
+        )
+
+    while True:
+        command, data = remote.recv()
+
+        if command == 'step':
+            for j, i in enumerate(indices):
+                pos0, pos1 = arrays['actions'][i]
+                observation, reward, done, info = envs[j].step((int(pos0), int(pos1)))
+                arrays['rewards'][i] = reward
+                arrays['dones'][i] = done
+                arrays['turn'][i] = info['turn']
+                arrays['player'][i] = info['player']
+                arrays['move_type'][i] = move_type_index.get(info['move_type'], -1)
+                if done:
+                    arrays['terminal_observation'][i] = observation
+                    reset(j, i)
+                else:
+                    arrays['observations'][i] = observation
+                    arrays['current_player'][i] = envs[j].current_player
+            write_masks()
+
+        elif command == 'reset':
+            variant_names, random_pick, random_player = data
+            for j, i in enumerate(indices):
+                variants[j] = (variant_names[i], random_pick[i], random_player)
+                reset(j, i)
+            arrays['dones'][indices] = False
+            write_masks()
+
+        elif command == 'close':
+            remote.close()
+            break
+
+        remote.send(None)
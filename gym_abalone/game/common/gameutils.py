@@ -1,6 +1,5 @@
 import json
 import random
-import pyglet
 import os
 from pathlib import Path
 
@@ -8,6 +7,7 @@ class AbaloneUtils:
 
     @staticmethod
     def load_fonts(dirname='assets/fonts/'):
+        import pyglet
         path = Path(os.path.dirname(os.path.realpath(__file__))).parent
         path = path.joinpath(dirname)
         for font_filename in os.listdir(path):
@@ -39,6 +39,7 @@ class AbaloneUtils:
     
     @staticmethod
     def get_im_centered(im_path, centered=True):
+        import pyglet
 
         # resolve path
         path = Path(os.path.dirname(os.path.realpath(__file__))).parent
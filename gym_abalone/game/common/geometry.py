@@ -0,0 +1,111 @@
+r"""
+tables of the hexagonal board, built once at import time and shared by
+the engine, the envs and the GUI.
+
+The 61 positions (pos) are numbered row by row on the 11x11 board, whose
+VOID border stops every walk :
+
+                      0   1   2   3   4                   (1, 5) ... (1, 9)
+                    5   6   7   8   9  10
+                  ...                 ...
+        56  57  58  59  60                    (9, 1) ... (9, 5)
+
+A direction index (0 <= < 6) refers to DIRECTIONS :
+
+           UP_LEFT : 4     5 : UP_RIGHT
+                        \   /
+                         \ /
+         LEFT : 3 ----- * ----- 0 : RIGHT
+                         / \
+                        /   \
+         DOWN_LEFT : 2       1 : DOWN_RIGHT
+
+and an axis (0 <= < 3) to the lines of the board :
+    0 (RIGHT-LEFT), 1 (DOWN_RIGHT-UP_LEFT), 2 (DOWN_LEFT-UP_RIGHT)
+"""
+import numpy as np
+
+BOARD_SIZE = 11
+
+# number of positions of each row
+ROWS = [5, 6, 7, 8, 9, 8, 7, 6, 5]
+
+N_POSITIONS = sum(ROWS)
+
+#             RIGHT    DOWN_RIGHT DOWN_LEFT  LEFT     UP_LEFT   UP_RIGHT
+DIRECTIONS = [(0, +1), (+1, 0),  (+1, -1), (0, -1), (-1, 0),  (-1, +1)]
+
+# the pos of an off-board cell
+OFF_BOARD = -1
+
+# longest ray : a sumito of 3 marbles pushing 2 reads 4 cells away
+MAX_RAY = 4
+
+# =========================================================================
+#                           POSITIONS
+# =========================================================================
+
+# pos -> (r, c)
+POSITIONS = [(1 + row, max(1, 5 - row) + col) for row, n_cols in enumerate(ROWS) for col in range(n_cols)]
+POSITIONS_ARRAY = np.array(POSITIONS, dtype=np.int64)
+
+# pos -> flat index (r * BOARD_SIZE + c) of the cell
+FLAT = [r*BOARD_SIZE + c for r, c in POSITIONS]
+
+# flat index -> pos (OFF_BOARD if not a position)
+POS_OF_FLAT = [OFF_BOARD] * BOARD_SIZE**2
+for _pos, _f in enumerate(FLAT):
+    POS_OF_FLAT[_f] = _pos
+
+# (r, c) -> pos (OFF_BOARD if not a position)
+POS_OF_COORDS = np.array(POS_OF_FLAT, dtype=np.int64).reshape(BOARD_SIZE, BOARD_SIZE)
+
+# the cells of the 11x11 board which are positions
+VALID = POS_OF_COORDS != OFF_BOARD
+
+# direction index -> flat offset of a step
+OFFSETS = [dr*BOARD_SIZE + dc for dr, dc in DIRECTIONS]
+
+# =========================================================================
+#                           NEIGHBORS AND RAYS
+# =========================================================================
+
+# RAYS[pos, d, k] : pos reached after k+1 steps in the direction d
+# (OFF_BOARD once the ray left the board)
+RAYS = np.full((N_POSITIONS, len(DIRECTIONS), MAX_RAY), OFF_BOARD, dtype=np.int64)
+for _pos, _f in enumerate(FLAT):
+    for _d, _offset in enumerate(OFFSETS):
+        for _k in range(MAX_RAY):
+            _g = _f + (_k + 1)*_offset
+            if not 0 <= _g < BOARD_SIZE**2 or POS_OF_FLAT[_g] == OFF_BOARD:
+                break
+            RAYS[_pos, _d, _k] = POS_OF_FLAT[_g]
+
+# NEIGHBORS[pos, d] : the neighbor of pos in the direction d
+NEIGHBORS = RAYS[:, :, 0].copy()
+
+# =========================================================================
+#                           LINES
+# =========================================================================
+
+# LINES[pos, axis] : index (0 <= < 9) of the line of pos on each axis
+LINES = np.array([(r - 1, c - 1, r + c - 6) for r, c in POSITIONS], dtype=np.int64)
+
+# LINE_MEMBERS[axis][i] : the pos of the line i, walked in the direction
+# of index axis (RIGHT, DOWN_RIGHT or DOWN_LEFT)
+LINE_MEMBERS = [[np.flatnonzero(LINES[:, axis] == i).tolist() for i in range(len(ROWS))]
+                for axis in range(3)]
+
+# =========================================================================
+#                           DEPLACEMENTS
+# =========================================================================
+
+# (dr, dc) -> (step, direction_index) of a deplacement along a unique
+# direction, see AbaloneGame.decompose_inline
+INLINE = {}
+for _step in range(1, BOARD_SIZE):
+    for _d, (_dr, _dc) in enumerate(DIRECTIONS):
+        INLINE[(_step*_dr, _step*_dc)] = (_step, _d)
+INLINE[(0, 0)] = (0, 3)
+
+del _pos, _f, _d, _offset, _k, _g, _step, _dr, _dc
@@ -0,0 +1,107 @@
+import numpy as np
+from .gamelogic import AbaloneGame
+
+# cells read beyond the 11x11 board are VOID : a column walk goes at most
+# 5 steps away from a position
+PADDING = 6 * AbaloneGame.BOARD_SIZE
+
+# see _get_tables
+_TABLES = None
+
+
+def _get_tables():
+    """
+    Returns:
+        dict with
+            'flat'  : (61,) flat index of each position in the padded cells
+            'pos'   : (PADDING*2 + 121,) padded flat index -> pos (-1 if not a position)
+            'moves' : AbaloneGame's move tables
+    """
+    global _TABLES
+    if _TABLES is None:
+        tables = AbaloneGame._get_move_tables()
+        n2 = AbaloneGame.BOARD_SIZE ** 2
+        pos_of = np.full(n2 + 2*PADDING, -1, dtype=np.int64)
+        pos_of[PADDING:PADDING + n2] = tables['pos']
+        _TABLES = {
+            'flat'  : np.array(tables['flat']) + PADDING,
+            'pos'   : pos_of,
+            'moves' : tables,
+        }
+    return _TABLES
+
+
+def get_action_masks(boards, players):
+    """
+    compute the legal actions of a batch of boards at once.
+
+    Each kind of move (inline move, sumito, sidestep) in a direction is
+    checked for the 61 positions of the N boards with a single vectorized
+    comparison of the boards' cells shifted by a constant flat offset.
+
+    Args:
+        boards  (numpy.ndarray): (N, 11, 11) boards
+        players (numpy.ndarray): (N,) the player to move on each board
+
+    Returns:
+        numpy.ndarray: (N, 3721) boolean mask, True at pos0 * 61 + pos1
+                       for each legal move (pos0, pos1)
+
+    Examples:
+        >>> game = AbaloneGame()
+        >>> game.reset(variant_name='classical')
+        >>> masks = get_action_masks(game.board[None], [game.current_player])
+        >>> int(masks.sum())
+        44
+    """
+    tables = _get_tables()
+    flat, pos_of = tables['flat'], tables['pos']
+    n_pos = len(flat)
+
+    boards = np.asarray(boards, dtype=np.int8)
+    n_boards = boards.shape[0]
+    n2 = AbaloneGame.BOARD_SIZE ** 2
+
+    cells = np.full((n_boards, n2 + 2*PADDING), AbaloneGame.TOKEN_VOID, dtype=np.int8)
+    cells[:, PADDING:PADDING + n2] = boards.reshape(n_boards, n2)
+    own   = cells == np.asarray(players, dtype=np.int8).reshape(n_boards, 1)
+    empty = cells == AbaloneGame.TOKEN_EMPTY
+    free  = empty | (cells == AbaloneGame.TOKEN_VOID)
+    enemy = (cells >= 0) & ~own
+
+    masks = np.zeros((n_boards, n_pos, n_pos), dtype=bool)
+    pos0  = np.arange(n_pos)
+
+    def at(array, offset):
+        """ (N, 61) values of the cell at offset of each position """
+        return array[:, flat + offset]
+
+    def add(tails, target_offset):
+        masks[:, pos0, pos_of[flat + target_offset]] |= tails
+
+    for o in tables['moves']['offsets']:
+        # columns of 1, 2 and 3 marbles starting at each position
+        own1 = at(own, 0)
+        own2 = own1 & at(own, o)
+        own3 = own2 & at(own, 2*o)
+
+        # RULE | An "In-line" Move: marbles are moved as a column into a free space
+        add(own1 & at(empty,   o),   o)
+        add(own2 & at(empty, 2*o), 2*o)
+        add(own3 & at(empty, 3*o), 3*o)
+
+        # RULE | Sumito : (2vs1) (3vs1) (3vs2)
+        add(own2 & at(enemy, 2*o) & at(free, 3*o), 2*o)
+        add(own3 & at(enemy, 3*o) & at(free, 4*o), 3*o)
+        push_3vs2 = own3 & at(enemy, 3*o) & (at(cells, 4*o) == at(cells, 3*o)) & at(free, 5*o)
+        add(push_3vs2, 3*o)
+        add(push_3vs2, 4*o)
+
+    # RULE | A 'Side step' move: Marbles are moved sideways into adjacent free spaces.
+    for axis, k, side in tables['moves']['columns']:
+        tails = at(own, 0) & at(own, axis) & at(empty, side) & at(empty, side + axis)
+        if k == 2:
+            tails &= at(own, 2*axis) & at(empty, side + 2*axis)
+        add(tails, side + k*axis)
+
+    return masks.reshape(n_boards, n_pos * n_pos)
@@ -0,0 +1,111 @@
+"""
+compact action space : a slot for each (pos0, pos1) that is a legal move
+on some board, instead of the 61 * 61 = 3721 pairs of which most can
+never be played.
+
+The slots enumerate every geometrically possible move :
+    - inline moves and sumitos : a column starting at pos0 in a direction,
+      pos1 being 1 to 4 cells away (1 to 3 marbles moved to an empty cell,
+      or pushing 1 or 2 enemy marbles)
+    - side steps : a column of 2 or 3 marbles starting at pos0 along an
+      axis, moved one cell aside, pos1 being the cell reached by its
+      far end (see AbaloneGame._get_move_tables)
+
+and are sorted by (pos0, pos1), so the slots of a sorted list of moves
+are sorted too.
+
+Examples:
+    >>> slot = get_slot(0, 1)
+    >>> get_pair(slot)
+    (0, 1)
+    >>> n_slots()
+    1620
+"""
+import numpy as np
+
+from gym_abalone.game.common import geometry
+from .gamelogic import AbaloneGame
+
+# see _get_tables
+_TABLES = None
+
+
+def _get_tables():
+    """
+    Returns:
+        dict with
+            'pairs' : (n_slots, 2) the (pos0, pos1) of each slot
+            'slots' : (3721,) int16 slot of pos0 * 61 + pos1 (-1 if none)
+    """
+    global _TABLES
+    if _TABLES is None:
+        tables = AbaloneGame._get_move_tables()
+        flat, pos_of = tables['flat'], tables['pos']
+        n = geometry.N_POSITIONS
+
+        def on_board(f):
+            return 0 <= f < len(pos_of) and pos_of[f] != geometry.OFF_BOARD
+
+        pairs = set()
+        for pos0 in range(n):
+            # inline moves and sumitos along each direction
+            for d in range(len(geometry.DIRECTIONS)):
+                for pos1 in geometry.RAYS[pos0, d]:
+                    if pos1 == geometry.OFF_BOARD:
+                        break
+                    pairs.add((pos0, int(pos1)))
+            # side steps of the columns of 2 and 3 marbles
+            f0 = flat[pos0]
+            for axis, k, side in tables['columns']:
+                cells = [f0 + i*axis for i in range(k + 1)] + [f0 + side + i*axis for i in range(k + 1)]
+                if all(on_board(f) for f in cells):
+                    pairs.add((pos0, pos_of[f0 + side + k*axis]))
+
+        pairs = np.array(sorted(pairs), dtype=np.int64)
+        slots = np.full(n * n, -1, dtype=np.int16)
+        slots[pairs[:, 0] * n + pairs[:, 1]] = np.arange(len(pairs))
+        _TABLES = {'pairs': pairs, 'slots': slots}
+    return _TABLES
+
+
+def n_slots():
+    """ the size of the compact action space """
+    return len(_get_tables()['pairs'])
+
+
+def get_slot(pos0, pos1):
+    """
+    Returns:
+        int: the slot of the move (pos0, pos1), -1 if it can never be legal
+    """
+    n = geometry.N_POSITIONS
+    if not (0 <= pos0 < n and 0 <= pos1 < n):
+        return -1
+    return int(_get_tables()['slots'][pos0 * n + pos1])
+
+
+def get_pair(slot):
+    """
+    Returns:
+        tuple (pos0, pos1): the move of a slot
+
+    Raises:
+        IndexError: if the slot is out of range (negative slots included)
+    """
+    pairs = _get_tables()['pairs']
+    if not 0 <= slot < len(pairs):
+        raise IndexError(f'slot {slot} out of range')
+    pos0, pos1 = pairs[slot]
+    return int(pos0), int(pos1)
+
+
+def compact_masks(masks):
+    """
+    Args:
+        masks (numpy.ndarray) : (..., 3721) masks over the pairs pos0 * 61 + pos1
+
+    Returns:
+        numpy.ndarray: (..., n_slots) the masks over the slots
+    """
+    pairs = _get_tables()['pairs']
+    return np.asarray(masks)[..., pairs[:, 0] * geometry.N_POSITIONS + pairs[:, 1]]
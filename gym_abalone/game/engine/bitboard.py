@@ -0,0 +1,372 @@
+import numpy as np
+
+from ..common import geometry
+from .gamelogic import AbaloneGame
+
+
+class AbaloneBitboardGame(AbaloneGame):
+    """
+    AbaloneGame whose state is kept as one integer mask per player.
+
+    The bit f of a mask is the cell (r, c) of the 11x11 board with
+    f = r * BOARD_SIZE + c. Thanks to the VOID border, the neighbor of a
+    cell in a direction is a constant shift of the mask and a shifted
+    marble can't wrap around to another valid cell.
+
+    The masks are the state : the moves, their modifications and the hash
+    are read from them. The 11x11 board is only built when it is asked for
+    (observations, rewards, GUI) and dropped by the next modification. A
+    board edited in place must be followed by refresh_state, as with
+    AbaloneGame.
+    """
+
+    # tables of the bitboard generator, see _get_bitboard_tables
+    _BITBOARD_TABLES = None
+
+    # Abalone is played by up to 6 players
+    MAX_PLAYERS = 6
+
+    def __init__(self):
+        self.masks = None
+        self._board = None
+        # bytes of _board when the masks were taken from it or gave it
+        self._board_bytes = None
+        super(AbaloneBitboardGame, self).__init__()
+
+    # =========================================================================
+    #                           BOARD RELATED
+    # =========================================================================
+
+    @property
+    def board(self):
+        if self._board is None and self.masks is not None:
+            self._board = self.masks_to_board(self.masks)
+            self._board_bytes = self._board.tobytes()
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self._board_bytes = None
+        self.masks = None
+        if board is not None:
+            self._sync_masks()
+
+    def _sync_masks(self):
+        """ take the masks from _board """
+        self._board_bytes = self._board.tobytes()
+        # the starting boards are converted once, see _get_bitboard_tables
+        masks = self._get_bitboard_tables()['variants'].get(self._board_bytes)
+        self.masks = list(masks) if masks is not None else self.board_to_masks(self._board)
+
+    @staticmethod
+    def board_to_masks(board):
+        """
+        Returns:
+            list: the mask of each player's marbles found in the board
+        """
+        tables = AbaloneBitboardGame._get_bitboard_tables()
+        # the cell f is the f-th binary digit from the right
+        cells = board.tobytes()[::-1]
+        return [int(cells.translate(tables['bits'][player]), 2) for player in range(int(board.max()) + 1)]
+
+    @staticmethod
+    def masks_to_board(masks):
+        """
+        Returns:
+            numpy.ndarray: the 11x11 board of the given masks
+        """
+        n = AbaloneGame.BOARD_SIZE
+        tables = AbaloneBitboardGame._get_bitboard_tables()
+        cells = tables['empty_board'].reshape(-1)
+        for player, mask in enumerate(masks):
+            # the binary digits of the mask, from the cell 0, as 0 or player + 1
+            digits = format(mask, '0%db' % (n*n)).encode().translate(tables['digits'][player])[::-1]
+            cells = cells + np.frombuffer(digits, dtype=np.int8)
+        return cells.reshape(n, n)
+
+    @staticmethod
+    def mask_to_flats(mask):
+        """
+        Returns:
+            list: the flat index of each bit set in the mask
+        """
+        flats = []
+        while mask:
+            # from the highest bit
+            f = mask.bit_length() - 1
+            flats.append(f)
+            mask ^= 1 << f
+        return flats
+
+    @staticmethod
+    def shift(mask, offset):
+        """
+        shift the mask so that the bit f is set if the bit f + offset was.
+        """
+        return mask >> offset if offset > 0 else mask << -offset
+
+    def get_token_from_pos(self, pos):
+        f = geometry.FLAT[pos]
+        for player, mask in enumerate(self.masks):
+            if mask >> f & 1:
+                return player
+        return AbaloneGame.TOKEN_EMPTY
+
+    def refresh_state(self):
+        # the board may have been edited in place : the masks follow it
+        if self._board is not None and self._board.tobytes() != self._board_bytes:
+            self._sync_masks()
+        # a player may have no marble on the board
+        self.masks += [0] * (self.players - len(self.masks))
+        super(AbaloneBitboardGame, self).refresh_state()
+
+    def compute_hash(self):
+        zobrist = AbaloneGame.ZOBRIST
+        pos_of = geometry.POS_OF_FLAT
+        h = zobrist.sides[self.current_player]
+        for player, mask in enumerate(self.masks):
+            keys = zobrist.marbles[player]
+            for f in self.mask_to_flats(mask):
+                h ^= keys[pos_of[f]]
+        for player, damages in enumerate(self.players_damages):
+            h ^= zobrist.damages[player][damages]
+        return h
+
+    @classmethod
+    def _get_bitboard_tables(cls):
+        """
+        Returns:
+            dict with
+                'valid'       : mask of the 61 cells
+                'void'        : mask of the VOID cells of the 11x11 board
+                'empty_board' : the 11x11 board without marbles
+                'keys'        : flat offset -> list flat index -> pos0 * 61 + pos1
+                                of the move from this cell to the cell at the
+                                offset (-1 if one of them is not a position)
+                'pairs'       : pos0 * 61 + pos1 -> (pos0, pos1)
+                'bits'        : player -> bytes.translate table of a cell
+                                to b'1' if it holds the player's marble, b'0'
+                'digits'      : player -> bytes.translate table of a binary
+                                digit to the token of the cell minus TOKEN_EMPTY
+                'variants'    : bytes of a starting board -> its masks
+        """
+        if cls._BITBOARD_TABLES is not None:
+            return cls._BITBOARD_TABLES
+
+        n = cls.BOARD_SIZE
+        flat, pos_of = geometry.FLAT, geometry.POS_OF_FLAT
+        valid = 0
+        for f in flat:
+            valid |= 1 << f
+
+        # every target offset of a move : columns of 1 to 3 marbles and the
+        # 2 pushed marbles of a 3vs2, then the sidestep columns
+        deltas = {k*o for o in geometry.OFFSETS for k in range(1, 5)}
+        deltas |= {side + k*axis for axis, k, side in cls._get_move_tables()['columns']}
+        keys = {}
+        for delta in deltas:
+            keys[delta] = [-1] * n*n
+            for pos0, f in enumerate(flat):
+                if 0 <= f + delta < n*n and pos_of[f + delta] >= 0:
+                    keys[delta][f] = pos0 * geometry.N_POSITIONS + pos_of[f + delta]
+
+        cls._BITBOARD_TABLES = {
+            'valid'       : valid,
+            'void'        : ((1 << n*n) - 1) & ~valid,
+            'empty_board' : AbaloneGame.new_board(),
+            'keys'        : keys,
+            'pairs'       : [divmod(key, geometry.N_POSITIONS) for key in range(geometry.N_POSITIONS**2)],
+            'bits'        : [bytes(ord('1') if token == player else ord('0') for token in range(256))
+                             for player in range(cls.MAX_PLAYERS)],
+            'digits'      : [bytes.maketrans(b'01', bytes((0, player - cls.TOKEN_EMPTY)))
+                             for player in range(cls.MAX_PLAYERS)],
+        }
+        # board_to_masks reads the tables above
+        cls._BITBOARD_TABLES['variants'] = {board.tobytes(): cls.board_to_masks(board)
+                                            for board in cls._get_variant_store().boards}
+        return cls._BITBOARD_TABLES
+
+    # =========================================================================
+    #                           check methods
+    # =========================================================================
+
+    def _update_legal_moves(self, player):
+        """
+        bit-parallel version of AbaloneGame._update_legal_moves : in each
+        direction, the shifted masks are intersected once for the whole
+        board, giving the mask of the origins of every kind of move (inline
+        move of 1, 2, 3 marbles, sumito, sidestep column). Each of these
+        masks is decoded once into moves.
+
+        The moves are generated again after each move, which is cheaper
+        than tracking the cells read by each origin.
+        """
+        tables  = self._get_bitboard_tables()
+        keys    = tables['keys']
+        pairs   = tables['pairs']
+        decode  = AbaloneBitboardGame.mask_to_flats
+
+        # the variants are 2 players games : one mask holds the enemies
+        enemy = 1 - player
+        own   = self.masks[player]
+        opp   = self.masks[enemy]
+        empty = tables['valid'] & ~(own | opp)
+        void  = tables['void']
+        ejected = 'winner' if self.players_damages[enemy] + 1 == AbaloneGame.LIFES else 'ejected'
+
+        moves = {}
+        for o, columns in self._get_move_tables()['sidesteps'].items():
+            # the cells at 1, 2, 3 steps in the direction, seen from the origin
+            if o > 0:
+                own1, own2, emp1, emp2, emp3 = own >> o, own >> 2*o, empty >> o, empty >> 2*o, empty >> 3*o
+            else:
+                own1, own2, emp1, emp2, emp3 = own << -o, own << -2*o, empty << -o, empty << -2*o, empty << -3*o
+            # the origins of the columns of 2 and 3 marbles
+            two   = own & own1
+            three = two & own2
+
+            # RULE | An "In-line" Move: marbles are moved as a column into a free space
+            for origins, k in ((own & emp1, 1), (two & emp2, 2), (three & emp3, 3)):
+                if origins:
+                    targets = keys[k*o]
+                    for f in decode(origins):
+                        moves[targets[f]] = 'inline_move'
+
+            if not two:
+                continue
+
+            # RULE | A 'Side step' move: Marbles are moved sideways into adjacent free spaces.
+            empty2 = empty & emp1
+            empty3 = empty2 & emp2
+            for k, side in columns:
+                free = empty2 if k == 1 else empty3
+                origins = (two if k == 1 else three) & (free >> side if side > 0 else free << -side)
+                if origins:
+                    targets = keys[side + k*o]
+                    for f in decode(origins):
+                        # an inline move prevails
+                        moves.setdefault(targets[f], 'sidestep_move')
+
+            # RULE | Sumito : (2vs1) (3vs1) (3vs2)
+            if o > 0:
+                opp2, opp3 = opp >> 2*o, opp >> 3*o
+            else:
+                opp2, opp3 = opp << -2*o, opp << -3*o
+            two_one, three_one = two & opp2, three & opp3
+            if not (two_one or three_one):
+                continue
+            if o > 0:
+                opp4 = opp >> 4*o
+                free = [(emp3, void >> 3*o), (empty >> 4*o, void >> 4*o), (empty >> 5*o, void >> 5*o)]
+            else:
+                opp4 = opp << -4*o
+                free = [(emp3, void << -3*o), (empty << -4*o, void << -4*o), (empty << -5*o, void << -5*o)]
+            three_two = three_one & opp4
+            for origins, (emp, vd), pushed in ((two_one,   free[0], (2,)),
+                                               (three_one, free[1], (3,)),
+                                               (three_two, free[2], (3, 4))):
+                for behind, move_type in ((emp, 'inline_push'), (vd, ejected)):
+                    pushing = origins & behind
+                    if pushing:
+                        flats = decode(pushing)
+                        # any of the pushed marbles can be targeted
+                        for k in pushed:
+                            targets = keys[k*o]
+                            for f in flats:
+                                moves[targets[f]] = move_type
+
+        return {pairs[key]: moves[key] for key in sorted(moves)}
+
+    def _invalidate_moves(self, changed=None):
+        # the moves are not kept by origin, see _update_legal_moves
+        self._legal_moves = {}
+
+    def validate_move(self, pos0, pos1, player, return_modif=False):
+        """
+        look the move up in the player's legal moves if they are known (see
+        cached_legal_moves), otherwise check it on the board as AbaloneGame.
+
+        Returns:
+            move_type or tuple (move_type, modifications) if the move is valid
+            False otherwise
+        """
+        moves = self.cached_legal_moves(player)
+        if moves is None:
+            return super(AbaloneBitboardGame, self).validate_move(pos0, pos1, player, return_modif)
+        move_type = moves.get((pos0, pos1))
+        if move_type is None:
+            return False
+        if not return_modif:
+            return move_type
+        return move_type, self._mask_modifications(pos0, pos1, move_type, player)
+
+    def get_modifications(self, pos0, pos1, move_type):
+        return self._mask_modifications(pos0, pos1, move_type, self.current_player)
+
+    def _mask_modifications(self, pos0, pos1, move_type, player):
+        """
+        the modifications of the legal move (pos0, pos1), read from the
+        masks. The moved marbles are listed from the farthest one, as in
+        AbaloneGame.check_inline_push.
+        """
+        pos_of  = geometry.POS_OF_FLAT
+        offsets = geometry.OFFSETS
+        r0, c0 = geometry.POSITIONS[pos0]
+        r1, c1 = geometry.POSITIONS[pos1]
+        f0 = geometry.FLAT[pos0]
+
+        if move_type == 'sidestep_move':
+            own = self.masks[player]
+            empty = self._get_bitboard_tables()['valid'] & ~sum(self.masks)
+            for side_move, inline_step, inline_move in self.decompose_sidestep(r1 - r0, c1 - c0):
+                side, axis = offsets[side_move], offsets[inline_move]
+                old_flats = [f0 + s*axis for s in range(inline_step + 1)]
+                if all(own >> f & 1 and empty >> (f + side) & 1 for f in old_flats):
+                    return [(pos_of[f], pos_of[f + side], side_move) for f in old_flats]
+
+        step, direction_index = geometry.INLINE[(r1 - r0, c1 - c0)]
+        o = offsets[direction_index]
+        if move_type == 'inline_move':
+            n = step
+        else:
+            # the allies and the enemies, up to the free cell
+            occupied = sum(self.masks)
+            n = 1
+            while occupied >> (f0 + n*o) & 1:
+                n += 1
+        flats = [f0 + i*o for i in reversed(range(n))]
+
+        modifications = []
+        if move_type in ('ejected', 'winner'):
+            # -1 because it is a ejected marble
+            damaged_pos = pos_of[flats.pop(0)]
+            damaged_player = self.get_token_from_pos(damaged_pos)
+            modifications.append((damaged_pos, self.players_damages[damaged_player], -1))
+        modifications += [(pos_of[f], pos_of[f + o], direction_index) for f in flats]
+        return modifications
+
+    # =========================================================================
+    #                        game modifiers methods
+    # =========================================================================
+
+    def swap_coords(self, r0, c0, r1, c1):
+        n = AbaloneGame.BOARD_SIZE
+        swapped = (1 << (r0*n + c0)) | (1 << (r1*n + c1))
+        for player, mask in enumerate(self.masks):
+            # only a marble moving to an empty cell changes the mask
+            if mask & swapped and mask & swapped != swapped:
+                self.masks[player] = mask ^ swapped
+        self._board = None
+
+    def eject(self, r, c):
+        bit = 1 << (r*AbaloneGame.BOARD_SIZE + c)
+        damaged_player = next(p for p, mask in enumerate(self.masks) if mask & bit)
+        self.masks[damaged_player] ^= bit
+        self._board = None
+        self.damage(damaged_player)
+
+    def restore(self, r, c, player):
+        self.masks[player] |= 1 << (r*AbaloneGame.BOARD_SIZE + c)
+        self._board = None
+        self.players_damages[player] -= 1
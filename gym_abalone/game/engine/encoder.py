@@ -0,0 +1,112 @@
+import numpy as np
+
+from gym_abalone.game.common import geometry
+from .gamelogic import AbaloneGame
+
+
+class ObservationEncoder:
+    """
+    encode boards as the planes of a neural network input, seen from the
+    player to move :
+
+        0 own               : 1 on the marbles of the player to move
+        1 opponent          : 1 on the other marbles
+        2 empty             : 1 on the empty positions
+        3 valid             : 1 on the 61 positions
+        4 side_to_move      : the player to move (0 or 1) everywhere
+        5 own_damages       : the player's lost marbles / LIFES everywhere
+        6 opponent_damages  : the opponents' lost marbles / LIFES everywhere
+
+    With the layout 'planes' a board becomes a (7, 11, 11) tensor, with
+    the layout 'cells' only the 61 positions are kept : (7, 61).
+
+    The planes are written into a buffer, given by the caller or owned by
+    the encoder, that the next encoding overwrites.
+
+    Examples:
+        >>> encoder = ObservationEncoder(layout='cells')
+        >>> encoder.encode_game(game).shape
+        (7, 61)
+        >>> encoder.encode(boards, players, damages).shape   # a batch of N
+        (N, 7, 61)
+    """
+
+    PLANES = ['own', 'opponent', 'empty', 'valid', 'side_to_move', 'own_damages', 'opponent_damages']
+
+    LAYOUTS = ['planes', 'cells']
+
+    def __init__(self, layout='planes', dtype=np.float32):
+        assert layout in ObservationEncoder.LAYOUTS, f"unknown layout {layout}"
+        self.layout = layout
+        self.dtype = dtype
+        n_planes = len(ObservationEncoder.PLANES)
+        self.shape = (n_planes, geometry.BOARD_SIZE, geometry.BOARD_SIZE) if layout == 'planes' \
+                else (n_planes, geometry.N_POSITIONS)
+        # the cells kept from the flattened 11x11 board
+        self.cells = slice(None) if layout == 'planes' else np.array(geometry.FLAT)
+        self.valid = geometry.VALID.astype(dtype).ravel()[self.cells]
+        # the own, opponent and empty planes of a cell : table[plane, player, token - TOKEN_VOID]
+        tokens = np.arange(AbaloneGame.TOKEN_VOID, 2)[None]
+        players = np.arange(2)[:, None]
+        self.table = np.array([tokens == players,
+                               (tokens >= 0) & (tokens != players),
+                               np.broadcast_to(tokens == AbaloneGame.TOKEN_EMPTY, (2, tokens.size))], dtype=dtype)
+        self.buffer = np.zeros(self.shape, dtype=dtype)
+
+    def encode(self, boards, players, damages, out=None):
+        """
+        Args:
+            boards  (numpy.ndarray) : (N, 11, 11) boards
+            players (numpy.ndarray) : (N,) the player to move on each board
+            damages (numpy.ndarray) : (N, 2) the lost marbles of each player
+            out     (numpy.ndarray) : (N,) + shape buffer (default: a new array)
+
+        Returns:
+            numpy.ndarray: (N,) + shape the planes of each board
+        """
+        boards = np.asarray(boards)
+        n_boards = boards.shape[0]
+        if out is None:
+            out = np.empty((n_boards,) + self.shape, dtype=self.dtype)
+        planes = out.reshape(n_boards, len(ObservationEncoder.PLANES), -1)
+        if not np.may_share_memory(planes, out):
+            raise ValueError('the buffer must be contiguous to be written in place')
+
+        tokens = boards.reshape(n_boards, -1)[:, self.cells] - AbaloneGame.TOKEN_VOID
+        players = np.asarray(players).reshape(n_boards, 1)
+        # (3, N, cells) looked up at once
+        planes[:, :3] = self.table[:, players, tokens].swapaxes(0, 1)
+        planes[:, 3] = self.valid
+
+        damages = np.asarray(damages).reshape(n_boards, -1)
+        own_damages = np.take_along_axis(damages, players, axis=1)
+        opponent_damages = damages.sum(axis=1, keepdims=True) - own_damages
+        planes[:, 4:, :] = np.stack([players, own_damages / AbaloneGame.LIFES,
+                                     opponent_damages / AbaloneGame.LIFES], axis=1)
+        return out
+
+    def encode_game(self, game, out=None):
+        """
+        Args:
+            game (AbaloneGame)    : the position to encode
+            out  (numpy.ndarray)  : shape buffer (default: the encoder's own,
+                                    overwritten by the next call)
+
+        Returns:
+            numpy.ndarray: the planes of the game
+        """
+        if out is None:
+            out = self.buffer
+        planes = out.reshape(len(ObservationEncoder.PLANES), -1)
+        if not np.may_share_memory(planes, out):
+            raise ValueError('the buffer must be contiguous to be written in place')
+
+        # encode without the batch dimension : a game is encoded at each step
+        player = game.current_player
+        planes[:3] = self.table[:, player, game.board.ravel()[self.cells] - AbaloneGame.TOKEN_VOID]
+        planes[3] = self.valid
+        own_damages = game.players_damages[player]
+        planes[4] = player
+        planes[5] = own_damages / AbaloneGame.LIFES
+        planes[6] = (sum(game.players_damages) - own_damages) / AbaloneGame.LIFES
+        return out
@@ -1,5 +1,9 @@
+import os
 import numpy as np
-from ..common.gameutils import AbaloneUtils
+from ..common import geometry
+from .zobrist import Zobrist
+from .variants import VariantStore
+from .state import GameState
  
 class AbaloneGame:
 
@@ -19,7 +23,7 @@ class AbaloneGame:
     #              /    \ 
     # DOWN_LEFT : 2      1 : DOWN_RIGHT
 
-    ACTIONS = [RIGHT, DOWN_RIGHT, DOWN_LEFT, LEFT, UP_LEFT, UP_RIGHT]
+    ACTIONS = geometry.DIRECTIONS
 
     ACTIONS_NAME = ['→', '↘', '↙', '←', '↖', '↗']
 
@@ -27,16 +31,28 @@ class AbaloneGame:
     TOKEN_VOID     = -2
     TOKEN_EMPTY    = -1
 
-    BOARD_SIZE = 11
+    BOARD_SIZE = geometry.BOARD_SIZE
 
     # NUMBER of life
     LIFES = 6
 
+    # tables of the move generator, see _get_move_tables
+    _MOVE_TABLES = None
+
+    # starting boards of the variants, see _get_variant_store
+    _VARIANT_STORE = None
+    VARIANTS_FILENAME = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'assets', 'variants.json')
+
+    # keys of the position hash
+    ZOBRIST = Zobrist(n_positions=geometry.N_POSITIONS, lifes=LIFES)
+
     def __init__(self):
 
         self.board = None
         self.positions = None
         self.variant = None
+        # index of the variant in the VariantStore
+        self.variant_index = None
         self.players = None
         self.players_sets = None
 
@@ -44,6 +60,18 @@ class AbaloneGame:
         self.turns_count = None
         self.current_player = None
         self.game_over = False
+        # Zobrist hash of the position, updated by each modification
+        self.hash = None
+        # legal moves of each player and the moves of each origin pos
+        # with the cells they were generated from, see legal_moves
+        self._legal_moves = {}
+        self._origins = [None] * geometry.N_POSITIONS
+
+        # records of the moves that unmake_move can take back
+        self.undo_stack = []
+
+        # times the move generation when set, see Profiler
+        self.profiler = None
 
         # episodes
         self.episode = 0
@@ -52,9 +80,11 @@ class AbaloneGame:
 
     def reset(self, player=0, random_player=True, variant_name='classical', random_pick=False):
 
-        self.board = self.new_board()
+        store = AbaloneGame._get_variant_store()
+        i = store.pick(variant_name=variant_name, random_pick=random_pick)
 
-        self.positions = AbaloneGame.find_token_coords(self.board, AbaloneGame.TOKEN_EMPTY)
+        self.board = store.boards[i].copy()
+        self.positions = geometry.POSITIONS
         #                 (1, 5), (1, 6), (1, 7), (1, 8), (1, 9), 
         #             (2, 4), (2, 5), (2, 6), (2, 7), (2, 8), (2, 9), 
         #         (3, 3), (3, 4), (3, 5), (3, 6), (3, 7), (3, 8), (3, 9), 
@@ -66,21 +96,18 @@ class AbaloneGame:
         #                 (9, 1), (9, 2), (9, 3), (9, 4), (9, 5),
         # 
 
-        self.variant = AbaloneUtils.get_variants(variant_name=variant_name, random_pick=random_pick)
+        self.variant = store.variants[i]
+        self.variant_index = i
         self.players = self.variant["players"]
         self.players_sets = self.variant["players_sets"]
-
-        # fill the board
-        for p in range(self.players):
-            for pos in self.players_sets[p]:
-                r, c = self.positions[pos]
-                self.board[r, c] = p
         self.players_damages = [0] * self.players
 
         # start game counters
         self.turns_count = 1
         self.current_player = np.random.randint(self.players) if random_player else player
         self.game_over = False
+        self.undo_stack = []
+        self.refresh_state()
 
         self.episode += 1
         if self.players_victories is None:
@@ -139,7 +166,7 @@ class AbaloneGame:
         return r, c
 
     def get_pos_from_coords(self, r, c):
-        pos = self.positions.index((r, c))
+        pos = geometry.POS_OF_FLAT[r*AbaloneGame.BOARD_SIZE + c]
         return pos
 
     def get_token_from_pos(self, pos):
@@ -147,6 +174,19 @@ class AbaloneGame:
         token = self.board[r, c]
         return token
 
+    def refresh_state(self):
+        """
+        recompute what is derived from the board (hash, legal moves), to be
+        called after the board has been edited by hand.
+        """
+        self.hash = self.compute_hash()
+        self._invalidate_moves()
+
+    def compute_hash(self):
+        """ compute from scratch the Zobrist hash of the position """
+        tokens = self.board.ravel()[geometry.FLAT].tolist()
+        return AbaloneGame.ZOBRIST.hash(tokens, self.current_player, self.players_damages)
+
     @staticmethod
     def get_neighbors(r, c):
         return [(r+dr, c+dc) for (dr, dc) in AbaloneGame.ACTIONS]
@@ -202,15 +242,7 @@ class AbaloneGame:
             >>> print(AbaloneGame.decompose_inline(2, -1))
             None
         """
-        # RIGHT or LEFT
-        if dr==0:
-            return (np.abs(dc), 0 if np.sign(dc)==1 else 3)
-        # DOWN_RIGHT or UP_LEFT
-        elif dc==0:
-            return (np.abs(dr), 1 if np.sign(dr)==1 else 4)
-        # DOWN_LEFT or UP_RIGHT
-        elif np.abs(dr)==np.abs(dc) and np.sign(dr)!=np.sign(dc):
-            return (np.abs(dr), 2 if np.sign(dr)==1 else 5)
+        return geometry.INLINE.get((dr, dc))
 
     # =========================================================================
     #                           check methods
@@ -231,7 +263,7 @@ class AbaloneGame:
             # find the related neighbors in the direction
             related = [(r0+n*r_step, c0+n*c_step) for n in reversed(range(step))]
             # if all the related marbles belongs to the same player
-            if all([self.board[rr, cr] == self.current_player for rr, cr in related]):
+            if all([self.board[rr, cr] == player for rr, cr in related]):
                 action_type = 'inline_move'
                 if not return_modif:
                     return action_type
@@ -242,53 +274,67 @@ class AbaloneGame:
                                     for old_pos, new_pos in zip(old_positions, new_positions)]
                     return action_type, modifications 
     
-    def check_sidestep_move(self, r0, c0, r1, c1, player, return_modif=True):
+    @staticmethod
+    def decompose_sidestep(dr, dc):
+        """
+        list the ways a deplacement (dr, dc) can be read as a 'Side step' :
+        a column of 1 to 3 marbles, aligned in the inline direction, that
+        moves one step in the side direction.
 
-        dr, dc = r1-r0, c1-c0
+        Returns:
+            list of tuple (side_move, inline_step, inline_move)
+                side_move   : the direction index of the side step
+                inline_step : the length of the column minus one (0 <= <3)
+                inline_move : the direction index of the column
+        """
+        tmp      = [AbaloneGame.decompose_inline(dr-dr1, dc-dc1) for dr1, dc1 in AbaloneGame.ACTIONS]
+        decomp   = (dr, dc, dr+dc) # difference of the decompose_directions
 
-        tmp      = [self.decompose_inline(dr-dr1, dc-dc1) for dr1, dc1 in AbaloneGame.ACTIONS]
-        decomp_0 = self.decompose_directions(r0, c0)
-        decomp_1 = self.decompose_directions(r1, c1)
-        decomp   = [a-b for a,b in zip(decomp_1, decomp_0)]
+        # reach the direction
+        act_p = ((1,2), (0,5), (0,1)) # positive
+        act_n = ((4,5), (3,2), (3,4)) # negative
 
+        decompositions = []
         for i in range(len(decomp)):
             direction_distance = decomp[i]
             # if the direction are 1 deplacement appart
-            if np.abs(direction_distance)==1:
-
-                # reach the direction
-                act_p = ((1,2), (0,5), (0,1)) # positive
-                act_n = ((4,5), (3,2), (3,4)) # negative
-                
+            if abs(direction_distance)==1:
                 # there is 2 way of teaching it, take the right one
                 sm0, sm1 = act_p[i] if direction_distance>0 else act_n[i]
                 # 1 step sideway
                 side_move = sm0 if (tmp[sm0][0]<tmp[sm1][0]) else sm1
-                dr_step, dc_step = AbaloneGame.ACTIONS[side_move]
-
                 # inline move
                 inline_step, inline_move = tmp[side_move]
-                dr_inline, dc_inline = AbaloneGame.ACTIONS[inline_move]
-
                 # At any turn, no more than 3 friendly marbles can be moved
                 if inline_step < 3:
-                    old_coords = [(r0+dr_inline*s, c0+dc_inline*s) for s in range(inline_step+1)]
-                    new_coords = [(r0+dr_step+dr_inline*s, c0+dc_step+dc_inline*s) for s in range(inline_step+1)]
-                    
-                    connected = all(self.board[r_, c_] == player for (r_, c_) in old_coords)
-                    free      = all(self.board[r_, c_] == AbaloneGame.TOKEN_EMPTY for (r_, c_) in new_coords)
-                    
-                    if connected and free:
-                        #print(AbaloneGame.ACTIONS_NAME[side_move], inline_step, AbaloneGame.ACTIONS_NAME[inline_move])
-                        action_type = 'sidestep_move'
-                        if not return_modif:
-                            return action_type
-                        else:
-                            old_positions = [self.get_pos_from_coords(r_, c_) for r_, c_ in old_coords]
-                            new_positions = [self.get_pos_from_coords(r_, c_) for r_, c_ in new_coords]
-                            modifications = [(old_pos, new_pos, side_move)  
-                                              for old_pos, new_pos in zip(old_positions, new_positions)]
-                            return action_type, modifications
+                    decompositions.append((side_move, inline_step, inline_move))
+        return decompositions
+
+    def check_sidestep_move(self, r0, c0, r1, c1, player, return_modif=True):
+
+        dr, dc = r1-r0, c1-c0
+
+        for side_move, inline_step, inline_move in self.decompose_sidestep(dr, dc):
+            dr_step, dc_step = AbaloneGame.ACTIONS[side_move]
+            dr_inline, dc_inline = AbaloneGame.ACTIONS[inline_move]
+
+            old_coords = [(r0+dr_inline*s, c0+dc_inline*s) for s in range(inline_step+1)]
+            new_coords = [(r0+dr_step+dr_inline*s, c0+dc_step+dc_inline*s) for s in range(inline_step+1)]
+            
+            connected = all(self.board[r_, c_] == player for (r_, c_) in old_coords)
+            free      = all(self.board[r_, c_] == AbaloneGame.TOKEN_EMPTY for (r_, c_) in new_coords)
+            
+            if connected and free:
+                #print(AbaloneGame.ACTIONS_NAME[side_move], inline_step, AbaloneGame.ACTIONS_NAME[inline_move])
+                action_type = 'sidestep_move'
+                if not return_modif:
+                    return action_type
+                else:
+                    old_positions = [self.get_pos_from_coords(r_, c_) for r_, c_ in old_coords]
+                    new_positions = [self.get_pos_from_coords(r_, c_) for r_, c_ in new_coords]
+                    modifications = [(old_pos, new_pos, side_move)  
+                                      for old_pos, new_pos in zip(old_positions, new_positions)]
+                    return action_type, modifications
 
     
     def check_inline_push(self, r0, c0, r1, c1, player, return_modif=True):
@@ -397,7 +443,254 @@ class AbaloneGame:
 
         return False   
 
+    @classmethod
+    def _get_variant_store(cls):
+        """
+        compile (once) the variants of VARIANTS_FILENAME, see VariantStore
+
+        Returns:
+            VariantStore: the starting boards of the variants
+        """
+        if cls._VARIANT_STORE is None:
+            AbaloneGame._VARIANT_STORE = VariantStore.compile(cls.VARIANTS_FILENAME, AbaloneGame.new_board())
+        return AbaloneGame._VARIANT_STORE
+
+    @classmethod
+    def _get_move_tables(cls):
+        """
+        build (once) the tables used by the move generator. The board is
+        flattened (index = r * BOARD_SIZE + c) so that a step in a direction
+        is a constant offset, the VOID border stopping every walk.
+
+        Returns:
+            dict with
+                'flat'       : pos -> flat index
+                'pos'        : flat index -> pos (-1 if not a position)
+                'offsets'    : direction index -> flat offset
+                'columns'    : list of (axis, k, side) flat offsets of the
+                               sidestep columns of k+1 marbles
+                'sidesteps'  : axis -> list of (k, side) of the columns
+        """
+        if cls._MOVE_TABLES is not None:
+            return cls._MOVE_TABLES
+
+        offsets = geometry.OFFSETS
+
+        # the sidestep decompositions only depend on the deplacement
+        decompositions = {}
+        for dr in range(-4, 5):
+            for dc in range(-4, 5):
+                # columns of 1 marble are inline moves
+                columns = [d for d in cls.decompose_sidestep(dr, dc) if d[1] > 0]
+                if columns:
+                    decompositions[(dr, dc)] = columns
+        sidestep_columns = sorted({(offsets[inline_move], inline_step, offsets[side_move])
+                                   for columns in decompositions.values()
+                                   for side_move, inline_step, inline_move in columns})
+
+        sidesteps = {axis: [(k, side) for axis_, k, side in sidestep_columns if axis_ == axis]
+                     for axis in offsets}
+
+        cls._MOVE_TABLES = {
+            'flat'      : geometry.FLAT,
+            'pos'       : geometry.POS_OF_FLAT,
+            'offsets'   : offsets,
+            'sidesteps' : sidesteps,
+            'columns'   : sidestep_columns,
+        }
+        return cls._MOVE_TABLES
+
+    def _origin_moves(self, pos0, cells):
+        """
+        generate the moves starting from pos0, for the owner of its marble,
+        by walking along the 6 directions (inline moves and pushes) and by
+        checking the sidestep columns along each direction.
+
+        Returns:
+            tuple (moves, read, player)
+                moves  : list of ((pos0, pos1), move_type) sorted by pos1
+                read   : mask (bit = flat index) of the cells read, the moves
+                         can't change as long as none of them changes
+                player : the owner of pos0, TOKEN_EMPTY if there is no marble
+        """
+        tables  = AbaloneGame._get_move_tables()
+        pos_of  = tables['pos']
+        EMPTY, VOID = AbaloneGame.TOKEN_EMPTY, AbaloneGame.TOKEN_VOID
+
+        f0 = tables['flat'][pos0]
+        read = 1 << f0
+        player = cells[f0]
+        if player < 0:
+            return [], read, player
+
+        moves = {}
+        for offset in tables['offsets']:
+            # count the player's column starting at pos0
+            f, allies = f0 + offset, 1
+            while cells[f] == player:
+                read |= 1 << f
+                f, allies = f + offset, allies + 1
+            read |= 1 << f
+            # RULE | At any turn, no more than 3 friendly marbles can be moved
+            if allies > 3:
+                continue
+            token = cells[f]
+            if token == EMPTY:
+                moves[(pos0, pos_of[f])] = 'inline_move'
+            elif token != VOID:
+                # RULE | Sumito : (2vs1) (3vs1) (3vs2)
+                enemies = []
+                while cells[f] == token:
+                    enemies.append(f)
+                    f += offset
+                    read |= 1 << f
+                if len(enemies) < allies and cells[f] in (EMPTY, VOID):
+                    if cells[f] == EMPTY:
+                        move_type = 'inline_push'
+                    elif self.players_damages[token] + 1 == AbaloneGame.LIFES:
+                        move_type = 'winner'
+                    else:
+                        move_type = 'ejected'
+                    # any of the pushed marbles can be targeted
+                    for f_enemy in enemies:
+                        moves[(pos0, pos_of[f_enemy])] = move_type
+
+        # RULE | A 'Side step' move: Marbles are moved sideways into adjacent free spaces.
+        for axis, columns in tables['sidesteps'].items():
+            f_axis = f0 + axis
+            read |= 1 << f_axis
+            if cells[f_axis] != player:
+                continue
+            read |= 1 << (f_axis + axis)
+            three = (cells[f_axis + axis] == player)
+            for k, side in columns:
+                if k == 2 and not three:
+                    continue
+                f1 = f0 + side
+                read |= (1 << f1) | (1 << (f1 + axis))
+                if cells[f1] != EMPTY or cells[f1 + axis] != EMPTY:
+                    continue
+                if k == 2:
+                    read |= 1 << (f1 + 2*axis)
+                    if cells[f1 + 2*axis] != EMPTY:
+                        continue
+                move = (pos0, pos_of[f1 + k*axis])
+                # an inline move prevails
+                if move not in moves:
+                    moves[move] = 'sidestep_move'
+
+        return sorted(moves.items()), read, player
+
+    def _invalidate_moves(self, changed=None):
+        """
+        forget the legal moves that may have changed
+
+        Args:
+            changed (int): mask (bit = flat index) of the cells that changed,
+                           None if anything may have changed
+        """
+        self._legal_moves = {}
+        if changed is None:
+            self._origins = [None] * len(self._origins)
+        else:
+            origins = self._origins
+            for pos0, origin in enumerate(origins):
+                if origin is not None and origin[1] & changed:
+                    origins[pos0] = None
+
+    def _update_legal_moves(self, player):
+        """
+        Returns:
+            dict (pos0, pos1) -> move_type of the player's legal moves,
+            in the order of the moves. Only the origins whose cells changed
+            since the last call are generated again.
+        """
+        flat = AbaloneGame._get_move_tables()['flat']
+        cells = None
+        moves = {}
+        origins = self._origins
+        for pos0, origin in enumerate(origins):
+            if origin is None:
+                if cells is None:
+                    cells = self.board.ravel().tolist()
+                # the other players' origins wait until they are needed
+                if cells[flat[pos0]] != player:
+                    continue
+                origin = origins[pos0] = self._origin_moves(pos0, cells)
+            if origin[2] == player:
+                moves.update(origin[0])
+        return moves
+
+    def legal_moves(self, player):
+        """
+        the player's legal moves, kept up to date move after move : only
+        the moves of the origins whose cells changed are generated again.
+        The dict is shared, don't modify it.
+
+        Returns:
+            dict (pos0, pos1) -> move_type sorted by (pos0, pos1)
+        """
+        moves = self._legal_moves.get(player)
+        if moves is None:
+            if self.profiler is None:
+                moves = self._legal_moves[player] = self._update_legal_moves(player)
+            else:
+                start = self.profiler.clock()
+                moves = self._legal_moves[player] = self._update_legal_moves(player)
+                self.profiler.add_time('move_generation', start)
+        return moves
+
+    def cached_legal_moves(self, player):
+        """
+        the player's legal moves if they are already known for this position
+        (see legal_moves), nothing is generated.
+
+        Returns:
+            dict (pos0, pos1) -> move_type, None if not generated yet
+        """
+        return self._legal_moves.get(player)
+
+    def get_modifications(self, pos0, pos1, move_type):
+        """
+        the modifications of a move known to be legal (see legal_moves) :
+        only the check of its move type is run to build them.
+
+        Returns:
+            list of (old_pos, new_pos, direction_index), see validate_move
+        """
+        r0, c0 = self.get_coords_from_pos(pos0)
+        r1, c1 = self.get_coords_from_pos(pos1)
+        if move_type == 'inline_move':
+            check = self.check_inline_move
+        elif move_type == 'sidestep_move':
+            check = self.check_sidestep_move
+        else:
+            check = self.check_inline_push
+        return check(r0, c0, r1, c1, self.current_player, return_modif=True)[1]
+
     def get_possible_moves(self, player, group_by_type=False):
+        """
+        the player's legal moves (see legal_moves). It yields the same moves
+        as get_possible_moves_bruteforce.
+
+        Returns:
+            list of (pos0, pos1) sorted
+            dict move_type -> list of (pos0, pos1) if group_by_type
+        """
+        moves = self.legal_moves(player)
+        if not group_by_type:
+            return list(moves)
+
+        possibles_moves = {'winner':[], 'ejected':[], 'inline_move':[], 'sidestep_move':[], 'inline_push':[]}
+        for move, move_type in moves.items():
+            possibles_moves[move_type].append(move)
+        return possibles_moves
+
+    def get_possible_moves_bruteforce(self, player, group_by_type=False):
+        """
+        reference implementation of get_possible_moves : it validates every
+        (player's marble, other cell) pair. Slow, kept to check the generator.
+        """
         # retrieve start and end pos candidate
         other_pos, player_pos  = [], []
         for pos, (r, c) in enumerate(self.positions):
@@ -424,7 +717,10 @@ class AbaloneGame:
     # =========================================================================
 
     def next_turn(self):
-        self.current_player = (self.current_player + 1) % self.players
+        next_player = (self.current_player + 1) % self.players
+        sides = AbaloneGame.ZOBRIST.sides
+        self.hash ^= sides[self.current_player] ^ sides[next_player]
+        self.current_player = next_player
         self.turns_count += 1
     
     def swap_coords(self, r0, c0, r1, c1):
@@ -433,8 +729,11 @@ class AbaloneGame:
     def eject(self, r, c):
         #print('EJECT')
         damaged_player = self.board[r, c]
-        self.players_damages[damaged_player] += 1
         self.board[r, c] = AbaloneGame.TOKEN_EMPTY
+        self.damage(damaged_player)
+
+    def damage(self, damaged_player):
+        self.players_damages[damaged_player] += 1
         # check if the game is over
         self.game_over = (self.players_damages[damaged_player] == AbaloneGame.LIFES)
         if self.game_over:
@@ -444,16 +743,154 @@ class AbaloneGame:
         if not modifications:
             return
         
+        zobrist = AbaloneGame.ZOBRIST
+        flat = AbaloneGame._get_move_tables()['flat']
+        changed = 0
         for old_pos, new_pos, direction_index in modifications:
             r_old, c_old = self.get_coords_from_pos(old_pos)
+            player = self.get_token_from_pos(old_pos)
             if direction_index == -1: # -1 means that the marble need to be ejected
+                damages = self.players_damages[player]
+                self.hash ^= zobrist.marbles[player][old_pos] \
+                           ^ zobrist.damages[player][damages] ^ zobrist.damages[player][damages + 1]
                 self.eject(r_old, c_old)
+                # the damages change the type of every ejecting move
+                changed = None
             else: # otherwise just it's just a swap
+                # the marble always moves to an empty pos
+                self.hash ^= zobrist.marbles[player][old_pos] ^ zobrist.marbles[player][new_pos]
                 r_new, c_new = self.get_coords_from_pos(new_pos)
                 self.swap_coords(r_old, c_old, r_new, c_new)
+                if changed is not None:
+                    changed |= (1 << flat[old_pos]) | (1 << flat[new_pos])
+        self._invalidate_moves(changed)
 
         self.next_turn()
 
+    def restore(self, r, c, player):
+        """ put back an ejected marble, the reverse of eject """
+        self.board[r, c] = player
+        self.players_damages[player] -= 1
+
+    # =========================================================================
+    #                              MAKE / UNMAKE
+    # =========================================================================
+
+    def make_move(self, pos0, pos1):
+        """
+        play the move (pos0, pos1) of the current player and record what is
+        needed to take it back with unmake_move.
+
+        Returns:
+            tuple (move_type, modifications) if the move is valid
+            None otherwise
+        """
+        if self.game_over:
+            return
+
+        move_check = self.validate_move(pos0, pos1, self.current_player, return_modif=True)
+        if move_check:
+            move_type, modifications = move_check
+            # the owner of an ejected marble is needed to put it back
+            damaged_player = None
+            if modifications[0][2] == -1:
+                damaged_player = self.get_token_from_pos(modifications[0][0])
+            self.undo_stack.append((modifications, damaged_player, self.current_player, self.turns_count))
+            self.apply_modifications(modifications)
+            return move_type, modifications
+
+    def unmake_move(self):
+        """
+        take back the last move played with make_move : the modifications
+        are undone in reverse order (a swap is its own reverse).
+
+        Returns:
+            list: the modifications that have been undone
+        """
+        modifications, damaged_player, player, turns_count = self.undo_stack.pop()
+
+        zobrist = AbaloneGame.ZOBRIST
+        flat = AbaloneGame._get_move_tables()['flat']
+        changed = 0
+        for old_pos, new_pos, direction_index in reversed(modifications):
+            r_old, c_old = self.get_coords_from_pos(old_pos)
+            if direction_index == -1:
+                damages = self.players_damages[damaged_player]
+                self.hash ^= zobrist.marbles[damaged_player][old_pos] \
+                           ^ zobrist.damages[damaged_player][damages] ^ zobrist.damages[damaged_player][damages - 1]
+                self.restore(r_old, c_old, damaged_player)
+                changed = None
+            else:
+                moved_player = self.get_token_from_pos(new_pos)
+                self.hash ^= zobrist.marbles[moved_player][old_pos] ^ zobrist.marbles[moved_player][new_pos]
+                r_new, c_new = self.get_coords_from_pos(new_pos)
+                self.swap_coords(r_old, c_old, r_new, c_new)
+                if changed is not None:
+                    changed |= (1 << flat[old_pos]) | (1 << flat[new_pos])
+        self._invalidate_moves(changed)
+
+        if self.game_over:
+            self.players_victories[player] -= 1
+            self.game_over = False
+        self.hash ^= zobrist.sides[self.current_player] ^ zobrist.sides[player]
+        self.current_player = player
+        self.turns_count = turns_count
+        return modifications
+
+    # =========================================================================
+    #                                STATE
+    # =========================================================================
+
+    def get_state(self):
+        """
+        Returns:
+            GameState: the compact state of the game (no undo stack)
+        """
+        return GameState.from_board(self.variant_index, self.current_player, self.turns_count,
+                                    self.game_over, self.players_damages, self.board)
+
+    def set_state(self, state):
+        """
+        restore a state given by get_state, the variant being taken from the
+        VariantStore already in memory. The undo stack is emptied.
+        """
+        self.variant_index = state.variant
+        self.variant = AbaloneGame._get_variant_store().variants[state.variant]
+        self.players = self.variant["players"]
+        self.players_sets = self.variant["players_sets"]
+        self.positions = geometry.POSITIONS
+        self.board = state.to_board()
+        self.players_damages = list(state.damages)
+        self.current_player = state.current_player
+        self.turns_count = state.turns_count
+        self.game_over = state.game_over
+        self.undo_stack = []
+        if self.players_victories is None:
+            self.players_victories = [0] * self.players
+        self.refresh_state()
+
+    @classmethod
+    def from_state(cls, state):
+        game = cls()
+        game.set_state(state)
+        return game
+
+    def clone(self):
+        """
+        a copy of the game, much cheaper than copy.deepcopy : the containers
+        are copied one level deep, what they hold being immutable or never
+        modified (the variant, the undo records, the cached legal moves).
+
+        Returns:
+            AbaloneGame: the copy, of the same class
+        """
+        game = object.__new__(type(self))
+        for name, value in self.__dict__.items():
+            if isinstance(value, (np.ndarray, list, dict)):
+                value = value.copy()
+            game.__dict__[name] = value
+        return game
+
     # =========================================================================
     #                            ACTION HANDLER
     # =========================================================================
@@ -0,0 +1,240 @@
+import math
+import time
+import random
+import multiprocessing as mp
+
+from .gamelogic import AbaloneGame
+
+
+class Node:
+    """ a node of the search tree, reached by playing move """
+
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, move=None, parent=None, player=None):
+        self.move = move
+        self.parent = parent
+        # the player who played the move, None for the root
+        self.player = player
+        self.children = []
+        # legal moves not expanded yet, None until the node is reached
+        self.untried = None
+        self.visits = 0
+        # sum of the playouts' scores of player
+        self.value = 0.0
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search (UCT) with random playouts.
+
+    Like AlphaBetaSearch the tree is walked in place with make_move /
+    unmake_move : a playout plays random moves until the game is over or
+    playout_depth moves have been played, then takes them all back.
+    """
+
+    def __init__(self, exploration=1.4, playout_depth=60, seed=None):
+        """
+        Args:
+            exploration   (float) : the UCT exploration constant
+            playout_depth (int)   : the max number of moves of a playout
+            seed          (int)   : seed of the random playouts
+        """
+        self.exploration = exploration
+        self.playout_depth = playout_depth
+        self.rng = random.Random(seed)
+        self.root = None
+        # statistics of the last search
+        self.infos = {}
+
+    def score(self, game):
+        """
+        score of the position for each player : 1 for the winner and 0 for
+        the others, otherwise between 0.25 and 0.75 given the damages.
+        """
+        if game.game_over:
+            return [float(damages < AbaloneGame.LIFES) for damages in game.players_damages]
+        scores = []
+        for player, damages in enumerate(game.players_damages):
+            enemies_damages = max(d for p, d in enumerate(game.players_damages) if p != player)
+            scores.append(0.5 + 0.25 * (enemies_damages - damages) / AbaloneGame.LIFES)
+        return scores
+
+    def playout(self, game):
+        """
+        Returns:
+            list: the score of each player at the end of a random playout
+        """
+        played = 0
+        while not game.game_over and played < self.playout_depth:
+            moves = game.get_possible_moves(game.current_player)
+            if not moves:
+                break
+            game.make_move(*self.rng.choice(moves))
+            played += 1
+        scores = self.score(game)
+        for _ in range(played):
+            game.unmake_move()
+        return scores
+
+    def select(self, node):
+        """ the child with the best upper confidence bound """
+        log_visits = math.log(node.visits)
+        return max(node.children, key=lambda child:
+            child.value / child.visits + self.exploration * math.sqrt(log_visits / child.visits))
+
+    def iterate(self, game):
+        """ one selection, expansion, playout and backpropagation """
+        node, played = self.root, 0
+
+        # selection
+        while True:
+            if node.untried is None:
+                node.untried = [] if game.game_over else game.get_possible_moves(game.current_player)
+            if node.untried or not node.children:
+                break
+            node = self.select(node)
+            game.make_move(*node.move)
+            played += 1
+
+        # expansion
+        if node.untried:
+            move = node.untried.pop(self.rng.randrange(len(node.untried)))
+            child = Node(move, node, game.current_player)
+            node.children.append(child)
+            game.make_move(*move)
+            played += 1
+            node = child
+
+        scores = self.playout(game)
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.player is not None:
+                node.value += scores[node.player]
+            node = node.parent
+
+        for _ in range(played):
+            game.unmake_move()
+
+    def search(self, game, n_playouts=1000, time_limit=None):
+        """
+        grow a new tree from the game's position, the game is left as it
+        was found.
+
+        Args:
+            n_playouts (int)   : the number of playouts (None for no limit)
+            time_limit (float) : the time budget in seconds (None for no limit)
+
+        Returns:
+            dict: (pos0, pos1) -> (visits, value) of the root's children
+        """
+        assert n_playouts or time_limit, "the search needs a budget"
+        self.root = Node()
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit else None
+
+        playouts = 0
+        while not game.game_over:
+            if n_playouts is not None and playouts >= n_playouts:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self.iterate(game)
+            playouts += 1
+
+        elapsed = time.perf_counter() - start
+        self.infos = {
+            'playouts'             : playouts,
+            'time'                 : elapsed,
+            'playouts_per_second'  : playouts / elapsed if elapsed > 0 else 0.0,
+        }
+        return {child.move: (child.visits, child.value) for child in self.root.children}
+
+    @staticmethod
+    def best_move(statistics):
+        """ the most visited move """
+        if statistics:
+            return max(statistics, key=lambda move: statistics[move][0])
+
+
+def _root_search(args):
+    """ grow an independent tree in a worker, see ParallelMCTS """
+    game, seed, n_playouts, time_limit, exploration, playout_depth = args
+    mcts = MCTS(exploration=exploration, playout_depth=playout_depth, seed=seed)
+    statistics = mcts.search(game, n_playouts=n_playouts, time_limit=time_limit)
+    return statistics, mcts.infos
+
+
+class ParallelMCTS:
+    """
+    MCTS with root parallelism : each worker process grows its own tree
+    from the same position with its own random playouts, then the visits
+    and values of the root's children are summed and the most visited
+    move is played. The trees are never shared so the playouts per
+    second grow with the number of workers, up to the number of cores.
+
+    infos reports the throughput of each worker and of the whole search.
+    """
+
+    def __init__(self, n_workers=None, n_playouts=1000, time_limit=None,
+                 exploration=1.4, playout_depth=60, seed=None, start_method=None):
+        """
+        Args:
+            n_workers  (int)   : the number of processes (default: cpu count)
+            n_playouts (int)   : the number of playouts of each worker (None for no limit)
+            time_limit (float) : the time budget of each worker in seconds (None for no limit)
+        """
+        self.n_workers = n_workers or mp.cpu_count()
+        self.n_playouts = n_playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.playout_depth = playout_depth
+        self.rng = random.Random(seed)
+        self.start_method = start_method
+
+        self.pool = None
+        self.statistics = {}
+        self.infos = {}
+
+    def search(self, game):
+        """
+        Returns:
+            tuple (pos0, pos1): the most visited move, None if the game is over
+        """
+        if game.game_over:
+            return
+
+        tasks = [(game, self.rng.getrandbits(32), self.n_playouts, self.time_limit,
+                  self.exploration, self.playout_depth) for _ in range(self.n_workers)]
+
+        start = time.perf_counter()
+        if self.n_workers == 1:
+            results = [_root_search(tasks[0])]
+        else:
+            if self.pool is None:
+                self.pool = mp.get_context(self.start_method).Pool(self.n_workers)
+            results = self.pool.map(_root_search, tasks)
+        elapsed = time.perf_counter() - start
+
+        self.statistics = {}
+        for statistics, _ in results:
+            for move, (visits, value) in statistics.items():
+                total_visits, total_value = self.statistics.get(move, (0, 0.0))
+                self.statistics[move] = (total_visits + visits, total_value + value)
+
+        playouts = sum(infos['playouts'] for _, infos in results)
+        self.infos = {
+            'workers'             : [infos for _, infos in results],
+            'playouts'            : playouts,
+            'time'                : elapsed,
+            'playouts_per_second' : playouts / elapsed if elapsed > 0 else 0.0,
+        }
+        return MCTS.best_move(self.statistics)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
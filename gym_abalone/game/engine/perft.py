@@ -0,0 +1,130 @@
+"""
+perft : count the leaf nodes of the move tree to a given depth.
+
+The counts of a new or optimized move generator must match those of the
+reference one (see get_possible_moves_bruteforce and REFERENCE_COUNTS),
+and since a perft run is nothing but move generation and make / unmake,
+its nodes per second measure the engine's raw speed.
+
+Usage:
+    $ python -m gym_abalone.game.engine.perft --variant classical --depth 3
+    $ python -m gym_abalone.game.engine.perft --variant belgian-daisy --depth 3 --divide
+    $ python -m gym_abalone.game.engine.perft --board board.npy --player 1 --depth 2
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from .gamelogic import AbaloneGame
+from .bitboard import AbaloneBitboardGame
+
+# variant -> leaf nodes at depth 1, 2, ... from the start, white (0) to move
+REFERENCE_COUNTS = {
+    'classical'     : [44, 1936, 98912, 5045326],
+    'belgian-daisy' : [52, 2698, 150224, 8358530],
+    'german-daisy'  : [80, 6250, 494838],
+    'dutch-daisy'   : [44, 1946, 87604],
+    'swiss-daisy'   : [64, 4066, 254574],
+    'domination'    : [80, 5478, 410560],
+    'the-wall'      : [102, 9630, 884008],
+}
+
+BACKENDS = {
+    'numpy'    : AbaloneGame,
+    'bitboard' : AbaloneBitboardGame,
+}
+
+
+def legal_moves(game, bruteforce=False):
+    """ the legal moves of the player to move """
+    if bruteforce:
+        return game.get_possible_moves_bruteforce(game.current_player)
+    return game.get_possible_moves(game.current_player)
+
+
+def perft(game, depth, bruteforce=False):
+    """
+    count the positions reached after depth moves (a game won before
+    ends its branch). The game is walked with make_move / unmake_move and
+    left as it was found.
+
+    Args:
+        game       (AbaloneGame) : the root position
+        depth      (int)         : the number of moves
+        bruteforce (bool)        : use the reference move generator
+
+    Returns:
+        int: the number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+    if game.game_over:
+        return 0
+    moves = legal_moves(game, bruteforce)
+    # bulk counting : the leaves are the legal moves
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        game.make_move(*move)
+        nodes += perft(game, depth - 1, bruteforce)
+        game.unmake_move()
+    return nodes
+
+
+def divide(game, depth, bruteforce=False):
+    """
+    perft split by root move, to find the move where two generators differ
+
+    Returns:
+        dict: (pos0, pos1) -> leaf nodes below the move
+    """
+    counts = {}
+    for move in legal_moves(game, bruteforce):
+        game.make_move(*move)
+        counts[move] = perft(game, depth - 1, bruteforce)
+        game.unmake_move()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--variant', default='classical', help='start from this variant')
+    parser.add_argument('--board', help='start from this .npy 11x11 board instead')
+    parser.add_argument('--player', type=int, default=0, help='the player to move')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--divide', action='store_true', help='print the count below each root move')
+    parser.add_argument('--backend', default='numpy', choices=sorted(BACKENDS))
+    parser.add_argument('--bruteforce', action='store_true', help='use the reference move generator')
+    args = parser.parse_args(argv)
+
+    game = BACKENDS[args.backend]()
+    game.reset(player=args.player, random_player=False, variant_name=args.variant)
+    if args.board:
+        game.board = np.load(args.board).astype(np.int8)
+        game.refresh_state()
+
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(game, args.depth, args.bruteforce)
+        for (pos0, pos1), count in counts.items():
+            print(f'{pos0:2d}-{pos1:2d} : {count}')
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(game, args.depth, args.bruteforce)
+    elapsed = time.perf_counter() - start
+
+    print(f'perft({args.depth}) = {nodes}  ({elapsed:.2f} s, {nodes / elapsed:.0f} nodes/s)')
+
+    reference = REFERENCE_COUNTS.get(args.variant) if not args.board and args.player == 0 else None
+    if reference and args.depth <= len(reference):
+        expected = reference[args.depth - 1]
+        print(f'reference  = {expected}  {"ok" if nodes == expected else "MISMATCH"}')
+        return 0 if nodes == expected else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+random playouts that move on : the pushes are played first, so that the
+games end. Used to build test positions and benchmark workloads.
+
+Examples:
+    >>> rng = random.Random(0)
+    >>> for position in play_random(game, 40, rng):
+    ...     position.get_possible_moves(position.current_player)
+"""
+
+# the order in which random games pick their moves, see push_first_move
+MOVE_TYPES = ['winner', 'ejected', 'inline_push', 'sidestep_move', 'inline_move']
+
+
+def push_first_move(game, rng):
+    """
+    a random move of the current player, pushes first so that the games
+    move on and end.
+
+    Args:
+        game (AbaloneGame)   : any backend
+        rng  (random.Random) : picks the move
+
+    Returns:
+        tuple: (pos0, pos1) or None if the player can't move
+    """
+    moves = game.get_possible_moves(game.current_player, group_by_type=True)
+    for move_type in MOVE_TYPES:
+        if moves[move_type]:
+            return rng.choice(moves[move_type])
+    return None
+
+
+def play_random(game, turns, rng, play=None):
+    """
+    play up to turns moves of push_first_move and yield the game before
+    each of them, until the game is over.
+
+    Args:
+        play (callable) : play(pos0, pos1) plays a move
+                          (default: game.action_handler)
+    """
+    play = play or game.action_handler
+    for _ in range(turns):
+        if game.game_over:
+            return
+        move = push_first_move(game, rng)
+        if move is None:
+            return
+        yield game
+        play(*move)
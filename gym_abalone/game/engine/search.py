@@ -0,0 +1,211 @@
+import time
+
+from ..common import geometry
+from .gamelogic import AbaloneGame
+from .transposition import TranspositionTable
+
+
+class SearchTimeout(Exception):
+    """ raised inside the search when the time or node budget is spent """
+
+
+class AlphaBetaSearch:
+    """
+    iterative deepening negamax search with alpha-beta pruning.
+
+    The tree is walked in place with make_move / unmake_move, so the game
+    given to search is left as it was found. The moves are tried in the
+    order : best move of the transposition table, winner, ejected,
+    inline_push, then the moves that don't involve the opponent.
+
+    The search stops as soon as its time (seconds) or node budget is
+    spent and returns the best move of the last completed depth.
+    """
+
+    # move types tried first
+    MOVE_ORDER = ['winner', 'ejected', 'inline_push', 'sidestep_move', 'inline_move']
+
+    # values of the evaluation
+    WIN    = 1_000_000
+    MARBLE = 1000
+
+    def __init__(self, max_depth=4, time_limit=1.0, max_nodes=None, table=None):
+        """
+        Args:
+            max_depth  (int)   : the deepest iteration
+            time_limit (float) : the time budget of a search in seconds (None for no limit)
+            max_nodes  (int)   : the node budget of a search (None for no limit)
+            table (TranspositionTable) : a table that can be shared between searches
+        """
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.table = table if table is not None else TranspositionTable(2**18)
+
+        self.game = None
+        self.nodes = 0
+        self.deadline = None
+        # statistics of the last search
+        self.infos = {}
+
+        # 4 - distance to the center, for each pos
+        center_r, center_c = AbaloneGame.BOARD_SIZE // 2, AbaloneGame.BOARD_SIZE // 2
+        self.centrality = [4 - max(abs(r-center_r), abs(c-center_c), abs(r-center_r + c-center_c))
+                           for r, c in geometry.POSITIONS]
+
+    # =========================================================================
+    #                              EVALUATION
+    # =========================================================================
+
+    def evaluate(self, game):
+        """
+        score of the position for the player to move : ejected marbles
+        first, then the marbles closer to the center.
+        """
+        player = game.current_player
+        score = 0
+        for enemy, damages in enumerate(game.players_damages):
+            if enemy != player:
+                score += AlphaBetaSearch.MARBLE * (damages - game.players_damages[player])
+
+        cells = game.board.ravel().tolist()
+        for f, centrality in zip(AbaloneGame._get_move_tables()['flat'], self.centrality):
+            token = cells[f]
+            if token == player:
+                score += centrality
+            elif token >= 0:
+                score -= centrality
+        return score
+
+    def ordered_moves(self, game, first_move=-1):
+        moves = game.get_possible_moves(game.current_player, group_by_type=True)
+        ordered = [move for move_type in AlphaBetaSearch.MOVE_ORDER for move in moves[move_type]]
+        if first_move >= 0:
+            first_move = divmod(first_move, 61)
+            if first_move in ordered:
+                ordered.remove(first_move)
+                ordered.insert(0, first_move)
+        return ordered
+
+    # =========================================================================
+    #                                SEARCH
+    # =========================================================================
+
+    def search(self, game):
+        """
+        find the best move of the player to move
+
+        Returns:
+            tuple (pos0, pos1) or None if there is no legal move or the game is over
+        """
+        if game.game_over:
+            return
+
+        self.game = game
+        self.nodes = 0
+        start = time.perf_counter()
+        self.deadline = start + self.time_limit if self.time_limit else None
+        self.table.new_search()
+
+        best_move, best_value, depth_reached = None, None, 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                move, value = self._search_root(depth, best_move)
+            except SearchTimeout:
+                break
+            if move is None:
+                break
+            best_move, best_value, depth_reached = move, value, depth
+            # a forced win or loss won't change with more depth
+            if abs(value) >= AlphaBetaSearch.WIN - self.max_depth:
+                break
+
+        # not even depth 1 could be searched
+        if best_move is None:
+            moves = self.ordered_moves(game)
+            best_move = moves[0] if moves else None
+
+        self.infos = {
+            'depth' : depth_reached,
+            'nodes' : self.nodes,
+            'value' : best_value,
+            'time'  : time.perf_counter() - start,
+        }
+        return best_move
+
+    def _check_budget(self):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchTimeout
+        # reading the clock is not free
+        if self.deadline is not None and self.nodes % 64 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+    def _search_root(self, depth, previous_best):
+        game = self.game
+        first_move = -1 if previous_best is None else previous_best[0] * 61 + previous_best[1]
+        alpha, beta = -AlphaBetaSearch.WIN - 1, AlphaBetaSearch.WIN + 1
+        best_move = None
+        for pos0, pos1 in self.ordered_moves(game, first_move):
+            game.make_move(pos0, pos1)
+            try:
+                value = -self._negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                game.unmake_move()
+            if value > alpha:
+                alpha, best_move = value, (pos0, pos1)
+        if best_move is not None:
+            self.table.store(game.hash, depth, alpha, TranspositionTable.EXACT, best_move[0] * 61 + best_move[1])
+        return best_move, alpha
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self._check_budget()
+        game = self.game
+
+        # the previous player has just won
+        if game.game_over:
+            return -AlphaBetaSearch.WIN + ply
+        if depth == 0:
+            return self.evaluate(game)
+
+        alpha_start = alpha
+        first_move = -1
+        entry = self.table.probe(game.hash)
+        if entry is not None:
+            entry_depth, value, flag, first_move = entry
+            if entry_depth >= depth:
+                if flag == TranspositionTable.EXACT:
+                    return value
+                elif flag == TranspositionTable.LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        moves = self.ordered_moves(game, first_move)
+        if not moves:
+            return self.evaluate(game)
+
+        best_value, best_move = -AlphaBetaSearch.WIN - 1, -1
+        for pos0, pos1 in moves:
+            game.make_move(pos0, pos1)
+            try:
+                value = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.unmake_move()
+            if value > best_value:
+                best_value, best_move = value, pos0 * 61 + pos1
+            alpha = max(alpha, value)
+            # beta cut-off
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_start:
+            flag = TranspositionTable.UPPER
+        elif best_value >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self.table.store(game.hash, depth, best_value, flag, best_move)
+        return best_value
@@ -0,0 +1,80 @@
+import struct
+
+import numpy as np
+
+from gym_abalone.game.common import geometry
+
+# variant index, current player, turns count, game over, number of players
+STATE_HEADER = struct.Struct('<HBI?B')
+
+
+class GameState:
+    """
+    the state of an AbaloneGame in a few fixed-size fields : the tokens of
+    the 61 positions as bytes, the damages, the player to move, the turn
+    and the variant as its index in the VariantStore, so restoring a state
+    never reads the variants again. See AbaloneGame.get_state / set_state.
+
+    A state takes 9 + players + 61 bytes once serialized with to_bytes,
+    and pickles as these bytes.
+    """
+
+    __slots__ = ('variant', 'current_player', 'turns_count', 'game_over', 'damages', 'cells')
+
+    def __init__(self, variant, current_player, turns_count, game_over, damages, cells):
+        """
+        Args:
+            variant        (int)   : index of the variant in the VariantStore
+            damages        (tuple) : the lost marbles of each player
+            cells          (bytes) : the int8 token of each position
+        """
+        self.variant = variant
+        self.current_player = current_player
+        self.turns_count = turns_count
+        self.game_over = game_over
+        self.damages = damages
+        self.cells = cells
+
+    @classmethod
+    def from_board(cls, variant, current_player, turns_count, game_over, damages, board):
+        cells = np.asarray(board, dtype=np.int8).ravel()[geometry.FLAT].tobytes()
+        return cls(variant, current_player, turns_count, game_over, tuple(damages), cells)
+
+    def to_board(self):
+        """
+        Returns:
+            numpy.ndarray: a new (11, 11) int8 board
+        """
+        # the cells off the board are TOKEN_VOID
+        board = np.full(geometry.BOARD_SIZE**2, -2, dtype=np.int8)
+        board[geometry.FLAT] = np.frombuffer(self.cells, dtype=np.int8)
+        return board.reshape(geometry.BOARD_SIZE, geometry.BOARD_SIZE)
+
+    def clone(self):
+        # every field is immutable
+        return GameState(self.variant, self.current_player, self.turns_count, self.game_over, self.damages, self.cells)
+
+    def to_bytes(self):
+        return STATE_HEADER.pack(self.variant, self.current_player, self.turns_count, self.game_over,
+                                 len(self.damages)) + bytes(self.damages) + self.cells
+
+    @classmethod
+    def from_bytes(cls, data):
+        variant, current_player, turns_count, game_over, players = STATE_HEADER.unpack_from(data)
+        start = STATE_HEADER.size
+        damages = tuple(data[start:start + players])
+        cells = bytes(data[start + players:start + players + geometry.N_POSITIONS])
+        return cls(variant, current_player, turns_count, game_over, damages, cells)
+
+    def __reduce__(self):
+        return GameState.from_bytes, (self.to_bytes(),)
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.to_bytes() == other.to_bytes()
+
+    def __hash__(self):
+        return hash(self.to_bytes())
+
+    def __repr__(self):
+        return (f'GameState(variant={self.variant}, current_player={self.current_player}, '
+                f'turns_count={self.turns_count}, game_over={self.game_over}, damages={self.damages})')
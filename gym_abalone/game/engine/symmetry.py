@@ -0,0 +1,179 @@
+r"""
+the 12 symmetries of the hexagonal board (6 rotations x 2 reflections),
+as permutation tables over the 61 positions, the 11x11 cells and the
+actions, applied to batches with fancy indexing.
+
+In the axial coordinates (q, r) = (c - 5, r - 5) of a position, the
+rotation by 60 degrees maps (q, r) to (-r, q + r), so the direction d
+becomes d + 1 (RIGHT -> DOWN_RIGHT), and the reflection swaps q and r.
+The symmetry s (0 <= < 12) reflects if s >= 6, then rotates s % 6 times.
+
+A symmetry of the board is a symmetry of the rules : the legal moves of
+a transformed board are the transformed legal moves.
+
+Examples:
+    >>> boards = transform_boards(game.board[None], 3)     # half turn
+    >>> canonical, symmetries = canonicalize(boards)
+    >>> transform_actions(actions, symmetries)             # follow the boards
+"""
+import numpy as np
+
+from gym_abalone.game.common import geometry
+from . import actionspace
+
+N_SYMMETRIES = 12
+
+# see _get_tables
+_TABLES = None
+
+
+def _rotate(q, r):
+    return -r, q + r
+
+
+def _get_tables():
+    """
+    Returns:
+        dict with, for each symmetry s
+            'pos'     : (12, 61) pos -> image pos
+            'cells'   : (12, 121) flat index of the image cell -> flat index of
+                        its antecedent (a gather table, VOID cells being fixed)
+            'actions' : (12, 3721) action pos0 * 61 + pos1 -> image action
+            'slots'   : (12, n_slots) slot -> image slot, see actionspace
+            'inverse' : (12,) the symmetry undoing s
+    """
+    global _TABLES
+    if _TABLES is None:
+        n = geometry.N_POSITIONS
+        center = geometry.BOARD_SIZE // 2
+
+        pos = np.zeros((N_SYMMETRIES, n), dtype=np.int64)
+        for s in range(N_SYMMETRIES):
+            for p, (r, c) in enumerate(geometry.POSITIONS):
+                q, r = c - center, r - center
+                if s >= 6:
+                    q, r = r, q
+                for _ in range(s % 6):
+                    q, r = _rotate(q, r)
+                pos[s, p] = geometry.POS_OF_COORDS[r + center, q + center]
+
+        flat = np.array(geometry.FLAT)
+        cells = np.tile(np.arange(geometry.BOARD_SIZE**2), (N_SYMMETRIES, 1))
+        for s in range(N_SYMMETRIES):
+            cells[s, flat[pos[s]]] = flat
+
+        pairs = np.arange(n * n)
+        actions = pos[:, pairs // n] * n + pos[:, pairs % n]
+
+        compact = actionspace._get_tables()
+        slots = compact['slots'][actions[:, compact['pairs'][:, 0] * n + compact['pairs'][:, 1]]].astype(np.int64)
+
+        identity = np.arange(n)
+        inverse = np.array([next(t for t in range(N_SYMMETRIES) if (pos[t][pos[s]] == identity).all())
+                            for s in range(N_SYMMETRIES)])
+
+        _TABLES = {'pos': pos, 'cells': cells, 'actions': actions, 'slots': slots, 'inverse': inverse}
+    return _TABLES
+
+
+def _rows(table, symmetries, n):
+    """ the row of a table for a symmetry, or (n, ...) one per item of a batch """
+    symmetries = np.asarray(symmetries)
+    assert symmetries.ndim == 0 or len(symmetries) == n, f"expected {n} symmetries, got {len(symmetries)}"
+    return table[symmetries]
+
+
+def transform_boards(boards, symmetries):
+    """
+    Args:
+        boards     (numpy.ndarray) : (N, 11, 11) boards
+        symmetries (int or array)  : a symmetry for all or (N,) one per board
+
+    Returns:
+        numpy.ndarray: (N, 11, 11) the transformed boards
+    """
+    boards = np.asarray(boards)
+    n_boards = boards.shape[0]
+    cells = _rows(_get_tables()['cells'], symmetries, n_boards)
+    flat = boards.reshape(n_boards, -1)
+    if cells.ndim == 1:
+        return flat[:, cells].reshape(boards.shape)
+    return np.take_along_axis(flat, cells, axis=1).reshape(boards.shape)
+
+
+def transform_positions(positions, symmetries):
+    """ the image of positions (pos) under the symmetries, same broadcasting as transform_actions """
+    return _apply(_get_tables()['pos'], positions, symmetries)
+
+
+def transform_actions(actions, symmetries, compact=False):
+    """
+    Args:
+        actions    (numpy.ndarray) : (N,) action indices pos0 * 61 + pos1
+                                     (slots if compact, see actionspace)
+        symmetries (int or array)  : a symmetry for all or (N,) one per action
+
+    Returns:
+        numpy.ndarray: (N,) the transformed actions
+    """
+    return _apply(_get_tables()['slots' if compact else 'actions'], actions, symmetries)
+
+
+def _apply(table, indices, symmetries):
+    indices = np.asarray(indices)
+    symmetries = np.asarray(symmetries)
+    if symmetries.ndim == 0:
+        return table[symmetries][indices]
+    return table[symmetries, indices]
+
+
+def transform_masks(masks, symmetries, compact=False):
+    """
+    Args:
+        masks      (numpy.ndarray) : (N, 3721) masks over the actions
+                                     ((N, n_slots) if compact)
+        symmetries (int or array)  : a symmetry for all or (N,) one per mask
+
+    Returns:
+        numpy.ndarray: the masks of the transformed boards
+    """
+    tables = _get_tables()
+    masks = np.asarray(masks)
+    # the transformed mask of an action is the mask of its antecedent
+    inverse = tables['inverse'][np.asarray(symmetries)]
+    gather = _rows(tables['slots' if compact else 'actions'], inverse, masks.shape[0])
+    if gather.ndim == 1:
+        return masks[:, gather]
+    return np.take_along_axis(masks, gather, axis=1)
+
+
+def canonicalize(boards):
+    """
+    a representative of the symmetry class of each board : its image with
+    the lexicographically smallest 61 cells.
+
+    Args:
+        boards (numpy.ndarray) : (N, 11, 11) boards of up to 3 players
+
+    Returns:
+        tuple (canonical, symmetries)
+            canonical  : (N, 11, 11) the representative boards
+            symmetries : (N,) the symmetry mapping each board to it
+    """
+    tables = _get_tables()
+    boards = np.asarray(boards)
+    n_boards = boards.shape[0]
+    flat = boards.reshape(n_boards, -1)
+    positions = np.array(geometry.FLAT)
+
+    # (N, 12, 61) cells of the 12 images, EMPTY -> 0, players -> 1, 2, 3
+    images = (flat[:, tables['cells'][:, positions]].astype(np.int64) + 1).astype(np.uint64)
+    # 2 bits a cell : the images are compared on two 64 bits words
+    weights = np.uint64(1) << (np.uint64(2) * np.arange(31, -1, -1, dtype=np.uint64))
+    high = (images[:, :, :32] * weights).sum(axis=2, dtype=np.uint64)
+    low = (images[:, :, 32:] * weights[:29]).sum(axis=2, dtype=np.uint64)
+
+    smallest = high.min(axis=1, keepdims=True)
+    low = np.where(high == smallest, low, np.iinfo(np.uint64).max)
+    symmetries = low.argmin(axis=1)
+    return transform_boards(boards, symmetries), symmetries
@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class TranspositionTable:
+    """
+    fixed-size table of search results indexed by a position hash.
+
+    The table has 2**k slots allocated once, a hash goes to the slot
+    given by its lowest bits, so it never grows whatever the number of
+    positions stored. When two positions fall into the same slot the
+    replacement policy decides which one is kept :
+        'depth'  : keep the deepest search, unless the entry comes from
+                   a previous search (see new_search)
+        'always' : keep the last one
+
+    A probe only returns an entry whose full hash matches.
+    """
+
+    # kind of value stored
+    EXACT = 0
+    LOWER = 1 # the value is a lower bound (beta cut-off)
+    UPPER = 2 # the value is an upper bound (no move raised alpha)
+
+    POLICIES = ('depth', 'always')
+
+    def __init__(self, size=2**20, policy='depth'):
+        """
+        Args:
+            size   (int) : the number of slots, rounded up to a power of 2
+            policy (str) : the replacement policy, 'depth' or 'always'
+        """
+        assert policy in TranspositionTable.POLICIES, f"unknown policy {policy}"
+        self.size = 1 << max(0, int(size) - 1).bit_length()
+        self.policy = policy
+
+        self.keys        = np.zeros(self.size, dtype=np.uint64)
+        self.depths      = np.full (self.size, -1, dtype=np.int16)
+        self.values      = np.zeros(self.size, dtype=np.float32)
+        self.flags       = np.zeros(self.size, dtype=np.int8)
+        self.moves       = np.full (self.size, -1, dtype=np.int16)
+        self.generations = np.zeros(self.size, dtype=np.uint8)
+
+        self.generation = 0
+        self.hits = self.misses = self.stores = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.depths >= 0))
+
+    def clear(self):
+        self.depths[:] = -1
+        self.moves[:] = -1
+        self.generation = 0
+        self.hits = self.misses = self.stores = 0
+
+    def new_search(self):
+        """ age the stored entries, so that the next search can replace them """
+        self.generation = (self.generation + 1) % 256
+
+    def probe(self, key):
+        """
+        Returns:
+            tuple (depth, value, flag, move) with move = pos0 * 61 + pos1 or -1
+            None if the position is not stored
+        """
+        i = key & (self.size - 1)
+        if self.depths[i] >= 0 and int(self.keys[i]) == key:
+            self.hits += 1
+            return int(self.depths[i]), float(self.values[i]), int(self.flags[i]), int(self.moves[i])
+        self.misses += 1
+
+    def store(self, key, depth, value, flag, move=-1):
+        """
+        store a search result, following the replacement policy
+
+        Returns:
+            bool: True if the entry has been written
+        """
+        i = key & (self.size - 1)
+        if self.policy == 'depth' and self.depths[i] >= 0 \
+           and self.generations[i] == self.generation and depth < self.depths[i] \
+           and int(self.keys[i]) != key:
+            return False
+
+        # keep the best move of a shallower search of the same position
+        if move == -1 and int(self.keys[i]) == key:
+            move = int(self.moves[i])
+
+        self.keys[i] = key
+        self.depths[i] = depth
+        self.values[i] = value
+        self.flags[i] = flag
+        self.moves[i] = move
+        self.generations[i] = self.generation
+        self.stores += 1
+        return True
+
+    @property
+    def stats(self):
+        return {
+            'size'   : self.size,
+            'used'   : len(self),
+            'hits'   : self.hits,
+            'misses' : self.misses,
+            'stores' : self.stores,
+        }
@@ -0,0 +1,111 @@
+import json
+import random
+import numpy as np
+
+from ..common import geometry
+
+
+class VariantStore:
+    """
+    the starting positions of the variants compiled once into a single
+    stacked array : boards[i] is the filled 11x11 board of the variant i,
+    so resetting a game is one array copy and picking a variant needs no
+    file I/O.
+
+    The store can be saved as one .npy file (a structured array of the
+    names and boards) and loaded back memory mapped, e.g. to share the
+    pages between the processes of a vectorized env.
+
+    Examples:
+        >>> store = AbaloneGame._get_variant_store()
+        >>> store.save('variants.npy')
+        >>> AbaloneGame._VARIANT_STORE = VariantStore.load('variants.npy')
+    """
+
+    def __init__(self, names, boards, default='classical'):
+        """
+        Args:
+            names   (list)          : the name of each variant
+            boards  (numpy.ndarray) : (n_variants, 11, 11) int8 starting boards
+            default (str)           : the variant picked for an unknown name
+        """
+        self.names = list(names)
+        self.boards = boards
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.default = self.index[default]
+
+        # the metadata of each variant, as found in variants.json
+        rows, cols = geometry.POSITIONS_ARRAY.T
+        self.variants = []
+        for i, board in enumerate(boards):
+            tokens = np.asarray(board)[rows, cols]
+            players = int(tokens.max()) + 1
+            self.variants.append({
+                'id'           : i,
+                'board_nb'     : geometry.N_POSITIONS,
+                'players'      : players,
+                'players_sets' : [np.flatnonzero(tokens == p).tolist() for p in range(players)],
+            })
+
+    def __len__(self):
+        return len(self.names)
+
+    def pick(self, variant_name='classical', random_pick=False):
+        """
+        Returns:
+            int: the index of the variant (of a random one if random_pick)
+        """
+        if random_pick:
+            return random.randrange(len(self.names))
+        return self.index.get(variant_name, self.default)
+
+    # =========================================================================
+    #                           COMPILATION
+    # =========================================================================
+
+    @classmethod
+    def compile(cls, filename, empty_board):
+        """
+        build the store from a variants.json file
+
+        Args:
+            filename    (str)           : path of the json file
+            empty_board (numpy.ndarray) : the board without any marble
+
+        Returns:
+            VariantStore: the compiled store
+        """
+        with open(filename, 'r') as f:
+            variants = json.load(f)
+
+        names = sorted(variants, key=lambda name: variants[name]['id'])
+        boards = np.repeat(empty_board[np.newaxis], len(names), axis=0)
+        for i, name in enumerate(names):
+            for player, players_set in enumerate(variants[name]['players_sets']):
+                for pos in players_set:
+                    r, c = geometry.POSITIONS[pos]
+                    boards[i, r, c] = player
+        return cls(names, boards)
+
+    def save(self, filename):
+        """ write the names and the boards as one .npy file """
+        n = self.boards.shape[1]
+        width = max(len(name) for name in self.names)
+        records = np.empty(len(self.names), dtype=[('name', 'U%d' % width), ('board', np.int8, (n, n))])
+        records['name'] = self.names
+        records['board'] = self.boards
+        np.save(filename, records)
+
+    @classmethod
+    def load(cls, filename, mmap_mode='r'):
+        """
+        load a store written by save
+
+        Args:
+            mmap_mode (str) : see numpy.load, None to read it in memory
+
+        Returns:
+            VariantStore: the loaded store, its boards being memory mapped
+        """
+        records = np.load(filename, mmap_mode=mmap_mode)
+        return cls(records['name'].tolist(), records['board'])
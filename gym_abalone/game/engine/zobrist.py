@@ -0,0 +1,43 @@
+import random
+
+
+class Zobrist:
+    """
+    random keys of the Zobrist hashing of an Abalone position.
+
+    The hash of a position is the XOR of the keys of :
+        - each marble (player, pos)
+        - the player to move
+        - the damages (number of ejected marbles) of each player
+
+    so a move updates it with a few XOR : a marble leaving or reaching a
+    pos, an ejection changing the damages, the turn passing.
+    The keys are drawn from a fixed seed so that every process computes
+    the same hash for the same position.
+    """
+
+    def __init__(self, n_positions=61, n_players=4, lifes=6, seed=0x5eed):
+        rng = random.Random(seed)
+        self.marbles = [[rng.getrandbits(64) for _ in range(n_positions)] for _ in range(n_players)]
+        self.sides   =  [rng.getrandbits(64) for _ in range(n_players)]
+        self.damages = [[rng.getrandbits(64) for _ in range(lifes + 1)]  for _ in range(n_players)]
+
+    def hash(self, tokens, current_player, players_damages):
+        """
+        compute from scratch the hash of a position
+
+        Args:
+            tokens          (list) : the token of each pos
+            current_player  (int)  : the player to move
+            players_damages (list) : the damages of each player
+
+        Returns:
+            int: the 64 bits hash
+        """
+        h = self.sides[current_player]
+        for pos, token in enumerate(tokens):
+            if token >= 0:
+                h ^= self.marbles[token][pos]
+        for player, damages in enumerate(players_damages):
+            h ^= self.damages[player][damages]
+        return h
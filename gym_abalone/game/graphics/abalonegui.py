@@ -1,10 +1,10 @@
 import pyglet
-import time
 from pyglet.window import key
 from ..engine.gamelogic import AbaloneGame
 from ..common.gameutils import AbaloneUtils
 from .board import Board
 from .header import Header
+from .scheduler import FrameScheduler
 
 class AbaloneGui(pyglet.window.Window):
 
@@ -41,8 +41,8 @@ class AbaloneGui(pyglet.window.Window):
         self.header = Header(self.game, self.theme, self.batch, self.groups)
         self.board  = Board (self.game, self.theme, self.batch, self.groups, debug=self.debug)
 
-        self.last_render = time.time()
-        self.render_dt = 1
+        # frames drawn without blocking the game, see render
+        self.scheduler = FrameScheduler(self._draw_frame)
 
     def _center_window(self):
         # center the window
@@ -102,22 +102,32 @@ class AbaloneGui(pyglet.window.Window):
     # =========================================================================
 
     def render(self, fps=None):
-        #glClearColor(1,1,1,1)
+        """
+        show the board, without ever waiting : the window events are
+        handled, then the frame is drawn unless the last one is too recent,
+        in which case it is dropped and the latest board is drawn as soon as
+        possible (see FrameScheduler).
+
+        Args:
+            fps (float) : the minimum time between two frames in seconds
+                          (None to draw every frame)
+
+        Returns:
+            bool: True if the frame has been drawn now
+        """
+        self.dispatch_events()
+        return self.scheduler.request(period=fps)
+
+    def _draw_frame(self):
+        self.switch_to()
         self.clear()
         self.batch.draw()
-        self.switch_to()
-        self.dispatch_events()
         self.flip()
-        
-        if fps:
-            start = time.time()
-            remaining = fps - (start - self.last_render)
-            if remaining > 0:
-                delta = 0
-                while delta < remaining:
-                    self.dispatch_events()
-                    delta = time.time() - start
-            self.last_render = time.time()
+
+    def close(self):
+        self.scheduler.cancel()
+        self.board.delete()
+        super(AbaloneGui, self).close()
 
     # =========================================================================
     #                               PYGLET EVENTS
@@ -0,0 +1,53 @@
+import pyglet
+
+from ..common.gameutils import AbaloneUtils
+
+
+class ThemeAssets:
+    """
+    the images of a theme, each loaded from disk once per process.
+
+    The small sprites (marbles, arrows, selection) are packed into a
+    texture atlas, so that every marble draws from the same texture. The
+    board and header backgrounds are too big for an atlas and are only
+    cached.
+
+    Examples:
+        >>> assets = ThemeAssets.get(theme)
+        >>> pyglet.sprite.Sprite(assets.players[0], batch=batch)
+    """
+
+    # sprites of a theme -> ThemeAssets, see get
+    _CACHE = {}
+
+    def __init__(self, theme):
+        sprites = theme['sprites']
+        self.bin = pyglet.image.atlas.TextureBin()
+        self.players  = [self._pack(path) for path in sprites['players']]
+        self.arrows   = [self._pack(path) for path in sprites['arrows']]
+        self.selected = self._pack(sprites['selected'])
+        self.board    = AbaloneUtils.get_im_centered(sprites['board'], centered=False)
+        self.header   = AbaloneUtils.get_im_centered(sprites['header'], centered=False)
+
+    def _pack(self, im_path):
+        """ load an image and add it to the atlas, centered """
+        im = AbaloneUtils.get_im_centered(im_path, centered=False)
+        region = self.bin.add(im)
+        region.anchor_x = region.width  // 2
+        region.anchor_y = region.height // 2
+        return region
+
+    @classmethod
+    def get(cls, theme):
+        """
+        Args:
+            theme (dict) : a theme of themes.json
+
+        Returns:
+            ThemeAssets: the assets of the theme, loaded on the first call
+        """
+        key = repr(sorted(theme['sprites'].items()))
+        assets = cls._CACHE.get(key)
+        if assets is None:
+            assets = cls._CACHE[key] = ThemeAssets(theme)
+        return assets
@@ -1,5 +1,6 @@
 import pyglet  
-from ..common.gameutils import AbaloneUtils
+from ..common import geometry
+from .assets import ThemeAssets
 from .marble import Marble
 
 class Board:
@@ -14,36 +15,60 @@ class Board:
         self.groups = groups 
 
         # display the background
-        im = AbaloneUtils.get_im_centered(self.theme['sprites']['board'], centered=False)
-        self.sprite = pyglet.sprite.Sprite(im, batch=self.batch, group=self.groups[0])
+        self.sprite = pyglet.sprite.Sprite(ThemeAssets.get(self.theme).board, batch=self.batch, group=self.groups[0])
 
         self.marbles = None
         self.marbles_out = None
+        # marbles not used by the current variant, kept for the next reset
+        self.marbles_spare = []
 
         self.current_pos = None
 
+    def _all_marbles(self):
+        return [marble for marble in (self.marbles or []) + (self.marbles_out or []) + self.marbles_spare if marble]
+
     def _delete_marbles_sprites(self):
-        if self.marbles:
-            for marble in self.marbles + self.marbles_out:
-                if marble:
-                    marble.delete()
-                    del marble
-            self.marbles     = None
-            self.marbles_out = None
+        for marble in self._all_marbles():
+            marble.delete()
+        self.marbles       = None
+        self.marbles_out   = None
+        self.marbles_spare = []
 
     def _reset_marbles_sprites(self):
-        self.marbles = [None] * self.theme['locations']
+        # the marbles of the previous episode are placed again instead of
+        # being deleted and created, new ones are only made if there are
+        # not enough of them
+        pool = {}
+        for marble in self._all_marbles():
+            pool.setdefault(marble.player, []).append(marble)
+
+        self.marbles = [None] * geometry.N_POSITIONS
         for player in range(self.game.players):
             for pos in self.game.players_sets[player]:
-                marble = Marble(player, self.theme, self.batch, self.groups, debug=self.debug)
+                if pool.get(player):
+                    marble = pool[player].pop()
+                    marble.reset()
+                else:
+                    marble = Marble(player, self.theme, self.batch, self.groups, debug=self.debug)
                 marble.change_position(pos)
                 self.marbles[pos] = marble
         self.marbles_out = []
 
+        self.marbles_spare = [marble for marbles in pool.values() for marble in marbles]
+        for marble in self.marbles_spare:
+            marble.hide()
+
     def reset(self):
-        self._delete_marbles_sprites()
+        self.current_pos = None
         self._reset_marbles_sprites()
-        self.unset_current_pos()
+
+    def delete(self):
+        """ free the sprites of the board and its marbles, once """
+        if self.sprite is None:
+            return
+        self._delete_marbles_sprites()
+        self.sprite.delete()
+        self.sprite = None
 
     def unset_current_pos(self):
         if isinstance(self.current_pos, int) and self.marbles[self.current_pos]:
@@ -1,5 +1,5 @@
 import pyglet
-from ..common.gameutils import AbaloneUtils
+from .assets import ThemeAssets
 
 class Header:
 
@@ -36,7 +36,7 @@ class Header:
         self.x0, self.y0 = 0, self.theme['dimension']['height']
 
         # display header background sprite
-        im = AbaloneUtils.get_im_centered(self.theme['sprites']['header'], centered=False)
+        im = ThemeAssets.get(self.theme).header
         sprite = pyglet.sprite.Sprite(im, batch=self.batch, group=self.groups[0], x=self.x0, y=self.y0)
         self.header_sprite = sprite
         self.width, self.height = sprite.width, sprite.height
@@ -1,5 +1,5 @@
 import pyglet
-from ..common.gameutils import AbaloneUtils
+from .assets import ThemeAssets
 
 class Marble:
     
@@ -33,9 +33,11 @@ class Marble:
         self.pos = None
 
     def _init_sprites(self):
+        # the images are loaded once per theme, see ThemeAssets
+        assets = ThemeAssets.get(self.theme)
+
         # marble sprite
-        im = AbaloneUtils.get_im_centered(self.theme['sprites']['players'][self.player])
-        self.sprites['marble'] = pyglet.sprite.Sprite(im, batch=self.batch, group=self.groups[1])
+        self.sprites['marble'] = pyglet.sprite.Sprite(assets.players[self.player], batch=self.batch, group=self.groups[1])
 
         # label sprite if debug
         if self.debug:
@@ -47,21 +49,34 @@ class Marble:
             )
         
         # direction arrow sprite
-        im = AbaloneUtils.get_im_centered(self.theme['sprites']['arrows'][self.player])
-        self.sprites['arrow'] = pyglet.sprite.Sprite(im, batch=self.batch, group=self.groups[2])
+        self.sprites['arrow'] = pyglet.sprite.Sprite(assets.arrows[self.player], batch=self.batch, group=self.groups[2])
         self.sprites['arrow'].visible = False
 
         # selected sprite
-        im = AbaloneUtils.get_im_centered(self.theme['sprites']['selected'])
-        self.sprites['selected'] = pyglet.sprite.Sprite(im, batch=self.batch, group=self.groups[2])
+        self.sprites['selected'] = pyglet.sprite.Sprite(assets.selected, batch=self.batch, group=self.groups[2])
+        self.sprites['selected'].visible = False
+
+    def reset(self):
+        """ make the marble ready to be placed again, see Board.reset """
+        self.pos = None
+        self.sprites['marble'].visible = True
+        self.sprites['arrow'].visible = False
         self.sprites['selected'].visible = False
+        if self.debug:
+            self.sprites['label'].visible = True
+
+    def hide(self):
+        """ a marble left aside, not used by the current variant """
+        self.pos = None
+        for sprite in self.sprites.values():
+            if sprite:
+                sprite.visible = False
 
     def delete(self):
-        for sprite_name, sprite in self.sprites.items(): 
+        for sprite in self.sprites.values():
             if sprite:
                 sprite.delete()
-                del self.sprites[sprite_name]
-                self.sprites[sprite_name] = None
+        self.sprites = dict.fromkeys(self.sprites)
 
     def change_position(self, pos):
         if self.pos != pos:
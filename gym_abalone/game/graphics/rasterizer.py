@@ -0,0 +1,195 @@
+import numpy as np
+
+from ..common import geometry
+from ..common.gameutils import AbaloneUtils
+
+
+class AbaloneRasterizer:
+    """
+    draw the game into an RGB frame with NumPy only (no window, no pyglet)
+    for the 'rgb_array' render mode.
+
+    The background and, for each cell, a tile of the cell empty or holding
+    the marble of each player are drawn once from the theme's coordinates.
+    The frame is then kept between renders : only the cells whose token
+    changed since the last render (the cells touched by the modifications
+    of the moves played meanwhile) and the new ejected marbles are copied
+    from their tile.
+    """
+
+    # RGB colors
+    BACKGROUND_COLOR = (255, 255, 255)
+    BOARD_COLOR      = (179, 130,  82)
+    HOLE_COLOR       = (128,  87,  51)
+    OUTLINE_COLOR    = ( 70,  70,  70)
+    PLAYERS_COLORS   = [(240, 240, 240), (30, 30, 30), (200, 40, 40), (40, 80, 200)]
+
+    # radius of a hole, of a marble
+    HOLE_RATIO = 0.6
+    # width of the marbles' outline in pixels
+    OUTLINE_WIDTH = 1.5
+    # distance from the corner marbles to the board's edge, of a marble
+    BORDER_RATIO = 1.5
+
+    # drawings of each theme, see _get_drawings
+    _DRAWINGS = {}
+
+    def __init__(self, theme_name='default'):
+        self.theme_name = theme_name
+        self.drawings = AbaloneRasterizer._get_drawings(theme_name)
+        self.frame = self.drawings['background'].copy()
+        # what the frame shows, None until the first render
+        self.tokens = None
+        self.damages = None
+
+    def reset(self):
+        """ forget the drawn game, the next render draws every cell """
+        self.tokens = None
+        self.damages = None
+
+    def render(self, game):
+        """
+        update the frame to the game's position
+
+        Returns:
+            numpy.ndarray: the (height, width, 3) uint8 frame, updated in place
+        """
+        tokens = game.board[geometry.POSITIONS_ARRAY[:, 0], geometry.POSITIONS_ARRAY[:, 1]]
+        damages = list(game.players_damages)
+
+        if self.tokens is None:
+            changed = range(geometry.N_POSITIONS)
+            self.frame[:] = self.drawings['background']
+            self.damages = [0] * len(damages)
+        else:
+            changed = np.flatnonzero(tokens != self.tokens)
+
+        cells = self.drawings['cells']
+        for pos in changed:
+            y, x = cells['corners'][pos]
+            self._blit(y, x, cells['tiles'][pos][tokens[pos] + 2])
+
+        outs = self.drawings['outs']
+        for player, (drawn, damage) in enumerate(zip(self.damages, damages)):
+            for slot in range(min(drawn, damage), min(max(drawn, damage), len(outs['corners'][player]))):
+                y, x = outs['corners'][player][slot]
+                self._blit(y, x, outs['tiles'][player][slot][int(slot < damage)])
+
+        self.tokens = tokens
+        self.damages = damages
+        return self.frame
+
+    def _blit(self, y, x, tile):
+        h, w, _ = tile.shape
+        self.frame[y:y+h, x:x+w] = tile
+
+    # =========================================================================
+    #                           DRAWINGS
+    # =========================================================================
+
+    @classmethod
+    def _get_drawings(cls, theme_name):
+        """
+        draw (once per theme) the background and the tiles of the cells
+
+        Returns:
+            dict with
+                'background' : (height, width, 3) the board without marble
+                'cells'      : 'corners' (pos -> top left (y, x) of the tile)
+                               and 'tiles' (pos -> token + 2 -> tile)
+                'outs'       : 'corners' and 'tiles' (player -> slot ->
+                               empty or not -> tile) of the ejected marbles
+        """
+        if theme_name in cls._DRAWINGS:
+            return cls._DRAWINGS[theme_name]
+
+        theme = AbaloneUtils.get_theme(theme_name)
+        width, height = theme['dimension']['width'], theme['dimension']['height']
+        radius = theme['dimension']['marble_radius']
+
+        # the theme's coordinates have their origin at the bottom left
+        centers = np.array([(height - 1 - y, x) for x, y in theme['coordinates']], dtype=np.float64)
+        outs = [np.array([(height - 1 - y, x) for x, y in coordinates], dtype=np.float64).reshape(-1, 2)
+                for coordinates in theme['out_coordinates']]
+
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:] = cls.BACKGROUND_COLOR
+        ys, xs = np.mgrid[0:height, 0:width]
+        cls._fill(background, cls._hexagon_coverage(ys, xs, centers, radius), cls.BOARD_COLOR)
+        for y, x in centers:
+            cls._stamp(background, y, x, radius * cls.HOLE_RATIO, cls.HOLE_COLOR)
+
+        def tiles(y, x, players):
+            """ the tile of the empty cell and of each player's marble """
+            y0, x0 = int(y) - radius - 1, int(x) - radius - 1
+            size = 2*radius + 3
+            empty = background[y0:y0+size, x0:x0+size]
+            drawn = [empty]
+            for player in range(players):
+                tile = empty.copy()
+                cls._stamp(tile, y - y0, x - x0, radius, cls.OUTLINE_COLOR)
+                cls._stamp(tile, y - y0, x - x0, radius - cls.OUTLINE_WIDTH, cls.PLAYERS_COLORS[player])
+                drawn.append(tile)
+            return (y0, x0), drawn
+
+        players = len(theme['out_coordinates'])
+        cells = {'corners': [], 'tiles': []}
+        for y, x in centers:
+            corner, drawn = tiles(y, x, players)
+            cells['corners'].append(corner)
+            # token + 2 : VOID (never drawn), EMPTY, players
+            cells['tiles'].append([None] + drawn)
+
+        out_cells = {'corners': [], 'tiles': []}
+        for player, coordinates in enumerate(outs):
+            corners, out_tiles = [], []
+            for y, x in coordinates:
+                corner, drawn = tiles(y, x, player + 1)
+                corners.append(corner)
+                out_tiles.append([drawn[0], drawn[player + 1]])
+            out_cells['corners'].append(corners)
+            out_cells['tiles'].append(out_tiles)
+
+        cls._DRAWINGS[theme_name] = {
+            'background' : background,
+            'cells'      : cells,
+            'outs'       : out_cells,
+        }
+        return cls._DRAWINGS[theme_name]
+
+    @staticmethod
+    def _fill(image, coverage, color):
+        """ blend color into the image, weighted by coverage (0 <= <= 1) """
+        coverage = coverage[..., np.newaxis]
+        image[:] = np.rint(image * (1 - coverage) + np.array(color) * coverage)
+
+    @staticmethod
+    def _stamp(image, y, x, radius, color):
+        """ draw an antialiased disc of center (y, x) """
+        y0, y1 = max(int(y - radius) - 1, 0), min(int(y + radius) + 2, image.shape[0])
+        x0, x1 = max(int(x - radius) - 1, 0), min(int(x + radius) + 2, image.shape[1])
+        ys, xs = np.mgrid[y0:y1, x0:x1]
+        coverage = np.clip(radius + 0.5 - np.hypot(ys - y, xs - x), 0, 1)
+        AbaloneRasterizer._fill(image[y0:y1, x0:x1], coverage, color)
+
+    @staticmethod
+    def _hexagon_coverage(ys, xs, centers, radius):
+        """
+        coverage of the board's hexagon, whose corners are the corner
+        marbles pushed away from the center.
+        """
+        center = centers.mean(axis=0)
+        corners = []
+        for pos in [0, 4, 34, 60, 56, 26]:
+            d = centers[pos] - center
+            corners.append(center + d * (1 + AbaloneRasterizer.BORDER_RATIO * radius / np.hypot(*d)))
+        # signed distance to each edge, the inside being positive
+        distance = np.full(ys.shape, np.inf)
+        for (y0, x0), (y1, x1) in zip(corners, corners[1:] + corners[:1]):
+            ny, nx = x1 - x0, -(y1 - y0)
+            norm = np.hypot(ny, nx)
+            side = ((ys - y0) * ny + (xs - x0) * nx) / norm
+            if ((center[0] - y0) * ny + (center[1] - x0) * nx) < 0:
+                side = -side
+            distance = np.minimum(distance, side)
+        return np.clip(distance + 0.5, 0, 1)
@@ -0,0 +1,77 @@
+import pyglet
+
+
+class FrameScheduler:
+    """
+    draw at most one frame per period without ever waiting.
+
+    A frame asked for too soon after the last one is dropped, and the
+    latest state is drawn once the period is over by a pyglet.clock
+    callback, run by the clock.tick of a later request (or by the pyglet
+    event loop). The caller, e.g. env.step, is never blocked.
+
+    Examples:
+        >>> scheduler = FrameScheduler(window.draw_frame)
+        >>> scheduler.request(period=0.1)   # drawn
+        True
+        >>> scheduler.request(period=0.1)   # dropped, drawn later
+        False
+    """
+
+    def __init__(self, draw, clock=None):
+        """
+        Args:
+            draw  (callable)           : draws and shows a frame
+            clock (pyglet.clock.Clock) : default: the pyglet default clock
+        """
+        self.draw = draw
+        self.clock = clock if clock is not None else pyglet.clock.get_default()
+        self.last_frame = None
+        self.pending = False
+        # statistics
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+
+    def request(self, period=None):
+        """
+        Args:
+            period (float) : the minimum time between two frames in seconds
+                             (None to draw every frame)
+
+        Returns:
+            bool: True if the frame has been drawn now
+        """
+        # run the callbacks that are due, a pending frame included : it
+        # draws the latest state, this request's one
+        frames_drawn = self.frames_drawn
+        self.clock.tick()
+        if self.frames_drawn != frames_drawn:
+            return True
+        now = self.clock.time()
+        remaining = 0 if not period or self.last_frame is None else period - (now - self.last_frame)
+        if remaining <= 0:
+            self._draw()
+            return True
+
+        self.frames_dropped += 1
+        if not self.pending:
+            self.pending = True
+            self.clock.schedule_once(self._draw_pending, remaining)
+        return False
+
+    def _draw_pending(self, dt):
+        self._draw()
+
+    def _draw(self):
+        if self.pending:
+            self.clock.unschedule(self._draw_pending)
+            self.pending = False
+        self.draw()
+        self.last_frame = self.clock.time()
+        self.frames_drawn += 1
+
+    def cancel(self):
+        """ forget the pending frame, e.g. before closing the window """
+        if self.pending:
+            self.clock.unschedule(self._draw_pending)
+            self.pending = False
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine import actionspace
+from gym_abalone.game.engine.actionmask import get_action_masks
+from gym_abalone.envs.abalone_env import AbaloneEnv
+
+
+class TestActionMasks(unittest.TestCase):
+
+    def test_same_moves_as_game(self):
+        rng = random.Random(0)
+        game = AbaloneGame()
+        boards, players, expected = [], [], []
+        for variant_name in ['classical', 'belgian-daisy', 'snakes']:
+            game.reset(variant_name=variant_name, random_player=False)
+            for _ in range(50):
+                for player in range(game.players):
+                    mask = np.zeros(61**2, dtype=bool)
+                    mask[[pos0*61 + pos1 for pos0, pos1 in game.get_possible_moves(player)]] = True
+                    boards.append(game.board.copy())
+                    players.append(player)
+                    expected.append(mask)
+                pos0, pos1 = rng.choice(game.get_possible_moves(game.current_player))
+                game.action_handler(pos0, pos1)
+                if game.game_over:
+                    break
+
+        masks = get_action_masks(np.array(boards), np.array(players))
+        self.assertEqual(masks.shape, (len(boards), 61**2))
+        self.assertEqual(masks.dtype, bool)
+        np.testing.assert_array_equal(masks, np.array(expected))
+
+
+class TestEnvMasks(unittest.TestCase):
+
+    def test_compact_masks(self):
+        rng = random.Random(1)
+        env = AbaloneEnv(render_mode='terminal')
+        env.reset(random_player=False, variant_name='german-daisy')
+        buffer = np.zeros(61**2, dtype=np.int16)
+        packed = np.zeros(466, dtype=np.uint8)
+        for _ in range(40):
+            mask = env.get_action_mask()
+            actions = env.get_legal_actions(out=buffer)
+            self.assertTrue(np.shares_memory(actions, buffer))
+            np.testing.assert_array_equal(actions, np.flatnonzero(mask))
+            np.testing.assert_array_equal(env.get_packed_action_mask(out=packed), np.packbits(mask.astype(bool)))
+            action = divmod(int(actions[rng.randrange(len(actions))]), 61)
+            env.step(action)
+
+    def test_step_on_cached_moves(self):
+        rng = random.Random(2)
+        env, reference = AbaloneEnv(render_mode='terminal'), AbaloneEnv(render_mode='terminal')
+        for e in (env, reference):
+            e.reset(random_player=False, variant_name='the-wall')
+        for _ in range(60):
+            actions = env.get_legal_actions()
+            # illegal actions too, rejected by the cached legal set
+            action = divmod(rng.randrange(61**2) if rng.random() < 0.3 else int(rng.choice(actions)), 61)
+            _, reward, done, info = env.step(action)
+            _, reference_reward, _, reference_info = reference.step(action)
+            self.assertEqual((reward, info), (reference_reward, reference_info))
+            np.testing.assert_array_equal(env.game.board, reference.game.board)
+            if done:
+                break
+
+    def test_out_of_range_actions(self):
+        for compact_actions, actions in ((False, [(0, 61), (61, 0), (-1, 5), (5, -61)]),
+                                         (True, [actionspace.n_slots(), -1])):
+            for warm_cache in (False, True):
+                env = AbaloneEnv(render_mode='terminal', compact_actions=compact_actions)
+                env.reset(random_player=False, variant_name='classical')
+                board = env.game.board.copy()
+                for action in actions:
+                    # the same illegal move, whether a mask has been asked for or not
+                    if warm_cache:
+                        env.get_action_mask()
+                    _, reward, done, info = env.step(action)
+                    self.assertEqual((reward, done, info['move_type']), (0, False, None), (action, warm_cache))
+                    np.testing.assert_array_equal(env.game.board, board)
+                    self.assertEqual((env.game.current_player, env.turns), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
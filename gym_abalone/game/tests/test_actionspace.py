@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine import actionspace
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.actionmask import get_action_masks
+from gym_abalone.envs.abalone_env import AbaloneEnv
+
+
+class TestActionSpace(unittest.TestCase):
+
+    def test_mapping(self):
+        n = actionspace.n_slots()
+        self.assertLess(n, 61**2 // 2)
+        for slot in range(n):
+            self.assertEqual(actionspace.get_slot(*actionspace.get_pair(slot)), slot)
+        self.assertEqual(actionspace.get_slot(0, 60), -1)
+        self.assertEqual(actionspace.get_slot(0, 61), -1)
+        self.assertEqual(actionspace.get_slot(-1, 0), -1)
+        for slot in (-1, n):
+            with self.assertRaises(IndexError):
+                actionspace.get_pair(slot)
+
+    def test_every_legal_move_has_a_slot(self):
+        rng = random.Random(0)
+        game = AbaloneGame()
+        boards, players = [], []
+        for variant_name in ['classical', 'the-wall', 'domination']:
+            game.reset(variant_name=variant_name, random_player=False)
+            for _ in range(80):
+                boards.append(game.board.copy())
+                players.append(game.current_player)
+                game.action_handler(*rng.choice(game.get_possible_moves(game.current_player)))
+                if game.game_over:
+                    break
+        masks = get_action_masks(np.array(boards), np.array(players))
+        compact = actionspace.compact_masks(masks)
+        self.assertEqual(compact.shape, (len(boards), actionspace.n_slots()))
+        np.testing.assert_array_equal(compact.sum(axis=1), masks.sum(axis=1))
+
+    def test_compact_env(self):
+        rng = random.Random(1)
+        env = AbaloneEnv(render_mode='terminal', compact_actions=True)
+        reference = AbaloneEnv(render_mode='terminal')
+        self.assertEqual(env.action_space.n, actionspace.n_slots())
+        for e in (env, reference):
+            e.reset(random_player=False, variant_name='belgian-daisy')
+        for _ in range(50):
+            mask = env.get_action_mask()
+            slots = env.get_legal_actions()
+            np.testing.assert_array_equal(slots, np.flatnonzero(mask))
+            np.testing.assert_array_equal(env.get_packed_action_mask(), np.packbits(mask.astype(bool)))
+            np.testing.assert_array_equal(mask, actionspace.compact_masks(reference.get_action_mask()))
+            slot = int(rng.choice(slots))
+            _, reward, done, info = env.step(slot)
+            _, reference_reward, _, reference_info = reference.step(actionspace.get_pair(slot))
+            self.assertEqual((reward, info), (reference_reward, reference_info))
+            if done:
+                break
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.common.gameutils import AbaloneUtils
+
+
+class TestGuiAssets(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # an offscreen OpenGL context, the tests are skipped without one
+        try:
+            import pyglet
+            pyglet.options['headless'] = True
+            cls.window = pyglet.window.Window(visible=False)
+        except Exception as e:
+            raise unittest.SkipTest(f'no OpenGL context : {e}')
+        from gym_abalone.game.graphics.assets import ThemeAssets
+        from gym_abalone.game.graphics.board import Board
+        cls.ThemeAssets, cls.Board = ThemeAssets, Board
+        cls.groups = [pyglet.graphics.Group(order=i) if hasattr(pyglet.graphics.Group, 'order')
+                      else pyglet.graphics.OrderedGroup(i) for i in range(3)]
+        cls.batch = pyglet.graphics.Batch()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.window.close()
+
+    def test_images_loaded_once(self):
+        assets = self.ThemeAssets.get(AbaloneUtils.get_theme())
+        self.assertIs(self.ThemeAssets.get(AbaloneUtils.get_theme()), assets)
+        # the sprites of the marbles share one atlas texture
+        textures = {region.owner for region in assets.players + assets.arrows + [assets.selected]}
+        self.assertEqual(len(textures), 1)
+        self.assertEqual((assets.selected.anchor_x, assets.selected.anchor_y),
+                         (assets.selected.width // 2, assets.selected.height // 2))
+
+    def test_marbles_reused_across_resets(self):
+        game = AbaloneGame()
+        game.reset(random_player=False, variant_name='classical')
+        board = self.Board(game, AbaloneUtils.get_theme(), self.batch, self.groups)
+        board.reset()
+        marbles = {id(marble) for marble in board.marbles if marble}
+        self.assertEqual(len(marbles), 28)
+
+        # an ejection, then a variant with fewer marbles
+        board.update([(0, 0, -1)])
+        game.reset(random_player=False, variant_name='corners')
+        board.reset()
+        self.assertEqual({id(marble) for marble in board._all_marbles()}, marbles)
+        placed = [marble for marble in board.marbles if marble]
+        self.assertEqual(len(placed) + len(board.marbles_spare), 28)
+        self.assertTrue(all(marble.sprites['marble'].visible for marble in placed))
+        self.assertFalse(any(marble.sprites['marble'].visible for marble in board.marbles_spare))
+        for pos, marble in enumerate(board.marbles):
+            if marble:
+                self.assertEqual(marble.pos, pos)
+        board.delete()
+        self.assertEqual(board._all_marbles(), [])
+        # AbaloneGui.close may run twice
+        board.delete()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+
+
+class TestBitboard(unittest.TestCase):
+
+    VARIANTS = ['classical', 'belgian-daisy', 'alien-attack', 'snakes', 'the-wall']
+
+    def test_masks_roundtrip(self):
+        game = AbaloneBitboardGame()
+        game.reset(variant_name='classical', random_player=False)
+        self.assertEqual([bin(mask).count('1') for mask in game.masks], [14, 14])
+        board = AbaloneBitboardGame.masks_to_board(game.masks)
+        self.assertEqual(AbaloneBitboardGame.board_to_masks(board), game.masks)
+
+    def test_same_games_as_array_backend(self):
+        rng = random.Random(0)
+        game, bitboard = AbaloneGame(), AbaloneBitboardGame()
+        for variant_name in TestBitboard.VARIANTS:
+            game.reset(variant_name=variant_name, random_player=False)
+            bitboard.reset(variant_name=variant_name, random_player=False)
+            for _ in range(60):
+                self.assertTrue((game.board == bitboard.board).all())
+                # the board is kept in sync with the masks
+                self.assertTrue((bitboard.board == AbaloneBitboardGame.masks_to_board(bitboard.masks)).all())
+                for player in range(game.players):
+                    self.assertEqual(
+                        game.get_possible_moves(player, group_by_type=True),
+                        bitboard.get_possible_moves(player, group_by_type=True)
+                    )
+                pos0, pos1 = rng.choice(game.get_possible_moves(game.current_player))
+                self.assertEqual(game.action_handler(pos0, pos1), bitboard.action_handler(pos0, pos1))
+                self.assertEqual(game.players_damages, bitboard.players_damages)
+                if game.game_over:
+                    break
+
+    def test_board_edited_in_place(self):
+        game, bitboard = AbaloneGame(), AbaloneBitboardGame()
+        for g in (game, bitboard):
+            g.reset(variant_name='classical', random_player=False)
+            g.action_handler(*g.get_possible_moves(0)[0])
+            # a white marble taken away, a black one put in the middle
+            r, c = g.positions[0]
+            g.board[r, c] = AbaloneGame.TOKEN_EMPTY
+            r, c = g.positions[30]
+            g.board[r, c] = 1
+            g.refresh_state()
+        self.assertEqual(bitboard.masks, AbaloneBitboardGame.board_to_masks(game.board))
+        self.assertEqual(game.hash, bitboard.hash)
+        # checked on the board, then looked up in the legal moves
+        for pos0 in range(61):
+            for pos1 in range(61):
+                self.assertEqual(game.validate_move(pos0, pos1, 1, return_modif=True),
+                                 bitboard.validate_move(pos0, pos1, 1, return_modif=True))
+        for player in range(game.players):
+            self.assertEqual(game.get_possible_moves(player, group_by_type=True),
+                             bitboard.get_possible_moves(player, group_by_type=True))
+        for pos0, pos1 in game.get_possible_moves(1):
+            self.assertEqual(game.validate_move(pos0, pos1, 1, return_modif=True),
+                             bitboard.validate_move(pos0, pos1, 1, return_modif=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.encoder import ObservationEncoder
+from gym_abalone.game.common import geometry
+from gym_abalone.envs.abalone_env import AbaloneEnv
+
+
+class TestObservationEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AbaloneGame()
+        self.game.reset(variant_name='classical', player=1, random_player=False)
+        self.game.players_damages = [2, 3]
+
+    def test_planes(self):
+        planes = ObservationEncoder().encode_game(self.game)
+        board = self.game.board
+        self.assertEqual((planes.shape, planes.dtype), ((7, 11, 11), np.float32))
+        np.testing.assert_array_equal(planes[0], board == 1)
+        np.testing.assert_array_equal(planes[1], board == 0)
+        np.testing.assert_array_equal(planes[2], board == AbaloneGame.TOKEN_EMPTY)
+        np.testing.assert_array_equal(planes[3], geometry.VALID)
+        self.assertTrue((planes[4] == 1).all())
+        self.assertTrue((planes[5] == 3 / AbaloneGame.LIFES).all())
+        self.assertTrue((planes[6] == 2 / AbaloneGame.LIFES).all())
+
+    def test_cells_and_batches(self):
+        rng = random.Random(0)
+        boards, players, damages = [], [], []
+        for _ in range(20):
+            self.game.action_handler(*rng.choice(self.game.get_possible_moves(self.game.current_player)))
+            boards.append(self.game.board.copy())
+            players.append(self.game.current_player)
+            damages.append(list(self.game.players_damages))
+
+        encoder, cells = ObservationEncoder(), ObservationEncoder(layout='cells')
+        out = np.zeros((20,) + cells.shape, dtype=np.float32)
+        batch = cells.encode(boards, players, damages, out=out)
+        self.assertIs(batch, out)
+        planes = encoder.encode(boards, players, damages)
+        np.testing.assert_array_equal(batch, planes.reshape(20, 7, -1)[:, :, geometry.FLAT])
+        # the last board of the batch is the game
+        np.testing.assert_array_equal(planes[-1], encoder.encode_game(self.game))
+
+        with self.assertRaises(ValueError):
+            out = np.zeros((2, 7, 11, 11), dtype=np.float32).transpose(0, 1, 3, 2)
+            encoder.encode(boards[:2], players[:2], damages[:2], out=out)
+
+    def test_env(self):
+        env = AbaloneEnv(render_mode='terminal', observation_mode='cells', copy_observation=False)
+        observation = env.reset(random_player=False)
+        self.assertEqual(observation.shape, env.observation_space.shape)
+        self.assertIs(observation, env.encoder.buffer)
+        buffer = np.zeros(env.observation_space.shape, dtype=np.float32)
+        self.assertIs(env.get_observation(out=buffer), buffer)
+        np.testing.assert_array_equal(buffer, observation)
+        next_observation, _, _, _ = env.step(env.game.get_possible_moves(0)[0])
+        self.assertEqual(next_observation[4, 0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from gym_abalone.game.common import geometry
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_positions(self):
+        board = AbaloneGame.new_board()
+        self.assertEqual(geometry.POSITIONS, AbaloneGame.find_token_coords(board, AbaloneGame.TOKEN_EMPTY))
+        self.assertTrue((geometry.VALID == (board == AbaloneGame.TOKEN_EMPTY)).all())
+        for pos, (r, c) in enumerate(geometry.POSITIONS):
+            self.assertEqual(geometry.POS_OF_COORDS[r, c], pos)
+
+    def test_rays(self):
+        for pos, (r, c) in enumerate(geometry.POSITIONS):
+            for d, (dr, dc) in enumerate(geometry.DIRECTIONS):
+                for k in range(geometry.MAX_RAY):
+                    r_, c_ = r + (k+1)*dr, c + (k+1)*dc
+                    expected = geometry.POS_OF_COORDS[r_, c_] if 0 <= r_ < 11 and 0 <= c_ < 11 else -1
+                    if expected != geometry.OFF_BOARD:
+                        self.assertNotIn(geometry.OFF_BOARD, geometry.RAYS[pos, d, :k])
+                    self.assertEqual(geometry.RAYS[pos, d, k], expected)
+                self.assertEqual(geometry.NEIGHBORS[pos, d], geometry.RAYS[pos, d, 0])
+
+    def test_lines(self):
+        for axis in range(3):
+            members = sorted(pos for line in geometry.LINE_MEMBERS[axis] for pos in line)
+            self.assertEqual(members, list(range(geometry.N_POSITIONS)))
+            for line in geometry.LINE_MEMBERS[axis]:
+                for pos0, pos1 in zip(line, line[1:]):
+                    self.assertEqual(geometry.NEIGHBORS[pos0, axis], pos1)
+
+    def test_decompose_inline(self):
+        self.assertEqual(AbaloneGame.decompose_inline(1, 0), (1, 1))
+        self.assertEqual(AbaloneGame.decompose_inline(-3, 3), (3, 5))
+        self.assertIsNone(AbaloneGame.decompose_inline(2, -1))
+        self.assertIsNone(AbaloneGame.decompose_inline(2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,17 @@
+import sys
+import subprocess
+import unittest
+
+
+class TestHeadlessImports(unittest.TestCase):
+
+    def test_no_graphics_loaded(self):
+        # a fresh interpreter : the test runner may have loaded pyglet already
+        code = ("import sys, gym_abalone.envs, gym_abalone.game.graphics.rasterizer; "
+                "print([m for m in sys.modules if m.startswith('pyglet') or m.endswith('abalonegui')])")
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
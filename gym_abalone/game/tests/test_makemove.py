@@ -0,0 +1,50 @@
+import copy
+import random
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+from gym_abalone.game.engine.playout import push_first_move
+
+
+class TestMakeUnmake(unittest.TestCase):
+
+    @staticmethod
+    def state(game):
+        return (game.board.tobytes(), list(game.players_damages), list(game.players_victories),
+                game.current_player, game.turns_count, game.game_over)
+
+    def play_and_take_back(self, game, variant_name, seed):
+        rng = random.Random(seed)
+        game.reset(variant_name=variant_name, random_player=False)
+        states = [self.state(game)]
+        while not game.game_over and len(states) < 300:
+            pos0, pos1 = push_first_move(game, rng)
+            reference = copy.deepcopy(game)
+            self.assertEqual(game.make_move(pos0, pos1), reference.action_handler(pos0, pos1))
+            self.assertEqual(self.state(game), self.state(reference))
+            states.append(self.state(game))
+
+        self.assertTrue(game.game_over)
+        self.assertIsNone(game.make_move(0, 1))
+        while game.undo_stack:
+            states.pop()
+            game.unmake_move()
+            self.assertEqual(self.state(game), states[-1])
+
+    def test_numpy_backend(self):
+        self.play_and_take_back(AbaloneGame(), 'classical', 0)
+        self.play_and_take_back(AbaloneGame(), 'belgian-daisy', 1)
+
+    def test_bitboard_backend(self):
+        self.play_and_take_back(AbaloneBitboardGame(), 'classical', 0)
+
+    def test_invalid_move(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        self.assertIsNone(game.make_move(0, 30))
+        self.assertEqual(game.undo_stack, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.mcts import MCTS, ParallelMCTS
+
+
+class TestMCTS(unittest.TestCase):
+
+    def setUp(self):
+        self.game = AbaloneGame()
+        self.game.reset(variant_name='belgian-daisy', random_player=False)
+
+    def test_game_left_unchanged(self):
+        board, hash_ = self.game.board.copy(), self.game.hash
+        mcts = MCTS(playout_depth=10, seed=0)
+        statistics = mcts.search(self.game, n_playouts=60)
+        self.assertEqual(sum(visits for visits, _ in statistics.values()), 60)
+        self.assertIn(MCTS.best_move(statistics), self.game.get_possible_moves(self.game.current_player))
+        self.assertTrue((self.game.board == board).all())
+        self.assertEqual(self.game.hash, hash_)
+        self.assertEqual(self.game.undo_stack, [])
+
+    def test_root_parallelism(self):
+        mcts = ParallelMCTS(n_workers=2, n_playouts=20, playout_depth=10, seed=0)
+        try:
+            move = mcts.search(self.game)
+        finally:
+            mcts.close()
+        self.assertIn(move, self.game.get_possible_moves(self.game.current_player))
+        self.assertEqual(sum(visits for visits, _ in mcts.statistics.values()), 40)
+        self.assertEqual([infos['playouts'] for infos in mcts.infos['workers']], [20, 20])
+        self.assertGreater(mcts.infos['playouts_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
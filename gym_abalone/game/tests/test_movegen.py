@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.playout import play_random
+
+
+class TestMoveGenerator(unittest.TestCase):
+
+    VARIANTS = ['classical', 'belgian-daisy', 'alien-attack', 'snakes', 'the-wall']
+
+    def test_same_moves_as_bruteforce(self):
+        game = AbaloneGame()
+        for seed, variant_name in enumerate(TestMoveGenerator.VARIANTS):
+            game.reset(variant_name=variant_name, random_player=False)
+            for position in play_random(game, 40, random.Random(seed)):
+                for player in range(position.players):
+                    self.assertEqual(
+                        position.get_possible_moves_bruteforce(player, group_by_type=True),
+                        position.get_possible_moves(player, group_by_type=True)
+                    )
+
+    def test_incremental_moves(self):
+        rng = random.Random(0)
+        game = AbaloneGame()
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        for _ in range(150):
+            if game.game_over or (game.undo_stack and rng.random() < 0.3):
+                game.unmake_move()
+            else:
+                game.make_move(*rng.choice(game.get_possible_moves(game.current_player)))
+            incremental = [game.get_possible_moves(player, group_by_type=True) for player in range(game.players)]
+            game.refresh_state()
+            self.assertEqual(incremental, [game.get_possible_moves(player, group_by_type=True)
+                                           for player in range(game.players)])
+
+    def test_classical_opening(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        moves = game.get_possible_moves(0, group_by_type=True)
+        self.assertEqual(len(moves['inline_move']) + len(moves['sidestep_move']), 44)
+        self.assertFalse(moves['inline_push'] or moves['ejected'] or moves['winner'])
+        self.assertEqual(game.get_possible_moves(0), sorted(game.get_possible_moves(0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
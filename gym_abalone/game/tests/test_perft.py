@@ -0,0 +1,40 @@
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+from gym_abalone.game.engine.perft import perft, divide, main, REFERENCE_COUNTS
+
+
+class TestPerft(unittest.TestCase):
+
+    def new_game(self, variant_name, backend=AbaloneGame):
+        game = backend()
+        game.reset(player=0, random_player=False, variant_name=variant_name)
+        return game
+
+    def test_reference_counts(self):
+        for variant_name, counts in REFERENCE_COUNTS.items():
+            for backend in [AbaloneGame, AbaloneBitboardGame]:
+                game = self.new_game(variant_name, backend)
+                self.assertEqual([perft(game, depth) for depth in (1, 2)], counts[:2], variant_name)
+        self.assertEqual(perft(self.new_game('classical'), 3), REFERENCE_COUNTS['classical'][2])
+
+    def test_bruteforce(self):
+        game = self.new_game('belgian-daisy')
+        self.assertEqual(perft(game, 2, bruteforce=True), REFERENCE_COUNTS['belgian-daisy'][1])
+
+    def test_divide(self):
+        game = self.new_game('classical')
+        board, hash_ = game.board.copy(), game.hash
+        counts = divide(game, 2)
+        self.assertEqual(len(counts), REFERENCE_COUNTS['classical'][0])
+        self.assertEqual(sum(counts.values()), REFERENCE_COUNTS['classical'][1])
+        self.assertTrue((game.board == board).all())
+        self.assertEqual(game.hash, hash_)
+
+    def test_cli(self):
+        self.assertEqual(main(['--variant', 'dutch-daisy', '--depth', '2']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
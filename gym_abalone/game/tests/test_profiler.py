@@ -0,0 +1,37 @@
+import unittest
+
+from gym_abalone.envs.abalone_env import AbaloneEnv
+from gym_abalone.game.common.profiler import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_env_phases(self):
+        dumps = []
+        env = AbaloneEnv(render_mode='terminal', profiler=Profiler(dump_every=0, dump=dumps.append))
+        env.reset(random_player=False)
+        move = env.game.get_possible_moves(env.game.current_player)[0]
+        env.step(move)
+        env.step((0, 0))
+
+        snapshot = env.profiler.snapshot()
+        self.assertEqual(snapshot['counters']['resets'], 1)
+        self.assertEqual(snapshot['counters']['steps'], 2)
+        self.assertEqual(snapshot['counters']['illegal_actions'], 1)
+        self.assertEqual(sum(n for name, n in snapshot['counters'].items() if name.startswith('moves.')), 1)
+        self.assertEqual(snapshot['timers']['validation']['calls'], 2)
+        self.assertEqual(snapshot['timers']['modifications']['calls'], 1)
+        self.assertEqual(snapshot['timers']['observation']['calls'], 2)
+        self.assertIn('move_generation', snapshot['timers'])
+        self.assertEqual(len(dumps), 2)
+
+    def test_disabled(self):
+        env = AbaloneEnv(render_mode='terminal')
+        env.reset()
+        env.step(env.game.get_possible_moves(env.game.current_player)[0])
+        self.assertIsNone(env.profiler)
+        self.assertIsNone(env.game.profiler)
+
+
+if __name__ == '__main__':
+    unittest.main()
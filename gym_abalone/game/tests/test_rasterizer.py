@@ -0,0 +1,40 @@
+import random
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.graphics.rasterizer import AbaloneRasterizer
+
+
+class TestRasterizer(unittest.TestCase):
+
+    def test_frame(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        frame = AbaloneRasterizer().render(game)
+        self.assertEqual(frame.shape, (600, 880, 3))
+        self.assertEqual(frame.dtype.name, 'uint8')
+
+    def test_incremental_updates(self):
+        rng = random.Random(0)
+        game = AbaloneGame()
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        rasterizer = AbaloneRasterizer()
+        rasterizer.render(game)
+        for turn in range(60):
+            if game.game_over or (game.undo_stack and rng.random() < 0.2):
+                game.unmake_move()
+            else:
+                moves = game.get_possible_moves(game.current_player, group_by_type=True)
+                moves = moves['ejected'] or moves['inline_push'] or game.get_possible_moves(game.current_player)
+                game.make_move(*rng.choice(moves))
+            # some moves are not rendered
+            if turn % 3:
+                frame = rasterizer.render(game)
+                self.assertTrue((frame == AbaloneRasterizer().render(game)).all())
+
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        self.assertTrue((rasterizer.render(game) == AbaloneRasterizer().render(game)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import random
+import tempfile
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.playout import push_first_move
+from gym_abalone.data import GameRecord, GameReplay, write_records, load_records
+
+
+def random_game(variant_name, player, n_moves, seed):
+    """ play random moves, return the record and the boards after each move """
+    rng = random.Random(seed)
+    game = AbaloneGame()
+    game.reset(player=player, random_player=False, variant_name=variant_name)
+    record = GameRecord(variant_name, player)
+    boards = [game.board.copy()]
+    for _ in range(n_moves):
+        if game.game_over:
+            break
+        pos0, pos1 = rng.choice(game.get_possible_moves(game.current_player))
+        game.action_handler(pos0, pos1)
+        record.append(pos0, pos1)
+        boards.append(game.board.copy())
+    return record, boards
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_bytes_roundtrip(self):
+        record, _ = random_game('belgian-daisy', 1, 30, seed=0)
+        data = record.to_bytes()
+        self.assertEqual(len(data), 4 + 2 * len(record))
+        copy, end = GameRecord.from_bytes(data)
+        self.assertEqual(end, len(data))
+        self.assertEqual((copy.variant, copy.player, copy.moves), (record.variant, record.player, record.moves))
+
+    def test_replay_random_access(self):
+        record, boards = random_game('classical', 0, 50, seed=1)
+        replay = GameReplay(record, checkpoint_every=8)
+        self.assertEqual(len(replay), len(boards))
+        for t in [50, 0, 17, 16, 3, 49]:
+            self.assertTrue((replay.board(t) == boards[t]).all(), t)
+        self.assertEqual(replay.seek(7).current_player, 1)
+
+    def test_seek_finished_game(self):
+        rng = random.Random(2)
+        game = AbaloneGame()
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        record = GameRecord('belgian-daisy', 0)
+        while not game.game_over:
+            pos0, pos1 = push_first_move(game, rng)
+            game.action_handler(pos0, pos1)
+            record.append(pos0, pos1)
+
+        replay = GameReplay(record)
+        victories = replay.seek(len(record)).players_victories
+        self.assertEqual(sum(victories), 1)
+        # the winning move is replayed again, not counted again
+        self.assertEqual(replay.seek(len(record)).players_victories, victories)
+        self.assertEqual(replay.seek(0).players_victories, [0, 0])
+        self.assertTrue(replay.seek(len(record)).game_over)
+
+    def test_illegal_move(self):
+        record = GameRecord('classical', 0, [(0, 1)])
+        with self.assertRaises(ValueError):
+            GameReplay(record)
+
+    def test_file_roundtrip(self):
+        records = [random_game(name, i % 2, 20 + i, seed=i)[0]
+                   for i, name in enumerate(['classical', 'german-daisy', 'the-wall'])]
+        records.append(GameRecord('domination', 0))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.rec')
+            write_records(path, records[:2])
+            write_records(path, records[2:], append=True)
+            loaded = load_records(path)
+
+            self.assertEqual(len(loaded), len(records))
+            self.assertEqual(loaded.offsets[-1], sum(len(record) for record in records))
+            for record, copy in zip(records, (loaded[i] for i in range(len(loaded)))):
+                self.assertEqual((copy.variant, copy.player, copy.moves), (record.variant, record.player, record.moves))
+
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                load_records(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import pyglet
+
+from gym_abalone.game.graphics.scheduler import FrameScheduler
+
+
+class TestFrameScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.frames = []
+        clock = pyglet.clock.Clock(time_function=lambda: self.now)
+        self.scheduler = FrameScheduler(lambda: self.frames.append(self.now), clock=clock)
+
+    def test_every_frame(self):
+        for _ in range(5):
+            self.assertTrue(self.scheduler.request())
+        self.assertEqual(len(self.frames), 5)
+
+    def test_drop_then_draw_pending(self):
+        scheduler = self.scheduler
+        self.assertTrue(scheduler.request(period=0.5))
+        # steps faster than the display : dropped, the last one pending
+        for _ in range(10):
+            self.now += 0.01
+            self.assertFalse(scheduler.request(period=0.5))
+        self.assertEqual((scheduler.frames_drawn, scheduler.frames_dropped), (1, 10))
+        self.assertTrue(scheduler.pending)
+
+        # the pending frame is drawn by the clock once the period is over
+        self.now = 0.6
+        scheduler.clock.tick()
+        self.assertEqual(self.frames, [0.0, 0.6])
+        self.assertFalse(scheduler.pending)
+
+        self.now = 0.7
+        self.assertFalse(scheduler.request(period=0.5))
+        scheduler.cancel()
+        self.now = 2.0
+        scheduler.clock.tick()
+        self.assertEqual(len(self.frames), 2)
+        self.assertTrue(scheduler.request(period=0.5))
+
+    def test_pending_drawn_by_request(self):
+        scheduler = self.scheduler
+        self.assertTrue(scheduler.request(period=0.5))
+        self.now = 0.1
+        self.assertFalse(scheduler.request(period=0.5))
+        # the tick of the next request draws the pending frame : this
+        # request is drawn, not dropped nor scheduled again
+        self.now = 0.6
+        self.assertTrue(scheduler.request(period=0.5))
+        self.assertEqual((scheduler.frames_drawn, scheduler.frames_dropped), (2, 1))
+        self.assertFalse(scheduler.pending)
+        self.now = 2.0
+        scheduler.clock.tick()
+        self.assertEqual(self.frames, [0.0, 0.6])
+
+
+if __name__ == '__main__':
+    unittest.main()
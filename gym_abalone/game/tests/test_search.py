@@ -0,0 +1,149 @@
+import unittest
+
+from gym_abalone.game.common.profiler import Profiler
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.search import AlphaBetaSearch
+from gym_abalone.envs.abalone_env import Reward
+from gym_abalone.envs.abalone_extrahard_env import AbaloneExtraHardEnv
+
+
+class TestAlphaBetaSearch(unittest.TestCase):
+
+    def test_game_left_unchanged(self):
+        game = AbaloneGame()
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        board, hash_ = game.board.copy(), game.hash
+        search = AlphaBetaSearch(max_depth=2, time_limit=None)
+        move = search.search(game)
+        self.assertIn(move, game.get_possible_moves(game.current_player))
+        self.assertEqual(search.infos['depth'], 2)
+        self.assertTrue((game.board == board).all())
+        self.assertEqual(game.hash, hash_)
+        self.assertEqual(game.undo_stack, [])
+
+    def test_finds_the_winning_push(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        # white (0) pushes a black marble out : 3 white marbles behind it on the edge
+        game.board = game.new_board()
+        for pos in [46, 47, 48, 50]:
+            r, c = game.positions[pos]
+            game.board[r, c] = 0
+        for pos in [49, 2]:
+            r, c = game.positions[pos]
+            game.board[r, c] = 1
+        game.players_damages = [0, AbaloneGame.LIFES - 1]
+        game.refresh_state()
+
+        search = AlphaBetaSearch(max_depth=3, time_limit=None)
+        pos0, pos1 = search.search(game)
+        self.assertEqual(game.validate_move(pos0, pos1, 0), 'winner')
+
+    def test_node_budget(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        search = AlphaBetaSearch(max_depth=10, time_limit=None, max_nodes=200)
+        self.assertIsNotNone(search.search(game))
+        self.assertLessEqual(search.infos['nodes'], 201)
+
+
+
+class TestExtraHardEnv(unittest.TestCase):
+
+    def make_env(self, agent_player=0):
+        env = AbaloneExtraHardEnv(render_mode='terminal', agent_player=agent_player, max_depth=1, time_limit=None)
+        env.reset(player=0, random_player=False, variant_name='classical')
+        return env
+
+    def test_opponent_answers(self):
+        env = self.make_env()
+        pos0, pos1 = env.game.get_possible_moves(0)[0]
+        after_agent = env.game.clone()
+        after_agent.action_handler(pos0, pos1)
+
+        _, reward, done, info = env.step((pos0, pos1))
+        self.assertEqual(info['move_type'], 'inline_move')
+        self.assertIn(info['opponent_move'], after_agent.get_possible_moves(1))
+        after_agent.action_handler(*info['opponent_move'])
+        self.assertTrue((env.game.board == after_agent.board).all())
+        # the agent is to move again
+        self.assertEqual((env.game.current_player, env.turns), (0, 3))
+        # the reward of the agent minus the reward of the opponent
+        self.assertEqual(reward, Reward.method_1(None, 'inline_move') - Reward.method_1(None, info['opponent_move_type']))
+        self.assertFalse(done)
+
+    def test_opponent_opens(self):
+        env = self.make_env(agent_player=1)
+        self.assertEqual((env.game.current_player, env.turns), (1, 2))
+        start = AbaloneGame()
+        start.reset(player=0, random_player=False, variant_name='classical')
+        self.assertFalse((env.game.board == start.board).all())
+        # the opening is rendered
+        self.assertTrue(env._modifications)
+
+    def test_illegal_move(self):
+        env = self.make_env()
+        env.step(env.game.get_possible_moves(0)[0])
+        board, turns = env.game.board.copy(), env.turns
+
+        observation, reward, done, info = env.step((0, 30))
+        self.assertIsNone(info['move_type'])
+        self.assertIsNone(info['opponent_move'])
+        self.assertEqual(reward, 0)
+        self.assertTrue((observation == board).all())
+        self.assertEqual((env.game.current_player, env.turns), (0, turns))
+        # the previous turn is not rendered again
+        self.assertIsNone(env._modifications)
+
+    def test_winning_move(self):
+        env = self.make_env()
+        game = env.game
+        game.board = game.new_board()
+        for pos in [46, 47, 48, 50]:
+            r, c = game.positions[pos]
+            game.board[r, c] = 0
+        for pos in [49, 2]:
+            r, c = game.positions[pos]
+            game.board[r, c] = 1
+        game.players_damages = [0, AbaloneGame.LIFES - 1]
+        game.refresh_state()
+
+        move = game.get_possible_moves(0, group_by_type=True)['winner'][0]
+        _, reward, done, info = env.step(move)
+        self.assertTrue(done)
+        self.assertEqual(reward, Reward.method_1(None, 'winner'))
+        self.assertIsNone(info['opponent_move'])
+
+    def test_opponent_without_move(self):
+        env = self.make_env()
+        game = env.game
+        # the black marble of the corner is blocked by white marbles
+        game.board = game.new_board()
+        for pos, player in [(0, 1), (1, 0), (5, 0), (6, 0), (30, 0)]:
+            r, c = game.positions[pos]
+            game.board[r, c] = player
+        game.refresh_state()
+        self.assertEqual(game.get_possible_moves(1), [])
+
+        move = next(move for move in game.get_possible_moves(0) if move[0] == 30)
+        _, _, done, info = env.step(move)
+        self.assertFalse(done)
+        self.assertIsNone(info['opponent_move'])
+        # the opponent passes, the agent plays again
+        self.assertEqual((game.current_player, env.turns), (0, 3))
+
+        env = self.make_env(agent_player=1)
+        env.opponent.search = lambda game: None
+        env.reset(player=0, random_player=False)
+        self.assertEqual((env.game.current_player, env.turns), (1, 2))
+
+    def test_env_options(self):
+        profiler = Profiler()
+        env = AbaloneExtraHardEnv(render_mode='terminal', max_depth=1, time_limit=None, profiler=profiler,
+                                  observation_mode='planes', copy_observation=False)
+        self.assertIs(env.profiler, profiler)
+        self.assertIs(env.reset(random_player=False), env.encoder.buffer)
+
+
+if __name__ == '__main__':
+    unittest.main()
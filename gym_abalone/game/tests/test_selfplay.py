@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gym_abalone.data import SelfPlay, ShardWriter, load_shards
+
+
+class TestShards(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.directory.name, 'shard')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_steps(self, writer, n, start=0):
+        for i in range(start, start + n):
+            mask = np.zeros(61*61, dtype=bool)
+            mask[i % 3721] = True
+            writer.write(np.full((11, 11), i % 100, dtype=np.int8), (i % 61, 3), i / 2, i % 7 == 0, i % 2, mask)
+
+    def test_roundtrip(self):
+        with ShardWriter(self.prefix, chunk_size=10, shard_chunks=2) as writer:
+            self.write_steps(writer, 45)
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+        data = load_shards(self.prefix)
+        self.assertEqual(len(data['done']), 45)
+        self.assertTrue((data['observation'][:, 0, 0] == np.arange(45) % 100).all())
+        self.assertTrue((data['reward'] == np.arange(45) / 2).all())
+        self.assertTrue((np.flatnonzero(data['mask']) % 3721 == np.arange(45)).all())
+
+    def test_resume_after_a_cut_chunk(self):
+        with ShardWriter(self.prefix, chunk_size=10, shard_chunks=4) as writer:
+            self.write_steps(writer, 30)
+        path = self.prefix + '-00000.shard'
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 5)
+
+        writer = ShardWriter(self.prefix, chunk_size=10, shard_chunks=4)
+        self.assertEqual(writer.rows, 20)
+        with writer:
+            self.write_steps(writer, 10, start=20)
+        data = load_shards(self.prefix)
+        self.assertTrue((data['action'][:, 0] == np.arange(30) % 61).all())
+
+
+class TestSelfPlay(unittest.TestCase):
+
+    def test_run_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            selfplay = SelfPlay(directory, n_workers=1, steps_per_worker=300, chunk_size=64, seed=0)
+            self.assertEqual(selfplay.run()['steps'], 300)
+            selfplay.steps_per_worker = 400
+            self.assertEqual(selfplay.run()['steps'], 100)
+
+            data = load_shards(selfplay.prefix(0))
+            self.assertEqual(len(data['action']), 400)
+            actions = data['action'].astype(int)
+            self.assertTrue(data['mask'][np.arange(400), actions[:, 0] * 61 + actions[:, 1]].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
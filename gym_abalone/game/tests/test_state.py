@@ -0,0 +1,67 @@
+import copy
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+from gym_abalone.game.engine.state import GameState
+
+
+def midgame(backend, seed=0, n_moves=30):
+    rng = random.Random(seed)
+    game = backend()
+    game.reset(variant_name='german-daisy', random_player=False)
+    for _ in range(n_moves):
+        game.make_move(*rng.choice(game.get_possible_moves(game.current_player)))
+    return game
+
+
+class TestGameState(unittest.TestCase):
+
+    def test_roundtrip(self):
+        for backend in (AbaloneGame, AbaloneBitboardGame):
+            game = midgame(backend)
+            state = game.get_state()
+            data = state.to_bytes()
+            self.assertEqual(len(data), 9 + 2 + 61)
+            for copied in (GameState.from_bytes(data), pickle.loads(pickle.dumps(state)), state.clone()):
+                self.assertEqual(copied, state)
+
+            other = backend.from_state(GameState.from_bytes(data))
+            np.testing.assert_array_equal(other.board, game.board)
+            self.assertEqual((other.hash, other.players_damages, other.current_player, other.turns_count),
+                             (game.hash, game.players_damages, game.current_player, game.turns_count))
+            self.assertEqual(other.variant, game.variant)
+            self.assertEqual(other.get_possible_moves(other.current_player),
+                             game.get_possible_moves(game.current_player))
+
+    def test_clone(self):
+        for backend in (AbaloneGame, AbaloneBitboardGame):
+            game = midgame(backend, seed=1)
+            moves = game.get_possible_moves(game.current_player)
+            reference = copy.deepcopy(game)
+            clone = game.clone()
+            self.assertIs(type(clone), backend)
+            # the clone plays on without touching the original
+            for move in moves[:5]:
+                clone.make_move(*move)
+                clone.unmake_move()
+            clone.make_move(*moves[-1])
+            np.testing.assert_array_equal(game.board, reference.board)
+            self.assertEqual((game.hash, game.current_player, len(game.undo_stack)),
+                             (reference.hash, reference.current_player, len(reference.undo_stack)))
+            self.assertEqual(game.get_possible_moves(game.current_player), moves)
+            # and can take back the moves played before the clone
+            while clone.undo_stack:
+                clone.unmake_move()
+            start = backend()
+            start.reset(variant_name='german-daisy', random_player=False)
+            self.assertEqual(clone.get_state(), start.get_state())
+            self.assertEqual(clone.hash, start.hash)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine import symmetry, actionspace
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.actionmask import get_action_masks
+
+
+class TestSymmetry(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        game = AbaloneGame()
+        boards, players = [], []
+        for variant_name in ['classical', 'belgian-daisy', 'the-wall']:
+            game.reset(variant_name=variant_name, random_player=False)
+            for _ in range(40):
+                boards.append(game.board.copy())
+                players.append(game.current_player)
+                game.action_handler(*rng.choice(game.get_possible_moves(game.current_player)))
+                if game.game_over:
+                    break
+        cls.boards, cls.players = np.array(boards), np.array(players)
+        cls.masks = get_action_masks(cls.boards, cls.players)
+
+    def test_group(self):
+        tables = symmetry._get_tables()
+        for s in range(symmetry.N_SYMMETRIES):
+            self.assertEqual(sorted(tables['pos'][s]), list(range(61)))
+            back = symmetry.transform_boards(symmetry.transform_boards(self.boards, s), tables['inverse'][s])
+            np.testing.assert_array_equal(back, self.boards)
+        # a rotation by 60 degrees moves the right neighbor of the center to its down right one
+        self.assertEqual(symmetry.transform_positions(31, 1), 39)
+        self.assertEqual(symmetry.transform_positions(30, 5), 30)
+
+    def test_masks_follow_the_boards(self):
+        symmetries = np.arange(len(self.boards)) % symmetry.N_SYMMETRIES
+        boards = symmetry.transform_boards(self.boards, symmetries)
+        masks = get_action_masks(boards, self.players)
+        np.testing.assert_array_equal(masks, symmetry.transform_masks(self.masks, symmetries))
+        np.testing.assert_array_equal(actionspace.compact_masks(masks),
+                                      symmetry.transform_masks(actionspace.compact_masks(self.masks), symmetries, compact=True))
+
+        # an action and its image
+        actions = np.array([np.flatnonzero(mask)[0] for mask in self.masks])
+        images = symmetry.transform_actions(actions, symmetries)
+        self.assertTrue(masks[np.arange(len(masks)), images].all())
+        slots = actionspace._get_tables()['slots'][actions]
+        np.testing.assert_array_equal(symmetry.transform_actions(slots, symmetries, compact=True),
+                                      actionspace._get_tables()['slots'][images])
+
+    def test_canonicalize(self):
+        canonical, symmetries = symmetry.canonicalize(self.boards)
+        np.testing.assert_array_equal(canonical, symmetry.transform_boards(self.boards, symmetries))
+        for s in [1, 4, 7, 11]:
+            other, _ = symmetry.canonicalize(symmetry.transform_boards(self.boards, s))
+            np.testing.assert_array_equal(other, canonical)
+
+
+if __name__ == '__main__':
+    unittest.main()
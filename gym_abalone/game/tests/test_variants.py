@@ -0,0 +1,53 @@
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.variants import VariantStore
+
+
+class TestVariantStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = AbaloneGame._get_variant_store()
+        with open(AbaloneGame.VARIANTS_FILENAME, 'r') as f:
+            self.variants = json.load(f)
+
+    def test_same_variants_as_json(self):
+        self.assertEqual(len(self.store), len(self.variants))
+        game = AbaloneGame()
+        for name, variant in self.variants.items():
+            game.reset(variant_name=name, random_player=False)
+            self.assertEqual(game.variant, variant)
+            for player in range(game.players):
+                tokens = [game.get_token_from_pos(pos) for pos in range(61)]
+                self.assertEqual([pos for pos, token in enumerate(tokens) if token == player],
+                                 sorted(variant['players_sets'][player]))
+
+    def test_reset_copies_the_board(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False)
+        game.board[5, 5] = AbaloneGame.TOKEN_VOID
+        game.reset(variant_name='classical', random_player=False)
+        self.assertEqual(game.board[5, 5], AbaloneGame.TOKEN_EMPTY)
+
+    def test_unknown_variant(self):
+        self.assertEqual(self.store.names[self.store.pick('unknown')], 'classical')
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'variants.npy')
+            self.store.save(filename)
+            store = VariantStore.load(filename)
+            self.assertIsInstance(store.boards, np.memmap)
+            self.assertEqual(store.names, self.store.names)
+            self.assertTrue((store.boards == self.store.boards).all())
+            self.assertEqual(store.variants, self.store.variants)
+            del store
+
+
+if __name__ == '__main__':
+    unittest.main()
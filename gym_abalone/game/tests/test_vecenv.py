@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.actionmask import get_action_masks
+from gym_abalone.envs.abalone_vec_env import AbaloneVecEnv
+
+
+def starting_board(variant_name):
+    game = AbaloneGame()
+    game.reset(variant_name=variant_name, random_player=False)
+    return game.board
+
+
+def legal_actions(masks, rng):
+    """ a random legal (pos0, pos1) of each mask """
+    return np.array([divmod(rng.choice(np.flatnonzero(mask)), 61) for mask in masks])
+
+
+class TestVecEnv(unittest.TestCase):
+
+    VARIANTS = ['classical', 'belgian-daisy', 'snakes']
+
+    def setUp(self):
+        self.env = AbaloneVecEnv(3, n_workers=2, variant_names=TestVecEnv.VARIANTS,
+                                 random_player=False, max_turns=4, seed=0)
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        self.env.close()
+
+    def check_masks(self, observations):
+        masks = self.env.get_action_masks()
+        self.assertEqual((masks.shape, masks.dtype), ((3, 61**2), np.dtype(bool)))
+        np.testing.assert_array_equal(masks, get_action_masks(observations, self.env.current_player))
+        return masks
+
+    def test_reset(self):
+        observations = self.env.reset()
+        self.assertEqual((observations.shape, observations.dtype), ((3, 11, 11), np.dtype(np.int8)))
+        # each game keeps its own variant
+        for observation, variant_name in zip(observations, TestVecEnv.VARIANTS):
+            np.testing.assert_array_equal(observation, starting_board(variant_name))
+        np.testing.assert_array_equal(self.env.current_player, [0, 0, 0])
+        self.check_masks(observations)
+
+    def test_step(self):
+        observations = self.env.reset()
+        masks = self.check_masks(observations)
+        observations, rewards, dones, infos = self.env.step(legal_actions(masks, self.rng))
+        self.assertEqual((rewards.shape, rewards.dtype), ((3,), np.dtype(np.float32)))
+        self.assertFalse(dones.any())
+        self.assertTrue((infos['move_type'] >= 0).all())
+        np.testing.assert_array_equal(infos['turn'], [1, 1, 1])
+        np.testing.assert_array_equal(infos['player'], [0, 0, 0])
+        # the turn has passed
+        np.testing.assert_array_equal(self.env.current_player, [1, 1, 1])
+        self.check_masks(observations)
+
+    def test_illegal_action(self):
+        observations = self.env.reset()
+        new_observations, _, dones, infos = self.env.step(np.zeros((3, 2), dtype=np.int64))
+        np.testing.assert_array_equal(infos['move_type'], [-1, -1, -1])
+        np.testing.assert_array_equal(new_observations, observations)
+        np.testing.assert_array_equal(self.env.current_player, [0, 0, 0])
+
+    def test_autoreset(self):
+        observations = self.env.reset()
+        # done once the turns count exceeds max_turns = 4
+        for _ in range(3):
+            masks = self.check_masks(observations)
+            observations, _, dones, _ = self.env.step(legal_actions(masks, self.rng))
+            self.assertFalse(dones.any())
+        previous = observations
+        masks = self.check_masks(observations)
+        observations, _, dones, infos = self.env.step(legal_actions(masks, self.rng))
+
+        self.assertTrue(dones.all())
+        for i, variant_name in enumerate(TestVecEnv.VARIANTS):
+            # the last board is kept, the game starts again with its variant
+            terminal = infos['terminal_observation'][i]
+            self.assertTrue((terminal != previous[i]).any())
+            self.assertFalse((terminal == starting_board(variant_name)).all())
+            np.testing.assert_array_equal(observations[i], starting_board(variant_name))
+        self.check_masks(observations)
+
+        # the next step goes on from the new games
+        observations, _, dones, infos = self.env.step(legal_actions(self.env.get_action_masks(), self.rng))
+        self.assertFalse(dones.any())
+        np.testing.assert_array_equal(infos['turn'], [1, 1, 1])
+
+    def test_close(self):
+        processes = self.env.processes
+        self.env.close()
+        self.assertTrue(self.env.closed)
+        for process in processes:
+            self.assertFalse(process.is_alive())
+            self.assertEqual(process.exitcode, 0)
+        # closing twice does nothing
+        self.env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from gym_abalone.game.engine.gamelogic import AbaloneGame
+from gym_abalone.game.engine.bitboard import AbaloneBitboardGame
+from gym_abalone.game.engine.transposition import TranspositionTable
+from gym_abalone.game.engine.playout import push_first_move
+
+
+class TestZobrist(unittest.TestCase):
+
+    def check_incremental_hash(self, game):
+        rng = random.Random(0)
+        game.reset(variant_name='belgian-daisy', random_player=False)
+        hashes = [game.hash]
+        while not game.game_over and len(hashes) < 300:
+            game.make_move(*push_first_move(game, rng))
+            self.assertEqual(game.hash, game.compute_hash())
+            hashes.append(game.hash)
+        self.assertGreater(len(set(hashes)), len(hashes) // 2)
+
+        while game.undo_stack:
+            hashes.pop()
+            game.unmake_move()
+            self.assertEqual(game.hash, hashes[-1])
+
+    def test_incremental_hash(self):
+        self.check_incremental_hash(AbaloneGame())
+        self.check_incremental_hash(AbaloneBitboardGame())
+
+    def test_side_to_move(self):
+        game = AbaloneGame()
+        game.reset(variant_name='classical', random_player=False, player=0)
+        hash_0 = game.hash
+        game.reset(variant_name='classical', random_player=False, player=1)
+        self.assertNotEqual(hash_0, game.hash)
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_and_probe(self):
+        table = TranspositionTable(size=1000)
+        self.assertEqual(table.size, 1024)
+        self.assertIsNone(table.probe(12345))
+        table.store(12345, depth=3, value=0.5, flag=TranspositionTable.EXACT, move=61*44+45)
+        self.assertEqual(table.probe(12345), (3, 0.5, TranspositionTable.EXACT, 61*44+45))
+        self.assertEqual(len(table), 1)
+
+    def test_depth_preferred(self):
+        table = TranspositionTable(size=16, policy='depth')
+        key, collision = 2**63 + 5, 5
+        table.store(key, depth=4, value=1, flag=TranspositionTable.EXACT)
+        self.assertFalse(table.store(collision, depth=2, value=0, flag=TranspositionTable.EXACT))
+        self.assertIsNotNone(table.probe(key))
+        # entries of a previous search can be replaced
+        table.new_search()
+        self.assertTrue(table.store(collision, depth=2, value=0, flag=TranspositionTable.EXACT))
+        self.assertIsNone(table.probe(key))
+
+    def test_always_replace(self):
+        table = TranspositionTable(size=16, policy='always')
+        table.store(5, depth=4, value=1, flag=TranspositionTable.EXACT)
+        self.assertTrue(table.store(21, depth=1, value=0, flag=TranspositionTable.LOWER))
+        self.assertIsNone(table.probe(5))
+
+    def test_bounded(self):
+        table = TranspositionTable(size=64)
+        for key in range(10000):
+            table.store(key * 2654435761, depth=key % 5, value=0, flag=TranspositionTable.EXACT)
+        self.assertLessEqual(len(table), 64)
+
+
+if __name__ == '__main__':
+    unittest.main()